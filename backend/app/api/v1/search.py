@@ -6,6 +6,7 @@ It handles search requests with filters, sorting, and pagination.
 
 Endpoints:
 - POST /api/v1/search/games: Main search endpoint with full filter support
+- POST /api/v1/search/batch: Several relevance searches run concurrently
 
 TODO Phase 2: Add GET /api/v1/search/suggest for search suggestions
 TODO Phase 3: Add search analytics endpoint
@@ -14,7 +15,7 @@ TODO Phase 3: Add search analytics endpoint
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from supabase import Client
 from app.database import get_db
-from app.models.search import SearchRequest, SearchResponse
+from app.models.search import SearchRequest, SearchResponse, BatchSearchRequest, BatchSearchResponse, SortBy
 from app.services.search_service import SearchService
 import logging
 
@@ -197,6 +198,65 @@ async def search_games(
         )
 
 
+@router.post(
+    "/search/batch",
+    response_model=BatchSearchResponse,
+    summary="Batch Search Games",
+    description="Run several relevance searches concurrently, ranked as /search/games ranks them",
+    tags=["Search"]
+)
+async def search_games_batch(
+    request: BatchSearchRequest,
+    db: Client = Depends(get_db)
+) -> BatchSearchResponse:
+    """
+    Search for games with several queries at once
+    
+    Every query is ranked by relevance with the same filters and page
+    size, exactly as /search/games ranks it. The queries run concurrently
+    on the server, which is cheaper than sending them one by one.
+    
+    **Example:**
+    ```json
+    {
+      "queries": ["strategy", "space shooter", "farming sim"],
+      "filters": {
+        "price_max": 2000
+      },
+      "limit": 10
+    }
+    ```
+    
+    Args:
+        request: Batch search request with queries, filters and page size
+        db: Database client (injected)
+    
+    Returns:
+        BatchSearchResponse with one SearchResponse per query
+    
+    Raises:
+        HTTPException: 500 for server errors
+    """
+    try:
+        logger.info(f"📥 Batch search request: {len(request.queries)} queries, limit={request.limit}")
+        
+        service = SearchService(db)
+        responses = await service.search_batch(
+            queries=request.queries,
+            filters=request.filters,
+            limit=request.limit
+        )
+        
+        return BatchSearchResponse(responses=responses)
+        
+    except Exception as e:
+        logger.error(f"❌ Batch search failed with error: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Batch search failed due to server error. Please try again later."
+        )
+
+
 # ============================================================================
 # Phase 4: Semantic and Hybrid Search Endpoints
 # ============================================================================
@@ -315,8 +375,6 @@ async def hybrid_search_endpoint(
     try:
         logger.info(f"Hybrid search request: query='{request.query}', alpha={alpha}")
         
-        from app.models.search import SortBy
-        
         search_service = SearchService(db)
         result = await search_service.hybrid_search(
             query=request.query,
@@ -23,7 +23,7 @@ TODO: Add caching settings for future optimization
 """
 
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -60,6 +60,9 @@ class Settings(BaseSettings):
     DATABASE_TABLE: str = "games_prod"
     """Main games table name"""
     
+    DATABASE_URL: Optional[str] = None
+    """Direct Postgres connection string (only used by bulk scripts, e.g. COPY writes in scripts/populate_embeddings.py)"""
+    
     # ========================================================================
     # Server Configuration
     # ========================================================================
@@ -103,6 +106,27 @@ class Settings(BaseSettings):
     BM25_DESCRIPTION_WEIGHT: float = 1.0
     """Weight for game description field in BM25 scoring"""
     
+    BM25_RPC_ENABLED: bool = True
+    """Rank relevance queries in PostgreSQL with steam.search_games_bm25 (see sql/create_bm25_index.sql)"""
+    
+    TS_RANK_RPC_ENABLED: bool = True
+    """Without the BM25 function, rank relevance queries with ts_rank_cd in PostgreSQL (steam.search_games_ts_rank, see sql/create_full_text_search.sql)"""
+    
+    BM25_CANDIDATE_POOL: int = 500
+    """Matches ranked in Python (MaxScore top-k) when no database ranking function is available"""
+    
+    BM25_WARM_CACHE: bool = True
+    """Build BM25 indexes over the whole catalog on startup"""
+    
+    BM25_INDEX_REFRESH_SECONDS: int = 300
+    """How often to check whether the catalog changed and the BM25 index must be rebuilt"""
+    
+    FULL_TEXT_SEARCH_ENABLED: bool = True
+    """Match queries against the search_tsv column (see sql/create_full_text_search.sql) instead of ILIKE"""
+    
+    FILTERED_SEARCH_RPC_ENABLED: bool = True
+    """Serve non-relevance sorts with steam.search_games_filtered (see sql/create_filtered_search_function.sql)"""
+    
     # ========================================================================
     # Semantic Search Configuration (Phase 4)
     # ========================================================================
@@ -119,6 +143,18 @@ class Settings(BaseSettings):
     SEMANTIC_MIN_SIMILARITY: float = 0.0
     """Minimum similarity threshold for semantic search (0.0-1.0)"""
     
+    SEMANTIC_ONNX_MODEL_DIR: Optional[str] = None
+    """ONNX export of the embedding model (scripts/export_onnx.py); when set, batch encoding runs on ONNX Runtime"""
+    
+    SEMANTIC_LLAMA_SERVER_URL: Optional[str] = None
+    """llama.cpp server (llama-server --embedding) serving a GGUF of the embedding model; when set, batch encoding posts to it"""
+    
+    SEMANTIC_LLAMA_PARALLEL: int = 4
+    """Embedding requests in flight at once; match the server's parallel slots (llama-server -np)"""
+    
+    SEMANTIC_PYTHON_FALLBACK: bool = False
+    """Score embeddings in Python when steam.search_games_semantic is missing (slow, development only)"""
+    
     HYBRID_SEARCH_ALPHA: float = 0.5
     """Default alpha for hybrid search (0.0=pure semantic, 1.0=pure BM25)"""
     
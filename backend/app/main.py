@@ -31,6 +31,7 @@ from contextlib import asynccontextmanager
 from app.config import settings
 from app.database import db
 from app.api.v1 import games, health, search, export, import_data
+from app.services.search_service import SearchService
 import logging
 
 # ============================================================================
@@ -83,6 +84,14 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Database connection failed: {e}")
         logger.warning("⚠️ Application starting with database disconnected")
     
+    # Build the catalog-wide BM25 index once instead of per request, in the
+    # background so a large catalog doesn't hold up startup
+    if settings.BM25_ENABLED and settings.BM25_WARM_CACHE:
+        try:
+            SearchService(db.get_client()).start_bm25_warmup()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not start BM25 catalog index build: {e}")
+    
     logger.info("=" * 70)
     logger.info("✅ Application startup complete")
     logger.info("📚 API Documentation: http://{0}:{1}/docs".format(
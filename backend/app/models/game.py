@@ -24,6 +24,7 @@ TODO: Add support for deck compatibility detection from categories
 from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Any
 from datetime import date
+import json
 
 
 class GameListItem(BaseModel):
@@ -72,7 +73,6 @@ class GameListItem(BaseModel):
         if isinstance(v, list):
             return v
         if isinstance(v, str):
-            import json
             try:
                 parsed = json.loads(v)
                 return parsed if isinstance(parsed, list) else []
@@ -178,7 +178,6 @@ class GameDetail(BaseModel):
         if isinstance(v, list):
             return v
         if isinstance(v, str):
-            import json
             try:
                 parsed = json.loads(v)
                 return parsed if isinstance(parsed, list) else []
@@ -11,7 +11,7 @@ Phase 4 (Future): Semantic search with embeddings
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Annotated, List, Optional
 from enum import Enum
 
 
@@ -239,6 +239,50 @@ class SearchResponse(BaseModel):
     # search_time_ms: Optional[float] = None
 
 
+class BatchSearchRequest(BaseModel):
+    """
+    Batch search request model
+    
+    Runs several relevance searches with the same filters and page size.
+    All queries are scored together in one BM25 pass.
+    
+    Example:
+    - {"queries": ["strategy", "space shooter"], "limit": 10}
+    """
+    
+    queries: List[Annotated[str, Field(max_length=200)]] = Field(
+        ...,
+        min_length=1,
+        max_length=20,
+        description="Search query texts (max 20, each up to 200 characters)"
+    )
+    
+    filters: Optional[SearchFilters] = Field(
+        None,
+        description="Optional filters applied to every query"
+    )
+    
+    limit: int = Field(
+        20,
+        ge=1,
+        le=100,
+        description="Number of results per query (max 100)"
+    )
+
+
+class BatchSearchResponse(BaseModel):
+    """
+    Batch search response model
+    
+    Contains one SearchResponse per query, in request order.
+    """
+    
+    responses: List[SearchResponse] = Field(
+        ...,
+        description="Search response for each query"
+    )
+
+
 # Export all models
 __all__ = [
     'SortBy',
@@ -246,5 +290,7 @@ __all__ = [
     'SearchRequest',
     'SearchResultItem',
     'SearchResponse',
+    'BatchSearchRequest',
+    'BatchSearchResponse',
 ]
 
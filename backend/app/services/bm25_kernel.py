@@ -0,0 +1,94 @@
+"""
+BM25 Scoring Kernel
+
+Numba-compiled inner loop for BM25Index (app/services/bm25.py). The index
+stores Structure-of-Arrays posting lists: for every term, contiguous runs
+of doc ids (int32) and precomputed score contributions (float32). Scoring
+a query term is then a straight scatter-add over those runs.
+
+bm25_scores_batch scores several queries in one call, in parallel across
+queries. Both kernels release the GIL (nogil=True), so requests scored in
+worker threads run concurrently. The compiled functions are cached on
+disk (cache=True); warm_up() compiles them with a tiny input so the first
+search request does not pay for JIT.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, fastmath=True, nogil=True, cache=True)
+def bm25_scores(doc_ids, contributions, term_indptr, q_term_ids, out):
+    """
+    Accumulate BM25 scores for a query into out
+
+    Postings of term t are doc_ids/contributions[term_indptr[t]:term_indptr[t + 1]].
+    Doc ids are unique within a term, so postings are scored in parallel.
+
+    Args:
+        doc_ids: Document id per posting (int32)
+        contributions: Score contribution per posting (float32)
+        term_indptr: Posting offsets, one per term plus one (int32)
+        q_term_ids: Query term ids; repeated ids count once per occurrence (int32)
+        out: Score per document, updated in place (float32)
+    """
+    for qi in range(q_term_ids.shape[0]):
+        term = q_term_ids[qi]
+        for j in prange(term_indptr[term], term_indptr[term + 1]):
+            out[doc_ids[j]] += contributions[j]
+
+
+@njit(parallel=True, fastmath=True, nogil=True, cache=True)
+def bm25_scores_batch(doc_ids, contributions, term_indptr, q_indptr, q_term_ids, out):
+    """
+    Accumulate BM25 scores for several queries into out, one row per query
+
+    Query i's term ids are q_term_ids[q_indptr[i]:q_indptr[i + 1]]. Queries
+    are scored in parallel, so a batch keeps every core busy even when each
+    query has only a few short posting lists.
+
+    Args:
+        doc_ids: Document id per posting (int32)
+        contributions: Score contribution per posting (float32)
+        term_indptr: Posting offsets, one per term plus one (int32)
+        q_indptr: Query offsets into q_term_ids, one per query plus one (int32)
+        q_term_ids: Concatenated query term ids (int32)
+        out: Scores of shape (queries, documents), updated in place (float32)
+    """
+    for qi in prange(q_indptr.shape[0] - 1):
+        row = out[qi]
+        for qt in range(q_indptr[qi], q_indptr[qi + 1]):
+            term = q_term_ids[qt]
+            for j in range(term_indptr[term], term_indptr[term + 1]):
+                row[doc_ids[j]] += contributions[j]
+
+
+_warmed_up = False
+
+
+def warm_up() -> None:
+    """
+    Compile the kernels ahead of the first request (no-op after the first call)
+    """
+    global _warmed_up
+    if _warmed_up:
+        return
+    bm25_scores(
+        np.zeros(1, dtype=np.int32),
+        np.ones(1, dtype=np.float32),
+        np.array([0, 1], dtype=np.int32),
+        np.zeros(1, dtype=np.int32),
+        np.zeros(1, dtype=np.float32)
+    )
+    bm25_scores_batch(
+        np.zeros(1, dtype=np.int32),
+        np.ones(1, dtype=np.float32),
+        np.array([0, 1], dtype=np.int32),
+        np.array([0, 1], dtype=np.int32),
+        np.zeros(1, dtype=np.int32),
+        np.zeros((1, 1), dtype=np.float32)
+    )
+    _warmed_up = True
+
+
+__all__ = ['bm25_scores', 'bm25_scores_batch', 'warm_up']
@@ -10,6 +10,10 @@ Key Features:
 - Batch processing for performance
 - LRU caching for query embeddings
 - Weighted field importance (name > description > genres)
+- Optional ONNX Runtime backend for batch encoding (SEMANTIC_ONNX_MODEL_DIR,
+  exported with scripts/export_onnx.py)
+- Optional llama.cpp server backend for batch encoding
+  (SEMANTIC_LLAMA_SERVER_URL)
 
 Model: all-MiniLM-L6-v2
 - Dimensions: 384
@@ -35,10 +39,13 @@ Usage:
 """
 
 from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Any, Optional
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 import logging
 from functools import lru_cache
+from pathlib import Path
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +61,12 @@ class EmbeddingService:
     # Class-level model instance (singleton pattern)
     _model: Optional[SentenceTransformer] = None
     _model_name: str = 'all-MiniLM-L6-v2'
+    # Precision of the sentence-transformers model (set by enable_fp16/int8)
+    _precision: str = 'fp32'
+    
+    # ONNX Runtime model and tokenizer for encode_batch (see get_onnx_model)
+    _onnx_model = None
+    _onnx_tokenizer = None
     
     @classmethod
     def get_model(cls) -> SentenceTransformer:
@@ -80,6 +93,233 @@ class EmbeddingService:
         
         return cls._model
     
+    @classmethod
+    def enable_fp16(cls) -> bool:
+        """
+        Run the embedding model in half precision on the GPU
+        
+        Halves weight and activation memory traffic for large batch runs
+        (scripts/populate_embeddings.py --fp16). Embeddings are L2-normalized,
+        so fp16 barely changes similarities; they are still returned as
+        Python floats.
+        
+        Returns:
+            bool: True if the model now runs in fp16, False without CUDA
+        """
+        import torch
+        
+        if not torch.cuda.is_available():
+            logger.warning("⚠️  fp16 needs a CUDA device, keeping fp32")
+            return False
+        
+        cls.get_model().to('cuda').half()
+        cls._precision = 'fp16'
+        logger.info("✓ Embedding model running in fp16 on CUDA")
+        return True
+    
+    @classmethod
+    def enable_int8(cls) -> bool:
+        """
+        Quantize the model's linear layers to int8 for CPU batch runs
+        
+        Dynamic quantization: weights are stored as int8 and activations
+        are quantized on the fly, which roughly doubles CPU throughput with
+        near-identical cosine similarities. CPU only (the ONNX export in
+        scripts/export_onnx.py is quantized the same way).
+        
+        Returns:
+            bool: True if the model is quantized, False if it runs on a GPU
+        """
+        import torch
+        
+        model = cls.get_model()
+        if model.device.type != 'cpu':
+            logger.warning("⚠️  int8 dynamic quantization is CPU only, keeping the model as is")
+            return False
+        
+        cls._model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        cls._precision = 'int8'
+        logger.info("✓ Embedding model quantized to int8 (dynamic)")
+        return True
+    
+    @classmethod
+    def encoder_id(cls) -> str:
+        """
+        Identify the backend and precision encode_batch currently uses
+        
+        Embeddings from different backends or precisions differ slightly,
+        so anything that stores encode_batch output (e.g. the populate
+        script's embedding cache) records this and discards mismatches.
+        
+        Returns:
+            str: e.g. 'llama:http://localhost:8080', 'onnx:/models/minilm'
+            or 'all-MiniLM-L6-v2:fp16'
+        """
+        if settings.SEMANTIC_LLAMA_SERVER_URL:
+            return f"llama:{settings.SEMANTIC_LLAMA_SERVER_URL.rstrip('/')}"
+        if settings.SEMANTIC_ONNX_MODEL_DIR:
+            return f"onnx:{Path(settings.SEMANTIC_ONNX_MODEL_DIR).resolve()}"
+        return f"{cls._model_name}:{cls._precision}"
+    
+    @classmethod
+    def enable_compile(cls) -> bool:
+        """
+        Compile the transformer with torch.compile for long batch runs
+        
+        Only the inner Hugging Face model is compiled (the sentence-transformers
+        pooling stays eager), with dynamic shapes because each mini-batch is
+        padded to a different length. Compilation happens here on a warm-up
+        text; set TORCHINDUCTOR_CACHE_DIR to reuse compiled kernels across runs.
+        
+        Returns:
+            bool: True if the model is compiled, False if torch.compile is
+            unavailable (PyTorch < 2.0)
+        """
+        import torch
+        
+        if not hasattr(torch, 'compile'):
+            logger.warning("⚠️  torch.compile needs PyTorch 2.0+, running eagerly")
+            return False
+        
+        model = cls.get_model()
+        transformer = model[0]
+        transformer.auto_model = torch.compile(transformer.auto_model, dynamic=True)
+        
+        logger.info("Compiling embedding model (warm-up)...")
+        model.encode(['warm up'], convert_to_numpy=True)
+        logger.info("✓ Embedding model compiled")
+        return True
+    
+    @classmethod
+    def get_onnx_model(cls):
+        """
+        Get or initialize the ONNX Runtime model (singleton)
+        
+        Loads the export written by scripts/export_onnx.py from
+        SEMANTIC_ONNX_MODEL_DIR, preferring the quantized and optimized
+        graphs, on CUDA when available and CPU otherwise.
+        
+        Returns:
+            Tuple of (ORTModelForFeatureExtraction, tokenizer), or None when
+            SEMANTIC_ONNX_MODEL_DIR is not set
+        """
+        if not settings.SEMANTIC_ONNX_MODEL_DIR:
+            return None
+        
+        if cls._onnx_model is None:
+            import onnxruntime
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+            from transformers import AutoTokenizer
+            
+            model_dir = Path(settings.SEMANTIC_ONNX_MODEL_DIR)
+            file_name = 'model.onnx'
+            for candidate in ('model_optimized_quantized.onnx', 'model_optimized.onnx'):
+                if (model_dir / candidate).exists():
+                    file_name = candidate
+                    break
+            provider = (
+                'CUDAExecutionProvider'
+                if 'CUDAExecutionProvider' in onnxruntime.get_available_providers()
+                else 'CPUExecutionProvider'
+            )
+            logger.info(f"Loading ONNX embedding model: {model_dir / file_name} ({provider})")
+            
+            try:
+                cls._onnx_model = ORTModelForFeatureExtraction.from_pretrained(
+                    model_dir, file_name=file_name, provider=provider
+                )
+                cls._onnx_tokenizer = AutoTokenizer.from_pretrained(model_dir)
+                logger.info("✓ ONNX model loaded successfully")
+            except Exception as e:
+                logger.error(f"Failed to load ONNX embedding model: {e}")
+                raise
+        
+        return cls._onnx_model, cls._onnx_tokenizer
+    
+    @classmethod
+    def _encode_onnx(cls, texts: List[str], batch_size: int) -> np.ndarray:
+        """
+        Encode texts with the ONNX Runtime model
+        
+        Same pipeline as the sentence-transformers model: mean pooling over
+        the attention mask, then L2 normalization. Texts are batched in
+        length order (less padding) and returned in input order.
+        
+        Args:
+            texts: Texts to encode
+            batch_size: Number of texts per model call
+        
+        Returns:
+            float32 embeddings, shape (len(texts), dimension)
+        """
+        model, tokenizer = cls.get_onnx_model()
+        order = np.argsort([-len(text) for text in texts], kind='stable')
+        embeddings = [None] * len(texts)
+        
+        for start in range(0, len(texts), batch_size):
+            chunk = order[start:start + batch_size]
+            inputs = tokenizer(
+                [texts[i] for i in chunk],
+                padding=True,
+                truncation=True,
+                return_tensors='np'
+            )
+            hidden = model(**inputs).last_hidden_state
+            mask = inputs['attention_mask'][:, :, np.newaxis].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+            for i, embedding in zip(chunk, pooled):
+                embeddings[i] = embedding
+        
+        return np.asarray(embeddings, dtype=np.float32)
+    
+    @staticmethod
+    def _encode_llama(texts: List[str], batch_size: int) -> np.ndarray:
+        """
+        Encode texts with a llama.cpp embedding server
+        
+        Posts batches to the server's OpenAI-compatible /v1/embeddings
+        endpoint over one keep-alive client, at most SEMANTIC_LLAMA_PARALLEL
+        at a time (one per server slot, llama-server -np), so large runs do
+        not queue hundreds of requests against the server timeout.
+        The server must serve a GGUF conversion of the same model as
+        encode_query, otherwise stored and query embeddings do not match.
+        
+        Args:
+            texts: Texts to encode
+            batch_size: Number of texts per request
+        
+        Returns:
+            L2-normalized float32 embeddings, shape (len(texts), dimension)
+        """
+        import httpx
+        
+        url = settings.SEMANTIC_LLAMA_SERVER_URL.rstrip('/') + '/v1/embeddings'
+        parallel = max(1, settings.SEMANTIC_LLAMA_PARALLEL)
+        
+        async def post_all():
+            slots = asyncio.Semaphore(parallel)
+            limits = httpx.Limits(max_connections=parallel, max_keepalive_connections=parallel)
+            async with httpx.AsyncClient(timeout=120.0, limits=limits) as client:
+                async def post(chunk):
+                    async with slots:
+                        response = await client.post(url, json={'input': chunk})
+                    response.raise_for_status()
+                    data = sorted(response.json()['data'], key=lambda item: item['index'])
+                    return [item['embedding'] for item in data]
+                
+                return await asyncio.gather(*(
+                    post(texts[start:start + batch_size])
+                    for start in range(0, len(texts), batch_size)
+                ))
+        
+        embeddings = np.asarray(
+            [embedding for chunk in asyncio.run(post_all()) for embedding in chunk],
+            dtype=np.float32
+        )
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings
+    
     @classmethod
     def get_dimension(cls) -> int:
         """
@@ -90,6 +330,35 @@ class EmbeddingService:
         """
         return cls.get_model().get_sentence_embedding_dimension()
     
+    @staticmethod
+    def game_text(game: Dict[str, Any]) -> str:
+        """
+        Build the text that is embedded for a game
+        
+        Args:
+            game: Game data dict with 'name', 'short_description', 'genres'
+        
+        Returns:
+            Weighted concatenation: name twice (2x weight), description, genres
+        """
+        # Extract fields with defaults
+        name = game.get('name', '')
+        desc = game.get('short_description', '')
+        
+        # Handle genres (can be list or JSONB array)
+        genres = game.get('genres', [])
+        if isinstance(genres, list):
+            genres_text = ' '.join(genres)
+        elif isinstance(genres, str):
+            # If genres is a string, use as-is
+            genres_text = genres
+        else:
+            genres_text = ''
+        
+        # Weighted concatenation
+        # Name appears twice for 2x weight
+        return f"{name} {name} {desc} {genres_text}"
+    
     @classmethod
     def encode_game(cls, game: Dict[str, Any]) -> List[float]:
         """
@@ -117,23 +386,7 @@ class EmbeddingService:
             >>> len(embedding)
             384
         """
-        # Extract fields with defaults
-        name = game.get('name', '')
-        desc = game.get('short_description', '')
-        
-        # Handle genres (can be list or JSONB array)
-        genres = game.get('genres', [])
-        if isinstance(genres, list):
-            genres_text = ' '.join(genres)
-        elif isinstance(genres, str):
-            # If genres is a string, use as-is
-            genres_text = genres
-        else:
-            genres_text = ''
-        
-        # Weighted concatenation
-        # Name appears twice for 2x weight
-        text = f"{name} {name} {desc} {genres_text}"
+        text = cls.game_text(game)
         
         # Generate embedding
         model = cls.get_model()
@@ -178,47 +431,39 @@ class EmbeddingService:
             return []
         
         # Build text representations for all games
-        texts = []
-        for game in games:
-            name = game.get('name', '')
-            desc = game.get('short_description', '')
-            
-            genres = game.get('genres', [])
-            if isinstance(genres, list):
-                genres_text = ' '.join(genres)
-            elif isinstance(genres, str):
-                genres_text = genres
-            else:
-                genres_text = ''
-            
-            # Weighted concatenation
-            text = f"{name} {name} {desc} {genres_text}"
-            texts.append(text)
+        texts = [cls.game_text(game) for game in games]
         
-        # Batch encode
-        model = cls.get_model()
+        # Batch encode (llama.cpp server or ONNX Runtime when configured)
         logger.info(f"Encoding {len(games)} games in batches of {batch_size}...")
         
-        embeddings = model.encode(
-            texts,
-            batch_size=batch_size,
-            show_progress_bar=show_progress,
-            convert_to_numpy=True
-        )
+        if settings.SEMANTIC_LLAMA_SERVER_URL:
+            embeddings = cls._encode_llama(texts, batch_size)
+        elif settings.SEMANTIC_ONNX_MODEL_DIR:
+            embeddings = cls._encode_onnx(texts, batch_size)
+        else:
+            embeddings = cls.get_model().encode(
+                texts,
+                batch_size=batch_size,
+                show_progress_bar=show_progress,
+                convert_to_numpy=True
+            )
         
         logger.info(f"✓ Encoded {len(games)} games")
         
-        # Convert to list of lists
-        return [emb.tolist() for emb in embeddings]
+        # Convert to list of lists (one tolist() call; plain Python floats,
+        # so the JSON request payload is encoded by json's C encoder)
+        return embeddings.tolist()
     
     @classmethod
-    @lru_cache(maxsize=1000)
     def encode_query(cls, query: str) -> List[float]:
         """
         Encode user search query (cached for performance)
         
         Query embeddings are cached because users often search for
-        similar things. The cache stores up to 1000 recent queries.
+        similar things, and every page of a paginated search encodes the
+        same query. The cache stores up to 1000 recent queries, keyed by
+        the lowercased, whitespace-collapsed query: all-MiniLM-L6-v2 is
+        uncased and splits on whitespace, so these variants embed the same.
         
         Args:
             query: User search string
@@ -233,19 +478,34 @@ class EmbeddingService:
             384
         
         Note:
-            This method is cached using @lru_cache. Identical queries
-            will return the same embedding instantly without recomputing.
+            Identical (normalized) queries return the same embedding
+            instantly without recomputing. Callers get their own list, so
+            the cached vector cannot be modified.
+        """
+        return list(cls._encode_query_cached(' '.join(query.lower().split()) if query else ''))
+    
+    @classmethod
+    @lru_cache(maxsize=1000)
+    def _encode_query_cached(cls, query: str) -> Tuple[float, ...]:
+        """
+        Encode a normalized query (LRU cached, see encode_query)
+        
+        Args:
+            query: Lowercased query with collapsed whitespace
+        
+        Returns:
+            Tuple of floats (immutable, safe to share from the cache)
         """
-        if not query or not query.strip():
+        if not query:
             logger.warning("Empty query provided to encode_query")
             # Return zero vector for empty query
             dimension = cls.get_dimension()
-            return [0.0] * dimension
+            return (0.0,) * dimension
         
         model = cls.get_model()
         embedding = model.encode(query, convert_to_numpy=True)
         
-        return embedding.tolist()
+        return tuple(embedding.tolist())
     
     @classmethod
     def clear_cache(cls):
@@ -254,7 +514,7 @@ class EmbeddingService:
         
         Useful for testing or when memory is constrained.
         """
-        cls.encode_query.cache_clear()
+        cls._encode_query_cached.cache_clear()
         logger.info("Cleared query embedding cache")
     
     @classmethod
@@ -265,7 +525,7 @@ class EmbeddingService:
         Returns:
             CacheInfo: Named tuple with hits, misses, maxsize, currsize
         """
-        return cls.encode_query.cache_info()
+        return cls._encode_query_cached.cache_info()
 
 
 # Convenience function for backward compatibility
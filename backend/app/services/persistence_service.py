@@ -15,14 +15,77 @@ Uses Python best practices:
 """
 
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 import json
 import csv
 import logging
-from datetime import datetime
+import os
+import sys
+from collections import Counter
+from datetime import date, datetime, time
+from itertools import chain
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib encoder
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Opt-in: parse CSV imports with pyarrow's multithreaded reader when installed
+_FAST_IO = os.environ.get("STEAM_FAST_IO") == "1"
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    Encode values JSON has no type for, the same way with either encoder
+    
+    Numpy scalars become their Python value and dates/datetimes ISO 8601
+    strings (what orjson writes natively), so saved files don't depend on
+    whether orjson is installed.
+    
+    Raises:
+        TypeError: For any other type
+    """
+    np = sys.modules.get('numpy')  # Only present if something imported it
+    if np is not None:
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+    if isinstance(obj, (date, time)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Encode obj as UTF-8 JSON, with orjson's C encoder when it is installed
+    
+    Both encoders accept non-string dict keys and encode numpy values and
+    dates identically (see _json_default).
+    
+    Args:
+        obj: Value to encode
+        indent: Indent nested values by 2 spaces
+    
+    Returns:
+        Encoded JSON bytes
+    
+    Raises:
+        TypeError: If obj contains a value with no JSON encoding
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=_json_default, option=option)
+    return json.dumps(
+        obj, indent=2 if indent else None, ensure_ascii=False, default=_json_default
+    ).encode('utf-8')
+
+
+# Decoder matching _dumps (orjson errors subclass json.JSONDecodeError)
+_loads = orjson.loads if orjson is not None else json.loads
+
 
 class PersistenceService:
     """
@@ -42,8 +105,12 @@ class PersistenceService:
         Args:
             data_directory: Path to directory for storing data files
         """
-        self.data_dir = Path(data_directory)
+        # Resolved once, so file paths don't depend on later cwd changes
+        self.data_dir = Path(data_directory).resolve()
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        # Raw preferences file bytes and the (mtime, size) they were read at
+        self._prefs_cache: Optional[bytes] = None
+        self._prefs_stamp: Optional[tuple] = None
         logger.info(f"✅ Persistence service initialized with directory: {self.data_dir}")
     
     # ========================================================================
@@ -54,6 +121,10 @@ class PersistenceService:
         """
         Save search history to JSON file.
         
+        Replaces the whole history. The file holds one JSON record per line
+        (NDJSON), so append_search_history can add a search without
+        rewriting earlier ones.
+        
         Args:
             searches: List of search queries with metadata
         
@@ -70,20 +141,58 @@ class PersistenceService:
         
         try:
             # Use context manager for safe file handling
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(searches, f, indent=2, ensure_ascii=False)
+            with open(file_path, 'wb') as f:
+                f.writelines(_dumps(search) + b"\n" for search in searches)
             
             logger.info(f"✅ Saved {len(searches)} search records to {file_path}")
             return True
             
-        except (IOError, OSError) as e:
+        except (IOError, OSError, TypeError) as e:
             logger.error(f"❌ Failed to save search history: {e}")
             return False
     
+    def append_search_history(self, search: Dict[str, Any]) -> bool:
+        """
+        Append one search to the history file.
+        
+        Writes only the new record, so the cost does not grow with the
+        history. A history file in the older JSON array format is
+        converted to one record per line first.
+        
+        Args:
+            search: Search query with metadata
+        
+        Returns:
+            True if save successful, False otherwise
+        """
+        file_path = self.data_dir / "search_history.json"
+        
+        try:
+            if self._is_json_array(file_path):
+                self.save_search_history(self.load_search_history())
+            
+            with open(file_path, 'ab') as f:
+                f.write(_dumps(search) + b"\n")
+            return True
+            
+        except (IOError, OSError, TypeError) as e:
+            logger.error(f"❌ Failed to append search history: {e}")
+            return False
+    
+    @staticmethod
+    def _is_json_array(file_path: Path) -> bool:
+        """Check whether a file holds a JSON array (older history format)"""
+        if not file_path.exists():
+            return False
+        with open(file_path, 'rb') as f:
+            return f.read(64).lstrip().startswith(b"[")
+    
     def load_search_history(self) -> List[Dict[str, Any]]:
         """
         Load search history from JSON file.
         
+        Reads one record per line, or a JSON array (older format).
+        
         Returns:
             List of previous searches, empty list if file not found
         
@@ -101,8 +210,13 @@ class PersistenceService:
                 return []
             
             # Use context manager for safe file reading
-            with open(file_path, 'r', encoding='utf-8') as f:
-                searches = json.load(f)
+            with open(file_path, 'rb') as f:
+                content = f.read()
+            
+            if content.lstrip().startswith(b"["):
+                searches = _loads(content)
+            else:
+                searches = [_loads(line) for line in content.splitlines() if line.strip()]
             
             # Validate data structure
             if not isinstance(searches, list):
@@ -140,13 +254,14 @@ class PersistenceService:
         file_path = self.data_dir / "user_preferences.json"
         
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(preferences, f, indent=2)
+            with open(file_path, 'wb') as f:
+                f.write(_dumps(preferences, indent=True))
+            self._prefs_cache = None  # Re-read on next load
             
             logger.info(f"✅ Saved user preferences to {file_path}")
             return True
             
-        except (IOError, OSError) as e:
+        except (IOError, OSError, TypeError) as e:
             logger.error(f"❌ Failed to save preferences: {e}")
             return False
     
@@ -171,8 +286,14 @@ class PersistenceService:
             if not file_path.exists():
                 return defaults
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                preferences = json.load(f)
+            # Reuse the file bytes until it changes on disk; decoding them on
+            # each call is cheaper than deep-copying a parsed dict, and gives
+            # every caller its own (mutable) preference values
+            stat = file_path.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if self._prefs_cache is None or stamp != self._prefs_stamp:
+                self._prefs_cache, self._prefs_stamp = file_path.read_bytes(), stamp
+            preferences = _loads(self._prefs_cache)
             
             # Merge with defaults (in case new settings added)
             return {**defaults, **preferences}
@@ -211,31 +332,16 @@ class PersistenceService:
                 logger.error(f"❌ CSV file not found: {file_path}")
                 return None
             
-            games = []
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with open(file_path, 'r', newline='', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
                 
                 # Validate required columns
-                required_columns = {'appid', 'name', 'price_cents'}
-                if not required_columns.issubset(set(reader.fieldnames or [])):
-                    logger.error(f"❌ CSV missing required columns: {required_columns}")
+                if not self._has_required_columns(reader):
                     return None
                 
-                for row in reader:
-                    # Validate and transform data
-                    try:
-                        game = {
-                            'appid': int(row['appid']),
-                            'name': row['name'],
-                            'price_cents': int(row.get('price_cents', 0)),
-                            'genres': json.loads(row.get('genres', '[]')),
-                            'categories': json.loads(row.get('categories', '[]')),
-                            'type': row.get('type', 'game')
-                        }
-                        games.append(game)
-                    except (ValueError, json.JSONDecodeError) as e:
-                        logger.warning(f"⚠️ Skipping invalid row: {e}")
-                        continue
+                games = self._read_csv_arrow(file_path, reader.fieldnames) if _FAST_IO else None
+                if games is None:
+                    games = list(self._parse_csv_games(reader))
             
             logger.info(f"✅ Imported {len(games)} games from CSV")
             return games
@@ -244,6 +350,122 @@ class PersistenceService:
             logger.error(f"❌ Failed to import CSV: {e}")
             return None
     
+    def iter_games_from_csv(self, csv_file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream game data from a CSV file, one game at a time.
+        
+        Same parsing and validation as import_games_from_csv, but games are
+        yielded as they are read, so large files are never held in memory.
+        
+        Args:
+            csv_file_path: Path to CSV file
+        
+        Yields:
+            Game dictionaries; nothing if the file is missing, unreadable
+            or lacks required columns (the error is logged)
+        """
+        file_path = Path(csv_file_path)
+        
+        try:
+            if not file_path.exists():
+                logger.error(f"❌ CSV file not found: {file_path}")
+                return
+            
+            with open(file_path, 'r', newline='', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                if self._has_required_columns(reader):
+                    yield from self._parse_csv_games(reader)
+            
+        except (IOError, OSError) as e:
+            logger.error(f"❌ Failed to import CSV: {e}")
+    
+    @staticmethod
+    def _has_required_columns(reader: csv.DictReader) -> bool:
+        """Check the CSV header has the columns every game needs (logs if not)"""
+        required_columns = {'appid', 'name', 'price_cents'}
+        if not required_columns.issubset(reader.fieldnames or ()):
+            logger.error(f"❌ CSV missing required columns: {required_columns}")
+            return False
+        return True
+    
+    @staticmethod
+    def _read_csv_arrow(file_path: Path, fieldnames: List[str]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Parse a whole CSV file with pyarrow (STEAM_FAST_IO=1).
+        
+        Produces the same game dictionaries as _parse_csv_games. Files that
+        need row-level validation (a row that does not convert) are left
+        to the row-by-row parser, which skips the invalid rows.
+        
+        Args:
+            file_path: Path to CSV file
+            fieldnames: Header of the file
+        
+        Returns:
+            List of game dictionaries, None if pyarrow is not installed or
+            the file has invalid rows
+        """
+        try:
+            import pyarrow as pa
+            from pyarrow import csv as pa_csv
+        except ImportError:
+            return None
+        
+        column_types = {'appid': pa.int64(), 'name': pa.string(), 'price_cents': pa.int64()}
+        column_types.update({col: pa.string() for col in ('genres', 'categories', 'type') if col in fieldnames})
+        
+        try:
+            table = pa_csv.read_csv(
+                file_path,
+                convert_options=pa_csv.ConvertOptions(
+                    column_types=column_types,
+                    include_columns=list(column_types)
+                )
+            )
+            if table.column('appid').null_count or table.column('price_cents').null_count:
+                return None
+            
+            columns = table.to_pydict()
+            rows = len(columns['appid'])
+            no_lists = ['[]'] * rows
+            return [
+                {
+                    'appid': appid,
+                    'name': name,
+                    'price_cents': price_cents,
+                    'genres': json.loads(genres),
+                    'categories': json.loads(categories),
+                    'type': game_type
+                }
+                for appid, name, price_cents, genres, categories, game_type in zip(
+                    columns['appid'],
+                    columns['name'],
+                    columns['price_cents'],
+                    columns.get('genres', no_lists),
+                    columns.get('categories', no_lists),
+                    columns.get('type', ['game'] * rows)
+                )
+            ]
+        except (pa.ArrowInvalid, json.JSONDecodeError) as e:
+            logger.info(f"ℹ️ Falling back to row-by-row CSV import: {e}")
+            return None
+    
+    @staticmethod
+    def _parse_csv_games(reader: csv.DictReader) -> Iterator[Dict[str, Any]]:
+        """Validate and transform CSV rows into game dictionaries, skipping invalid rows"""
+        for row in reader:
+            try:
+                yield {
+                    'appid': int(row['appid']),
+                    'name': row['name'],
+                    'price_cents': int(row.get('price_cents', 0)),
+                    'genres': json.loads(row.get('genres', '[]')),
+                    'categories': json.loads(row.get('categories', '[]')),
+                    'type': row.get('type', 'game')
+                }
+            except (ValueError, json.JSONDecodeError) as e:
+                logger.warning(f"⚠️ Skipping invalid row: {e}")
+    
     def import_games_from_json(self, json_file_path: str) -> Optional[List[Dict[str, Any]]]:
         """
         Import game data from JSON file.
@@ -267,8 +489,8 @@ class PersistenceService:
                 logger.error(f"❌ JSON file not found: {file_path}")
                 return None
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                games = json.load(f)
+            # One bytes buffer for the (orjson) C parser
+            games = _loads(file_path.read_bytes())
             
             # Validate data structure
             if not isinstance(games, list):
@@ -299,15 +521,18 @@ class PersistenceService:
     
     def export_to_csv(
         self, 
-        data: List[Dict[str, Any]], 
+        data: Iterable[Dict[str, Any]], 
         filename: Optional[str] = None,
         columns: Optional[List[str]] = None
     ) -> Optional[Path]:
         """
         Export search results to CSV file.
         
+        Rows are written one at a time, so `data` may be a list or any
+        iterable (e.g. a generator) and is never materialized in full.
+        
         Args:
-            data: List of game dictionaries to export
+            data: Iterable of game dictionaries to export
             filename: Optional custom filename
             columns: Optional list of columns to include
         
@@ -317,7 +542,9 @@ class PersistenceService:
         Usage:
             service.export_to_csv(search_results, "my_search_results.csv")
         """
-        if not data:
+        records = iter(data)
+        first = next(records, None)
+        if first is None:
             logger.warning("⚠️ No data to export")
             return None
         
@@ -332,18 +559,19 @@ class PersistenceService:
             # Determine columns
             if columns is None:
                 # Use all keys from first item
-                columns = list(data[0].keys())
+                columns = list(first.keys())
             
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=columns)
+            count = 0
+            with open(file_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+                # Missing columns are written empty, extra keys are skipped
+                writer = csv.DictWriter(f, fieldnames=columns, restval='', extrasaction='ignore')
                 writer.writeheader()
                 
-                for item in data:
-                    # Only write columns that exist in this item
-                    row = {col: item.get(col, '') for col in columns}
-                    writer.writerow(row)
+                for item in chain((first,), records):
+                    writer.writerow(item)
+                    count += 1
             
-            logger.info(f"✅ Exported {len(data)} records to {file_path}")
+            logger.info(f"✅ Exported {count} records to {file_path}")
             return file_path
             
         except (IOError, OSError) as e:
@@ -352,20 +580,26 @@ class PersistenceService:
     
     def export_to_json(
         self, 
-        data: List[Dict[str, Any]], 
+        data: Iterable[Dict[str, Any]], 
         filename: Optional[str] = None
     ) -> Optional[Path]:
         """
         Export search results to JSON file.
         
+        Records are encoded and written one at a time, so peak memory stays
+        flat regardless of result size. `data` may be a list or any iterable
+        (e.g. a generator) - it is never materialized in full.
+        
         Args:
-            data: List of game dictionaries to export
+            data: Iterable of game dictionaries to export
             filename: Optional custom filename
         
         Returns:
             Path to created file if successful, None if error
         """
-        if not data:
+        records = iter(data)
+        first = next(records, None)
+        if first is None:
             logger.warning("⚠️ No data to export")
             return None
         
@@ -377,13 +611,22 @@ class PersistenceService:
         file_path = self.data_dir / filename
         
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            count = 0
+            with open(file_path, 'wb', buffering=1 << 20) as f:
+                # Stream the array: one encoded record per line
+                f.write(b"[\n  ")
+                f.write(_dumps(first))
+                count = 1
+                for item in records:
+                    f.write(b",\n  ")
+                    f.write(_dumps(item))
+                    count += 1
+                f.write(b"\n]\n")
             
-            logger.info(f"✅ Exported {len(data)} records to {file_path}")
+            logger.info(f"✅ Exported {count} records to {file_path}")
             return file_path
             
-        except (IOError, OSError) as e:
+        except (IOError, OSError, TypeError) as e:
             logger.error(f"❌ Failed to export JSON: {e}")
             return None
     
@@ -448,20 +691,15 @@ class PersistenceService:
                     f.write("\n")
                 
                 # Genre distribution
-                all_genres = []
-                for game in results:
-                    all_genres.extend(game.get('genres', []))
-                
-                if all_genres:
-                    from collections import Counter
-                    genre_counts = Counter(all_genres)
+                genre_counts = Counter(chain.from_iterable(g.get('genres') or [] for g in results))
+                if genre_counts:
                     f.write("Genre Distribution:\n")
                     for genre, count in genre_counts.most_common(10):
                         f.write(f"  - {genre}: {count}\n")
                     f.write("\n")
                 
-                # Price statistics
-                prices = [g.get('price', 0) for g in results if g.get('price', 0) > 0]
+                # Price statistics (single pass over paid games only)
+                prices = [p for p in (g.get('price') or 0 for g in results) if p > 0]
                 if prices:
                     f.write("Price Statistics:\n")
                     f.write(f"  - Average: ${sum(prices)/len(prices):.2f}\n")
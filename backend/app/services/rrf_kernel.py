@@ -0,0 +1,79 @@
+"""
+Reciprocal Rank Fusion Kernel
+
+Numba-compiled score accumulation for SearchService._reciprocal_rank_fusion
+(hybrid search). Takes the game ids of the BM25 and semantic result lists
+in rank order and returns each distinct game once, in first-seen order,
+with its fused score:
+    score(d) = alpha / (k + rank_bm25(d)) + (1 - alpha) / (k + rank_semantic(d))
+
+The kernel releases the GIL (nogil=True) and is cached on disk
+(cache=True); warm_up() compiles it with a tiny input so the first hybrid
+search does not pay for JIT.
+"""
+
+import numpy as np
+from numba import njit, types
+from numba.typed import Dict
+
+
+@njit(nogil=True, cache=True)
+def rrf_scores(bm25_ids, semantic_ids, alpha, k):
+    """
+    Fuse two ranked id lists with Reciprocal Rank Fusion
+
+    Args:
+        bm25_ids: Game ids of the BM25 results, best first (int64)
+        semantic_ids: Game ids of the semantic results, best first (int64)
+        alpha: Weight of the BM25 list (semantic gets 1 - alpha)
+        k: RRF rank constant
+
+    Returns:
+        Tuple of (distinct game ids in first-seen order, fused scores)
+    """
+    n = bm25_ids.shape[0] + semantic_ids.shape[0]
+    slots = Dict.empty(key_type=types.int64, value_type=types.int64)
+    ids = np.empty(n, dtype=np.int64)
+    scores = np.zeros(n, dtype=np.float64)
+    count = 0
+
+    for rank in range(bm25_ids.shape[0]):
+        game_id = bm25_ids[rank]
+        if game_id in slots:
+            slot = slots[game_id]
+        else:
+            slot = count
+            slots[game_id] = slot
+            ids[slot] = game_id
+            count += 1
+        scores[slot] = alpha * (1.0 / (k + rank + 1))
+
+    for rank in range(semantic_ids.shape[0]):
+        game_id = semantic_ids[rank]
+        if game_id in slots:
+            slot = slots[game_id]
+        else:
+            slot = count
+            slots[game_id] = slot
+            ids[slot] = game_id
+            count += 1
+        scores[slot] += (1 - alpha) * (1.0 / (k + rank + 1))
+
+    return ids[:count], scores[:count]
+
+
+_warmed_up = False
+
+
+def warm_up() -> None:
+    """
+    Compile the kernel ahead of the first request (no-op after the first call)
+    """
+    global _warmed_up
+    if _warmed_up:
+        return
+    rrf_scores(np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64), 0.5, 60.0)
+    _warmed_up = True
+
+
+__all__ = ['rrf_scores', 'warm_up']
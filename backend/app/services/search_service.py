@@ -10,22 +10,90 @@ Implementation Phases:
 - Phase 2 (Complete): Multi-field search with weighting
 - Phase 3 (Complete): BM25 ranking algorithm
 - Phase 4 (Complete): Semantic search with pgvector
+
+Text matching uses PostgreSQL full-text search on the generated search_tsv
+column (sql/create_full_text_search.sql), falling back to ILIKE when the
+column has not been created. Relevance ranking runs in PostgreSQL via
+steam.search_games_bm25 (sql/create_bm25_index.sql), with Python-side BM25
+over the returned rows as a fallback.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from supabase import Client
 import logging
 from app.config import settings
 from app.models.search import SearchFilters, SortBy
-from rank_bm25 import BM25Okapi
+from app.services.bm25 import BM25Index, top_k as bm25_top_k, top_k_indices
+from app.services import bm25_kernel, rrf_kernel
 from app.services.embedding_service import EmbeddingService
 from fastapi import HTTPException
 import re
+import os
+import asyncio
 import numpy as np
 import json
+import time
+import threading
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Slots for CPU-bound work run off the event loop (see SearchService._run_cpu_bound),
+# one semaphore per loop: an asyncio.Semaphore binds to the first loop it waits on
+_cpu_slots_by_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _cpu_slots() -> asyncio.Semaphore:
+    """Semaphore bounding CPU-bound work to one slot per CPU on the running loop"""
+    loop = asyncio.get_running_loop()
+    slots = _cpu_slots_by_loop.get(loop)
+    if slots is None:
+        slots = _cpu_slots_by_loop[loop] = asyncio.Semaphore(os.cpu_count() or 1)
+    return slots
+
+
+# Columns of a search result row (see SearchService._format_result)
+_RESULT_FIELDS = (
+    'appid, name, short_description, price_cents, '
+    'genres, categories, type, release_date, total_reviews'
+)
+
+# Word tokens for BM25 (compiled once)
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=1024)
+def _json_array(values: Tuple[str, ...]) -> str:
+    """JSON array for a genre/category containment filter (cached per value set)"""
+    return json.dumps(list(values))
+
+
+# ASCII fast path byte table: A-Z -> a-z, [a-z0-9_] kept, everything else -> space
+_ASCII_TOKEN_TABLE = bytes(
+    c + 32 if 65 <= c <= 90 else c if (chr(c).isalnum() and c < 128) or c == 95 else 32
+    for c in range(256)
+)
+
+
+@lru_cache(maxsize=100_000)
+def _tokenize_cached(text: str) -> Tuple[str, ...]:
+    """
+    Lowercase and split text on non-alphanumeric characters (cached)
+    
+    Args:
+        text: Text to tokenize
+    
+    Returns:
+        Tuple of tokens (immutable, so it can be shared between callers)
+    """
+    if text.isascii():
+        # Same tokens as the regex, without running the regex engine
+        return tuple(text.encode('ascii').translate(_ASCII_TOKEN_TABLE).decode('ascii').split())
+    return tuple(_TOKEN_PATTERN.findall(text.lower()))
+
 
 class SearchService:
     """
@@ -34,14 +102,49 @@ class SearchService:
     This service handles:
     - Text search in game names (Phase 1) and descriptions (Phase 2+)
     - BM25 ranking for relevance scoring (Phase 3)
+    - Semantic and hybrid search with embeddings (Phase 4)
     - Filtering by price, genre, category, type, date, reviews
     - Sorting by relevance, price, reviews, date, name
     - Pagination of results
-    
-    Phase 3: BM25 ranking algorithm integrated
-    TODO Phase 4: Add semantic search with embeddings
     """
     
+    # Whether the search_tsv column exists (cleared after the first failed query)
+    _full_text_available: bool = True
+    
+    # Whether steam.search_games_bm25 exists (cleared after the first failed call)
+    _bm25_rpc_available: bool = True
+    
+    # Whether steam.search_games_ts_rank exists (cleared after the first failed call)
+    _ts_rank_rpc_available: bool = True
+    
+    # Whether steam.search_games_filtered exists (cleared after the first failed call)
+    _filtered_rpc_available: bool = True
+    
+    # BM25F indexes keyed by a hash of the page's texts, shared across requests (LRU)
+    _bm25_cache: "OrderedDict[int, BM25Index]" = OrderedDict()
+    _BM25_CACHE_SIZE: int = 64
+    
+    # Whether the embedding_bin column exists (cleared after the first failed query)
+    _embedding_bin_available: bool = True
+    
+    # Parsed, L2-normalized game embeddings by appid (Python semantic fallback, LRU)
+    _embedding_cache: "OrderedDict[int, Tuple[int, np.ndarray]]" = OrderedDict()
+    _EMBEDDING_CACHE_SIZE: int = 20000
+    _EMBEDDING_CHUNK_SIZE: int = 128
+    
+    # Guards _bm25_cache and _embedding_cache: both are used from to_thread
+    # workers, and concurrent move_to_end/popitem on an OrderedDict race
+    _cache_lock = threading.Lock()
+    
+    # BM25 indexes over the whole catalog, built by warm_bm25_cache()
+    _corpus_index: Optional[Dict[str, Any]] = None
+    
+    # Held while a background thread checks/rebuilds the catalog index
+    _corpus_refresh_lock = threading.Lock()
+    
+    # Whether the text_updated_at column exists (cleared after the first failed query)
+    _text_updated_at_available: bool = True
+    
     def __init__(self, db_client: Client):
         """
         Initialize search service with database client
@@ -50,25 +153,26 @@ class SearchService:
             db_client: Supabase client instance
         """
         self.db = db_client
-        self._bm25_cache = {}  # Cache for BM25 models
+        bm25_kernel.warm_up()  # Compile the BM25 kernel before the first query
+        rrf_kernel.warm_up()  # and the hybrid search fusion kernel
     
-    def _tokenize(self, text: str) -> List[str]:
+    def _tokenize(self, text: str) -> Tuple[str, ...]:
         """
         Tokenize text for BM25 processing
         
         Converts text to lowercase and splits on non-alphanumeric characters.
+        Results are cached per text (see _tokenize_cached), since the same
+        names and descriptions are tokenized on every index build.
         
         Args:
             text: Text to tokenize
         
         Returns:
-            List of tokens
+            Tuple of tokens
         """
         if not text:
-            return []
-        # Convert to lowercase and split on non-alphanumeric characters
-        tokens = re.findall(r'\w+', text.lower())
-        return tokens
+            return ()
+        return _tokenize_cached(text)
     
     async def search(
         self,
@@ -102,184 +206,56 @@ class SearchService:
         try:
             logger.info(f"🔍 Search request: query='{query}', filters={filters}, sort={sort_by}")
             
-            # Build the base query with all fields we need
-            # Note: We select all fields needed for SearchResultItem
-            select_fields = (
-                'appid, name, short_description, price_cents, '
-                'genres, categories, type, release_date, total_reviews'
-            )
+            # Relevance ranking runs in PostgreSQL when the BM25 index is
+            # installed, else with ts_rank_cd over the weighted search_tsv
+            if query.strip() and sort_by == SortBy.RELEVANCE:
+                if settings.BM25_RPC_ENABLED and SearchService._bm25_rpc_available:
+                    ranked = await self._run_io(self._bm25_rpc_search, query, filters, offset, limit)
+                    if ranked is not None:
+                        return ranked
+                if settings.TS_RANK_RPC_ENABLED and SearchService._ts_rank_rpc_available:
+                    ranked = await self._run_io(self._ts_rank_rpc_search, query, filters, offset, limit)
+                    if ranked is not None:
+                        return ranked
             
-            # Start building the query
-            # IMPORTANT: Use schema() to specify the correct schema (steam, not public)
-            query_builder = self.db.schema(settings.DATABASE_SCHEMA)\
-                .table(settings.DATABASE_TABLE)\
-                .select(select_fields, count='exact')
-            
-            # ===================================================================
-            # TEXT SEARCH (Phase 2: Multi-field search with OR logic)
-            # ===================================================================
-            if query.strip():
-                # Phase 2: Search in name OR short_description
-                # Supabase PostgREST uses .or() for OR conditions
-                search_term = f'%{query.strip()}%'
-                # Build OR query: name ILIKE query OR short_description ILIKE query
-                or_condition = f'name.ilike.{search_term},short_description.ilike.{search_term}'
-                query_builder = query_builder.or_(or_condition)
-                logger.debug(f"Applied multi-field text search: name OR short_description ILIKE '{search_term}'")
-            
-            # ===================================================================
-            # FILTERS
-            # ===================================================================
-            if filters:
-                # Price filters (use indexed field for fast filtering!)
-                if filters.price_min is not None:
-                    query_builder = query_builder.gte('price_cents', filters.price_min)
-                    logger.debug(f"Applied filter: price_cents >= {filters.price_min}")
-                
-                if filters.price_max is not None:
-                    query_builder = query_builder.lte('price_cents', filters.price_max)
-                    logger.debug(f"Applied filter: price_cents <= {filters.price_max}")
-                
-                # Type filter (use indexed field - very fast!)
-                if filters.type:
-                    query_builder = query_builder.eq('type', filters.type)
-                    logger.debug(f"Applied filter: type = '{filters.type}'")
-                
-                # Genre filters (JSONB containment - must have ALL selected genres)
-                # Uses PostgreSQL's @> operator for JSONB containment
-                # Note: Supabase expects JSON string format
-                # Multiple .contains() calls create AND logic (must have all genres)
-                if filters.genres:
-                    import json
-                    for genre in filters.genres:
-                        # Convert to JSON string format
-                        query_builder = query_builder.contains('genres', json.dumps([genre]))
-                    logger.debug(f"Applied filter: genres contains ALL of {filters.genres} (AND logic)")
-                
-                # Category filters (JSONB containment)
-                if filters.categories:
-                    import json
-                    for category in filters.categories:
-                        # Convert to JSON string format
-                        query_builder = query_builder.contains('categories', json.dumps([category]))
-                    logger.debug(f"Applied filter: categories contains {filters.categories}")
-                
-                # Date filters
-                if filters.release_date_after:
-                    query_builder = query_builder.gte('release_date', filters.release_date_after)
-                    logger.debug(f"Applied filter: release_date >= '{filters.release_date_after}'")
-                
-                if filters.release_date_before:
-                    query_builder = query_builder.lte('release_date', filters.release_date_before)
-                    logger.debug(f"Applied filter: release_date <= '{filters.release_date_before}'")
+            # Python relevance ranking scores a pool of matches, not just the page
+            rank_pool = bool(query.strip()) and sort_by == SortBy.RELEVANCE and limit <= 100
+            if rank_pool:
+                fetch_offset, fetch_limit = 0, max(settings.BM25_CANDIDATE_POOL, offset + limit)
+            else:
+                fetch_offset, fetch_limit = offset, limit
+            
+            # With the catalog index warm, the pool only needs appids: text
+            # for scoring is already indexed, and full rows are fetched for
+            # the final page only
+            ranked = None
+            if rank_pool:
+                corpus = await self._run_io(self._get_corpus_index)
+                if corpus is not None:
+                    ranked = await self._search_catalog_pool(query, filters, offset, limit, fetch_limit, corpus)
+            elif self._use_filtered_rpc(query, sort_by):
+                # Database-ordered page from one stored statement
+                ranked = await self._filtered_rpc_search(query, filters, sort_by, offset, limit)
+            
+            if ranked is not None:
+                total, results = ranked
+            else:
+                result = await self._run_io(
+                    self._execute_search_query, query, filters, sort_by, fetch_offset, fetch_limit
+                )
                 
-                # Review count filter
-                if filters.min_reviews is not None:
-                    query_builder = query_builder.gte('total_reviews', filters.min_reviews)
-                    logger.debug(f"Applied filter: total_reviews >= {filters.min_reviews}")
-            
-            # ===================================================================
-            # SORTING
-            # ===================================================================
-            # Note: For Phase 1, RELEVANCE just sorts by name
-            # TODO Phase 3: Sort by BM25 score for relevance
-            if sort_by == SortBy.PRICE_ASC:
-                query_builder = query_builder.order('price_cents', desc=False)
-                logger.debug("Applied sort: price_cents ASC")
-            
-            elif sort_by == SortBy.PRICE_DESC:
-                query_builder = query_builder.order('price_cents', desc=True)
-                logger.debug("Applied sort: price_cents DESC")
-            
-            elif sort_by == SortBy.REVIEWS:
-                # Sort by total_reviews DESC, then by name for ties
-                query_builder = query_builder.order('total_reviews', desc=True)\
-                                             .order('name', desc=False)
-                logger.debug("Applied sort: total_reviews DESC, name ASC")
-            
-            elif sort_by == SortBy.NEWEST:
-                # Sort by release_date DESC (newest first), handle NULLs
-                query_builder = query_builder.order('release_date', desc=True, nullsfirst=False)\
-                                             .order('name', desc=False)
-                logger.debug("Applied sort: release_date DESC NULLS LAST, name ASC")
-            
-            elif sort_by == SortBy.OLDEST:
-                # Sort by release_date ASC (oldest first), handle NULLs
-                query_builder = query_builder.order('release_date', desc=False, nullsfirst=False)\
-                                             .order('name', desc=False)
-                logger.debug("Applied sort: release_date ASC NULLS LAST, name ASC")
-            
-            elif sort_by == SortBy.NAME:
-                # Alphabetical by name
-                query_builder = query_builder.order('name', desc=False)
-                logger.debug("Applied sort: name ASC")
-            
-            else:  # SortBy.RELEVANCE (default)
-                # Phase 3: BM25 sorting is done in post-processing
-                # Don't apply database-level sorting for relevance
-                # BM25 scores will be calculated and sorted after query
-                if not query.strip():
-                    # No query = no relevance, sort by name as fallback
-                    query_builder = query_builder.order('name', desc=False)
-                    logger.debug("Applied sort: name ASC (no query, fallback)")
-                else:
-                    # With query: fetch results without sorting, will sort by BM25 later
-                    logger.debug("Skipping database sort - will sort by BM25 score in post-processing")
-            
-            # ===================================================================
-            # PAGINATION
-            # ===================================================================
-            # Supabase uses range(start, end) where end is inclusive
-            # So for offset=0, limit=20: range(0, 19)
-            # For offset=20, limit=20: range(20, 39)
-            end_index = offset + limit - 1
-            query_builder = query_builder.range(offset, end_index)
-            logger.debug(f"Applied pagination: range({offset}, {end_index})")
-            
-            # ===================================================================
-            # EXECUTE QUERY
-            # ===================================================================
-            result = query_builder.execute()
-            
-            # Get total count from response
-            # Supabase returns count in the response when count='exact' is used
-            total = result.count if hasattr(result, 'count') and result.count is not None else 0
-            
-            logger.info(f"✅ Search completed: found {total} total matches, returning {len(result.data)} results")
-            
-            # ===================================================================
-            # TRANSFORM RESULTS
-            # ===================================================================
-            # Phase 3: Calculate BM25 scores for all results together (batch)
-            bm25_scores = self._calculate_bm25_scores_batch(result.data, query)
-            
-            results = []
-            for i, game in enumerate(result.data):
-                # Keep v2 score for comparison/fallback
-                simple_score = self._calculate_relevance_score_v2(game, query)
+                # Get total count from response
+                # Supabase returns count in the response when count='exact' is used
+                total = result.count if hasattr(result, 'count') and result.count is not None else 0
                 
-                # Transform to SearchResultItem format
-                results.append({
-                    'game_id': game['appid'],
-                    'title': game['name'],
-                    'description': game['short_description'],
-                    'price': round(game['price_cents'] / 100, 2) if game['price_cents'] is not None else 0.0,
-                    'genres': game['genres'] if game['genres'] else [],
-                    'categories': game['categories'] if game['categories'] else [],
-                    'type': game['type'],
-                    'release_date': game['release_date'],
-                    'total_reviews': game['total_reviews'],
-                    'relevance_score': simple_score,  # Keep for backward compatibility
-                    'bm25_score': bm25_scores[i]  # BM25 score from batch calculation
-                })
-            
-            # ===================================================================
-            # POST-PROCESSING: Sort by BM25 score if relevance sort
-            # ===================================================================
-            if sort_by == SortBy.RELEVANCE and query.strip():
-                # Sort results by BM25 score (descending)
-                results.sort(key=lambda x: x['bm25_score'], reverse=True)
-                logger.debug(f"Sorted {len(results)} results by BM25 score")
+                # ===============================================================
+                # TRANSFORM RESULTS (CPU-bound, off the event loop)
+                # ===============================================================
+                results = await self._run_cpu_bound(
+                    self._transform_results, result.data, query, sort_by, offset, limit, rank_pool
+                )
+            
+            logger.info(f"✅ Search completed: found {total} total matches, returning {len(results)} results")
             
             # Return response
             return {
@@ -296,7 +272,732 @@ class SearchService:
             logger.error(f"❌ Search failed: {e}", exc_info=True)
             raise
     
-    def _calculate_bm25_scores_batch(self, games: List[Dict[str, Any]], query: str) -> List[float]:
+    def _transform_results(
+        self,
+        games: List[Dict[str, Any]],
+        query: str,
+        sort_by: SortBy,
+        offset: int,
+        limit: int,
+        rank_pool: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        Score fetched rows with BM25, order them and build result dictionaries
+        
+        Args:
+            games: Rows returned by the database
+            query: Search query
+            sort_by: Sort order
+            offset: Pagination offset (within the pool when rank_pool is set)
+            limit: Number of results per page
+            rank_pool: Whether games is a candidate pool to take the top page from
+        
+        Returns:
+            List of result dictionaries in final order
+        """
+        # Phase 3: Calculate BM25 scores for all results together (batch)
+        if rank_pool:
+            games, bm25_scores = self._rank_bm25_top_k(games, query, offset, limit)
+        else:
+            bm25_scores = self._calculate_bm25_scores_batch(games, query)
+            
+            # Order by BM25 score before building result dictionaries
+            if sort_by == SortBy.RELEVANCE and query.strip():
+                order = np.argsort(-bm25_scores, kind='stable')
+                games = [games[i] for i in order]
+                bm25_scores = bm25_scores[order]
+                logger.debug(f"Sorted {len(games)} results by BM25 score")
+        
+        query_lower = query.lower() if query.strip() else ''
+        return [
+            self._format_result(game, query_lower, float(score))
+            for game, score in zip(games, bm25_scores)
+        ]
+    
+    async def _search_catalog_pool(
+        self,
+        query: str,
+        filters: Optional[SearchFilters],
+        offset: int,
+        limit: int,
+        pool_size: int,
+        corpus: Dict[str, Any]
+    ) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Rank a candidate pool against the catalog index, fetching full rows for one page
+        
+        The pool query selects only appid; names and descriptions of every
+        candidate are already in the catalog BM25 index. After ranking,
+        only the rows of the requested page are fetched with all columns,
+        so descriptions of the other candidates never cross the wire.
+        
+        Args:
+            query: Search query
+            filters: Optional filters
+            offset: Pagination offset within the ranked pool
+            limit: Number of results per page
+            pool_size: Number of candidates to rank
+            corpus: Catalog index dictionary (see warm_bm25_cache)
+        
+        Returns:
+            Tuple of (total matches, result dictionaries), or None if a
+            candidate is missing from the catalog index
+        """
+        pool = await self._run_io(
+            self._execute_search_query, query, filters, SortBy.RELEVANCE, 0, pool_size, 'appid'
+        )
+        total = pool.count if hasattr(pool, 'count') and pool.count is not None else 0
+        
+        position = corpus['position']
+        appids = [row['appid'] for row in pool.data]
+        if not all(appid in position for appid in appids):
+            return None
+        
+        page_ids, page_scores = await self._run_cpu_bound(
+            self._rank_catalog_pool, corpus['index'], appids, position, query, offset, limit
+        )
+        if not page_ids:
+            return total, []
+        
+        page_query = self.db.schema(settings.DATABASE_SCHEMA)\
+            .table(settings.DATABASE_TABLE)\
+            .select(_RESULT_FIELDS)\
+            .in_('appid', page_ids)
+        page = await self._run_io(page_query.execute)
+        rows = {game['appid']: game for game in page.data}
+        query_lower = query.lower() if query.strip() else ''
+        results = [
+            self._format_result(rows[appid], query_lower, float(score))
+            for appid, score in zip(page_ids, page_scores)
+            if appid in rows
+        ]
+        return total, results
+    
+    def _use_filtered_rpc(self, query: str, sort_by: SortBy) -> bool:
+        """
+        Whether a database-ordered search can use steam.search_games_filtered
+        
+        The function matches text with search_tsv only, so queries that
+        need the ILIKE fallback keep using the PostgREST query.
+        
+        Args:
+            query: Search text
+            sort_by: Sort order (relevance with a query is ranked elsewhere)
+        
+        Returns:
+            True if the function should be called
+        """
+        query = query.strip()
+        if query and sort_by == SortBy.RELEVANCE:
+            return False
+        if not (settings.FILTERED_SEARCH_RPC_ENABLED and SearchService._filtered_rpc_available):
+            return False
+        full_text = settings.FULL_TEXT_SEARCH_ENABLED and SearchService._full_text_available
+        return not query or (full_text and not any(c in query for c in '%_'))
+    
+    async def _filtered_rpc_search(
+        self,
+        query: str,
+        filters: Optional[SearchFilters],
+        sort_by: SortBy,
+        offset: int,
+        limit: int
+    ) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Fetch one database-ordered page with steam.search_games_filtered
+        
+        Filters travel as one JSONB argument to a static PL/pgSQL
+        statement, so the plan is prepared once per connection whatever
+        the filter shape, and the total comes from the same scan (or from a
+        one-row first page when the offset is past the last match).
+        
+        Args:
+            query: Search text
+            filters: Optional filters
+            sort_by: Sort order
+            offset: Pagination offset
+            limit: Number of results per page
+        
+        Returns:
+            Tuple of (total matches, result dictionaries), or None if the
+            function is not installed
+        """
+        params = {
+            'q': query.strip(),
+            'sort_by': sort_by.value,
+            'k': limit,
+            'k_offset': offset,
+            'filters': filters.dict(exclude_none=True) if filters else {}
+        }
+        
+        try:
+            result = await self._run_io(
+                self.db.schema(settings.DATABASE_SCHEMA).rpc('search_games_filtered', params).execute
+            )
+        except Exception as e:
+            error_msg = str(e)
+            if 'Could not find the function' in error_msg or 'PGRST202' in error_msg:
+                logger.warning("⚠️  PostgreSQL function 'steam.search_games_filtered' not found!")
+                logger.warning("   Using PostgREST filter queries.")
+                logger.warning("   See: sql/create_filtered_search_function.sql")
+                SearchService._filtered_rpc_available = False
+                return None
+            raise
+        
+        rows = result.data or []
+        if not rows and offset > 0:
+            # Past the last match: read the total from a one-row first page
+            first = await self._run_io(
+                self.db.schema(settings.DATABASE_SCHEMA).rpc(
+                    'search_games_filtered', {**params, 'k': 1, 'k_offset': 0}
+                ).execute
+            )
+            total = first.data[0]['total_count'] if first.data else 0
+        else:
+            total = rows[0]['total_count'] if rows else 0
+        results = await self._run_cpu_bound(
+            self._transform_results, rows, query, sort_by, offset, limit, False
+        )
+        return total, results
+    
+    def _rank_catalog_pool(
+        self,
+        index: BM25Index,
+        appids: List[int],
+        position: Dict[int, int],
+        query: str,
+        offset: int,
+        limit: int
+    ) -> Tuple[List[int], List[float]]:
+        """
+        Score candidates with the catalog index and return one page of appids
+        
+        Args:
+            index: Catalog BM25F index
+            appids: Candidate appids
+            position: Row of each appid in the index
+            query: Search query
+            offset: Pagination offset within the ranked pool
+            limit: Number of results per page
+        
+        Returns:
+            Tuple of (appids for the page, their BM25 scores), best first
+        """
+        query_tokens = self._tokenize(query)
+        if not any(token in index.vocab for token in query_tokens):
+            # Nothing to score: every candidate is 0, keep database order
+            page_ids = appids[offset:offset + limit]
+            return page_ids, [0.0] * len(page_ids)
+        
+        rows = np.fromiter((position[appid] for appid in appids), dtype=np.int64, count=len(appids))
+        scores = index.get_scores(query_tokens)[rows]
+        order = top_k_indices(scores, offset + limit)[offset:]
+        page_scores = np.round(scores[order].astype(np.float64), 4)
+        return [appids[i] for i in order], page_scores.tolist()
+    
+    async def _run_cpu_bound(self, func, *args, **kwargs):
+        """
+        Run CPU-bound work in a worker thread so the event loop keeps serving
+        
+        Concurrency is bounded by one slot per CPU (_cpu_slots()) so a burst of
+        requests does not oversubscribe the thread pool. The BM25 kernels
+        release the GIL, so scoring runs in parallel across requests.
+        
+        Args:
+            func: Function to call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+        
+        Returns:
+            Return value of func
+        """
+        async with _cpu_slots():
+            return await asyncio.to_thread(func, *args, **kwargs)
+    
+    async def _run_io(self, func, *args, **kwargs):
+        """
+        Run a blocking database call in a worker thread
+        
+        The Supabase client is synchronous; running its calls in threads
+        lets independent requests (e.g. the two halves of hybrid search)
+        wait on the database concurrently. Not bounded by _cpu_slots,
+        since the thread is only waiting.
+        
+        Args:
+            func: Function to call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+        
+        Returns:
+            Return value of func
+        """
+        return await asyncio.to_thread(func, *args, **kwargs)
+    
+    async def search_batch(
+        self,
+        queries: List[str],
+        filters: Optional[SearchFilters] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several relevance searches concurrently
+        
+        Every query goes through search() (BM25 or ts_rank RPC when
+        installed, else the catalog index or a per-query candidate pool),
+        so each one ranks exactly as it would on /search/games and never
+        depends on the other queries in the batch. The searches run
+        concurrently: database calls overlap in worker threads, and Python
+        scoring is bounded by the shared CPU slots.
+        
+        Args:
+            queries: Search texts
+            filters: Optional filters applied to every query
+            limit: Number of results per query
+        
+        Returns:
+            One search response dictionary per query, in request order
+        """
+        try:
+            logger.info(f"🔍 Batch search request: {len(queries)} queries, filters={filters}")
+            
+            responses = await asyncio.gather(*(
+                self.search(query, filters, SortBy.RELEVANCE, 0, limit)
+                for query in queries
+            ))
+            
+            logger.info(f"✅ Batch search completed: {len(responses)} queries")
+            return list(responses)
+            
+        except Exception as e:
+            logger.error(f"❌ Batch search failed: {e}", exc_info=True)
+            raise
+    
+    def _execute_search_query(
+        self,
+        query: str,
+        filters: Optional[SearchFilters],
+        sort_by: SortBy,
+        offset: int,
+        limit: int,
+        select_fields: str = _RESULT_FIELDS
+    ):
+        """
+        Build and execute the PostgREST query for a search request
+        
+        Uses full-text search when available; if the search_tsv column has
+        not been migrated yet, remembers that and retries with ILIKE.
+        
+        Args:
+            query: Search text
+            filters: Optional filters
+            sort_by: Sort order
+            offset: Pagination offset
+            limit: Number of rows to fetch
+            select_fields: Columns to fetch
+        
+        Returns:
+            PostgREST response with data and exact count
+        """
+        use_full_text = settings.FULL_TEXT_SEARCH_ENABLED and SearchService._full_text_available
+        query_builder = self._build_search_query(
+            query, filters, sort_by, offset, limit, use_full_text, select_fields
+        )
+        
+        try:
+            return query_builder.execute()
+        except Exception as e:
+            # search_tsv column not migrated yet: remember it and retry with ILIKE
+            if not (use_full_text and 'search_tsv' in str(e)):
+                raise
+            logger.warning("⚠️  Column 'search_tsv' not found, falling back to ILIKE search.")
+            logger.warning("   Run sql/create_full_text_search.sql to enable full-text search.")
+            SearchService._full_text_available = False
+            query_builder = self._build_search_query(
+                query, filters, sort_by, offset, limit, False, select_fields
+            )
+            return query_builder.execute()
+    
+    def _format_result(
+        self,
+        game: Dict[str, Any],
+        query_lower: str,
+        bm25_score: float
+    ) -> Dict[str, Any]:
+        """
+        Transform a games_prod row into the SearchResultItem format
+        
+        Args:
+            game: Game row from the database
+            query_lower: Lower-cased search query, '' when the query is
+                blank (for the v2 relevance score; lowered once per page)
+            bm25_score: BM25 score of the game for the query
+        
+        Returns:
+            Result dictionary
+        """
+        # Keep v2 score for comparison/fallback, for every sort order since the
+        # frontend shows it (0.5 without a query, all equally relevant)
+        if not query_lower:
+            simple_score = 0.5
+        else:
+            simple_score = self._calculate_relevance_score_v2(game, query_lower)
+        
+        return {
+            'game_id': game['appid'],
+            'title': game['name'],
+            'description': game['short_description'],
+            'price': round(game['price_cents'] / 100, 2) if game['price_cents'] is not None else 0.0,
+            'genres': game['genres'] if game['genres'] else [],
+            'categories': game['categories'] if game['categories'] else [],
+            'type': game['type'],
+            'release_date': game['release_date'],
+            'total_reviews': game['total_reviews'],
+            'relevance_score': simple_score,  # Keep for backward compatibility
+            'bm25_score': bm25_score  # BM25 score from batch calculation
+        }
+    
+    def _build_search_query(
+        self,
+        query: str,
+        filters: Optional[SearchFilters],
+        sort_by: SortBy,
+        offset: int,
+        limit: int,
+        use_full_text: bool,
+        select_fields: str = _RESULT_FIELDS
+    ):
+        """
+        Build the PostgREST query for a search request
+        
+        Args:
+            query: Search text
+            filters: Optional filters (price, genre, type, etc.)
+            sort_by: Sort order for results
+            offset: Pagination offset
+            limit: Number of results per page
+            use_full_text: Match against the search_tsv column instead of ILIKE
+            select_fields: Columns to fetch (default: all fields needed for SearchResultItem)
+        
+        Returns:
+            Query builder ready to execute
+        """
+        # Start building the query
+        # IMPORTANT: Use schema() to specify the correct schema (steam, not public)
+        query_builder = self.db.schema(settings.DATABASE_SCHEMA)\
+            .table(settings.DATABASE_TABLE)\
+            .select(select_fields, count='exact')
+        
+        # ===================================================================
+        # TEXT SEARCH
+        # ===================================================================
+        if query.strip():
+            query_builder = self._apply_text_search(query_builder, query.strip(), use_full_text)
+        
+        # ===================================================================
+        # FILTERS
+        # ===================================================================
+        if filters:
+            # Price filters (use indexed field for fast filtering!)
+            if filters.price_min is not None:
+                query_builder = query_builder.gte('price_cents', filters.price_min)
+                logger.debug(f"Applied filter: price_cents >= {filters.price_min}")
+            
+            if filters.price_max is not None:
+                query_builder = query_builder.lte('price_cents', filters.price_max)
+                logger.debug(f"Applied filter: price_cents <= {filters.price_max}")
+            
+            # Type filter (use indexed field - very fast!)
+            if filters.type:
+                query_builder = query_builder.eq('type', filters.type)
+                logger.debug(f"Applied filter: type = '{filters.type}'")
+            
+            # Genre filters (JSONB containment - must have ALL selected genres)
+            # Uses PostgreSQL's @> operator for JSONB containment
+            # Note: Supabase expects JSON string format
+            # One containment check against the whole list is AND logic
+            # (genres @> '["Action", "RPG"]'), served by the GIN index in
+            # sql/create_filter_indexes.sql
+            if filters.genres:
+                query_builder = query_builder.contains('genres', _json_array(tuple(filters.genres)))
+                logger.debug(f"Applied filter: genres contains ALL of {filters.genres} (AND logic)")
+            
+            # Category filters (JSONB containment - must have ALL selected categories)
+            if filters.categories:
+                query_builder = query_builder.contains('categories', _json_array(tuple(filters.categories)))
+                logger.debug(f"Applied filter: categories contains {filters.categories}")
+            
+            # Date filters
+            if filters.release_date_after:
+                query_builder = query_builder.gte('release_date', filters.release_date_after)
+                logger.debug(f"Applied filter: release_date >= '{filters.release_date_after}'")
+            
+            if filters.release_date_before:
+                query_builder = query_builder.lte('release_date', filters.release_date_before)
+                logger.debug(f"Applied filter: release_date <= '{filters.release_date_before}'")
+            
+            # Review count filter
+            if filters.min_reviews is not None:
+                query_builder = query_builder.gte('total_reviews', filters.min_reviews)
+                logger.debug(f"Applied filter: total_reviews >= {filters.min_reviews}")
+        
+        # ===================================================================
+        # SORTING
+        # ===================================================================
+        # RELEVANCE with a query is ranked by BM25 (database function or
+        # post-processing), so only the other orders are applied here
+        if sort_by == SortBy.PRICE_ASC:
+            query_builder = query_builder.order('price_cents', desc=False)
+            logger.debug("Applied sort: price_cents ASC")
+        
+        elif sort_by == SortBy.PRICE_DESC:
+            query_builder = query_builder.order('price_cents', desc=True)
+            logger.debug("Applied sort: price_cents DESC")
+        
+        elif sort_by == SortBy.REVIEWS:
+            # Sort by total_reviews DESC, then by name for ties
+            query_builder = query_builder.order('total_reviews', desc=True)\
+                                         .order('name', desc=False)
+            logger.debug("Applied sort: total_reviews DESC, name ASC")
+        
+        elif sort_by == SortBy.NEWEST:
+            # Sort by release_date DESC (newest first), handle NULLs
+            query_builder = query_builder.order('release_date', desc=True, nullsfirst=False)\
+                                         .order('name', desc=False)
+            logger.debug("Applied sort: release_date DESC NULLS LAST, name ASC")
+        
+        elif sort_by == SortBy.OLDEST:
+            # Sort by release_date ASC (oldest first), handle NULLs
+            query_builder = query_builder.order('release_date', desc=False, nullsfirst=False)\
+                                         .order('name', desc=False)
+            logger.debug("Applied sort: release_date ASC NULLS LAST, name ASC")
+        
+        elif sort_by == SortBy.NAME:
+            # Alphabetical by name
+            query_builder = query_builder.order('name', desc=False)
+            logger.debug("Applied sort: name ASC")
+        
+        else:  # SortBy.RELEVANCE (default)
+            # Phase 3: BM25 sorting is done in post-processing
+            # Don't apply database-level sorting for relevance
+            # BM25 scores will be calculated and sorted after query
+            if not query.strip():
+                # No query = no relevance, sort by name as fallback
+                query_builder = query_builder.order('name', desc=False)
+                logger.debug("Applied sort: name ASC (no query, fallback)")
+            else:
+                # With query: fetch results without sorting, will sort by BM25 later
+                logger.debug("Skipping database sort - will sort by BM25 score in post-processing")
+        
+        # ===================================================================
+        # PAGINATION
+        # ===================================================================
+        # Supabase uses range(start, end) where end is inclusive
+        # So for offset=0, limit=20: range(0, 19)
+        # For offset=20, limit=20: range(20, 39)
+        end_index = offset + limit - 1
+        query_builder = query_builder.range(offset, end_index)
+        logger.debug(f"Applied pagination: range({offset}, {end_index})")
+        
+        return query_builder
+    
+    def _apply_text_search(self, query_builder, query: str, use_full_text: bool):
+        """
+        Restrict a query to games matching the search text
+        
+        Full-text search matches whole words against the GIN-indexed
+        search_tsv column (websearch_to_tsquery syntax), so "rust" no longer
+        matches "frustrate". ILIKE substring matching on name OR
+        short_description is kept as a fallback, and for queries containing
+        the LIKE wildcards % or _.
+        
+        Args:
+            query_builder: PostgREST query builder
+            query: Stripped search text
+            use_full_text: Whether the search_tsv column is available
+        
+        Returns:
+            Query builder with the text condition applied
+        """
+        if use_full_text and not any(c in query for c in '%_'):
+            query_builder = query_builder.filter('search_tsv', 'wfts(simple)', query)
+            logger.debug(f"Applied full-text search: search_tsv @@ websearch_to_tsquery('simple', '{query}')")
+            return query_builder
+        
+        # Phase 2: Search in name OR short_description
+        # Supabase PostgREST uses .or() for OR conditions
+        search_term = f'%{query}%'
+        # Build OR query: name ILIKE query OR short_description ILIKE query
+        or_condition = f'name.ilike.{search_term},short_description.ilike.{search_term}'
+        query_builder = query_builder.or_(or_condition)
+        logger.debug(f"Applied multi-field text search: name OR short_description ILIKE '{search_term}'")
+        return query_builder
+    
+    def _bm25_rpc_search(
+        self,
+        query: str,
+        filters: Optional[SearchFilters],
+        offset: int,
+        limit: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Rank games with the steam.search_games_bm25 database function
+        
+        Term statistics (IDF, average field length) are precomputed over the
+        whole catalog by steam.refresh_bm25_index(), so scores no longer
+        depend on which page the database returned, and only the requested
+        page of ranked rows is transferred. Like the full-text path, a game
+        must contain every query term to match.
+        
+        Args:
+            query: Search text
+            filters: Optional filters (price, genre, type, etc.)
+            offset: Pagination offset
+            limit: Number of results per page
+        
+        Returns:
+            Search response dictionary, or None if the function is not installed
+        """
+        ranked = self._call_rank_function('search_games_bm25', query, filters, offset, limit)
+        if ranked is None:
+            logger.warning("⚠️  PostgreSQL function 'steam.search_games_bm25' not found!")
+            logger.warning("   Falling back to ts_rank_cd or Python-side BM25 ranking.")
+            logger.warning("   See: sql/create_bm25_index.sql")
+            SearchService._bm25_rpc_available = False
+            return None
+        
+        total, rows = ranked
+        return self._ranked_response(total, rows, 'bm25_score', query, filters, offset, limit)
+    
+    def _ts_rank_rpc_search(
+        self,
+        query: str,
+        filters: Optional[SearchFilters],
+        offset: int,
+        limit: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Rank games with the steam.search_games_ts_rank database function
+        
+        Ranks full-text matches with ts_rank_cd over the weighted search_tsv
+        column (name weight A, description weight B), using the GIN index.
+        Needs no refresh after imports, unlike the BM25 tables. The rank is
+        reported in the bm25_score field of each result.
+        
+        Args:
+            query: Search text
+            filters: Optional filters (price, genre, type, etc.)
+            offset: Pagination offset
+            limit: Number of results per page
+        
+        Returns:
+            Search response dictionary, or None if the function is not installed
+        """
+        ranked = self._call_rank_function('search_games_ts_rank', query, filters, offset, limit)
+        if ranked is None:
+            logger.warning("⚠️  PostgreSQL function 'steam.search_games_ts_rank' not found!")
+            logger.warning("   Using Python-side BM25 ranking fallback.")
+            logger.warning("   See: sql/create_full_text_search.sql")
+            SearchService._ts_rank_rpc_available = False
+            return None
+        
+        total, rows = ranked
+        return self._ranked_response(total, rows, 'rank_score', query, filters, offset, limit)
+    
+    def _call_rank_function(
+        self,
+        function: str,
+        query: str,
+        filters: Optional[SearchFilters],
+        offset: int,
+        limit: int
+    ) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Call a database ranking function (search_games_bm25 / search_games_ts_rank)
+        
+        The total comes from the total_count column of the page rows. A page
+        past the last match has no rows, so the total is then read from a
+        one-row call at offset 0.
+        
+        Args:
+            function: Function name in DATABASE_SCHEMA
+            query: Search text
+            filters: Optional filters
+            offset: Pagination offset
+            limit: Number of results per page
+        
+        Returns:
+            Tuple of (total matches, ranked rows of the requested page), or
+            None if the function is not installed
+        """
+        params = {
+            'q': query.strip(),
+            'k': limit,
+            'k_offset': offset,
+            'filters': filters.dict(exclude_none=True) if filters else {},
+            'name_weight': settings.BM25_NAME_WEIGHT,
+            'description_weight': settings.BM25_DESCRIPTION_WEIGHT
+        }
+        
+        try:
+            result = self.db.schema(settings.DATABASE_SCHEMA).rpc(function, params).execute()
+        except Exception as e:
+            error_msg = str(e)
+            if 'Could not find the function' in error_msg or 'PGRST202' in error_msg:
+                return None
+            raise
+        
+        rows = result.data or []
+        if not rows and offset > 0:
+            first = self.db.schema(settings.DATABASE_SCHEMA).rpc(
+                function, {**params, 'k': 1, 'k_offset': 0}
+            ).execute()
+            return (first.data[0]['total_count'] if first.data else 0), rows
+        return (rows[0]['total_count'] if rows else 0), rows
+    
+    def _ranked_response(
+        self,
+        total: int,
+        rows: List[Dict[str, Any]],
+        score_column: str,
+        query: str,
+        filters: Optional[SearchFilters],
+        offset: int,
+        limit: int
+    ) -> Dict[str, Any]:
+        """
+        Build the search response for rows ranked by a database function
+        
+        Args:
+            total: Total number of matches
+            rows: Ranked rows of the page, each with a score column
+            score_column: Column holding the ranking score
+            query: Search text
+            filters: Optional filters
+            offset: Pagination offset
+            limit: Number of results per page
+        
+        Returns:
+            Search response dictionary
+        """
+        query_lower = query.lower() if query.strip() else ''
+        results = [
+            self._format_result(game, query_lower, round(game[score_column], 4))
+            for game in rows
+        ]
+        
+        logger.info(f"✅ Ranked search completed: found {total} total matches, returning {len(results)} results")
+        
+        return {
+            'results': results,
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'query': query,
+            'filters_applied': filters.dict() if filters else None,
+            'sort_by': SortBy.RELEVANCE
+        }
+    
+    def _calculate_bm25_scores_batch(self, games: List[Dict[str, Any]], query: str) -> np.ndarray:
         """
         Calculate BM25 relevance scores for a batch of games (Phase 3)
         
@@ -306,72 +1007,436 @@ class SearchService:
         
         This implementation:
         - Tokenizes query and all document texts
-        - Creates BM25 corpus from all documents
-        - Calculates BM25 score for name field (weight: 2.0)
-        - Calculates BM25 score for description field (weight: 1.0)
-        - Combines scores with field weighting
+        - Builds (or reuses) one BM25F index over name and description
+        - Weights the fields before saturation (name: 2.0, description: 1.0),
+          so each game is scored in a single pass
         
         Args:
             games: List of game data dictionaries
             query: Search query
         
         Returns:
-            List of BM25 relevance scores (higher is more relevant)
+            Array of BM25 relevance scores, one per game (higher is more relevant)
         """
         if not query.strip() or not games:
-            return [0.0] * len(games)
+            return np.zeros(len(games))
         
         # Tokenize query
         query_tokens = self._tokenize(query)
         if not query_tokens:
-            return [0.0] * len(games)
-        
-        scores = []
+            return np.zeros(len(games))
         
         # ===================================================================
-        # NAME FIELD (Weight: 2.0 - highest priority)
+        # BM25F INDEX (catalog index, or cached per page of results)
         # ===================================================================
-        # Build corpus of all game names
-        name_corpus = []
-        for game in games:
-            name = game.get('name', '')
-            name_tokens = self._tokenize(name) if name else []
-            name_corpus.append(name_tokens if name_tokens else [''])
-        
-        # Create BM25 model for all names
-        if name_corpus:
-            bm25_names = BM25Okapi(name_corpus)
-            name_scores = bm25_names.get_scores(query_tokens)
-        else:
-            name_scores = [0.0] * len(games)
+        index, rows = self._bm25_index_rows(games)
+        if not any(token in index.vocab for token in query_tokens):
+            return np.zeros(len(games))
         
-        # ===================================================================
-        # DESCRIPTION FIELD (Weight: 1.0)
-        # ===================================================================
-        # Build corpus of all descriptions
-        desc_corpus = []
-        for game in games:
-            description = game.get('short_description', '')
-            desc_tokens = self._tokenize(description) if description else []
-            desc_corpus.append(desc_tokens if desc_tokens else [''])
-        
-        # Create BM25 model for all descriptions
-        if desc_corpus:
-            bm25_descs = BM25Okapi(desc_corpus)
-            desc_scores = bm25_descs.get_scores(query_tokens)
+        # Scores are float32; widen only the selected rows so rounding
+        # yields clean decimals in the JSON response
+        scores = index.get_scores(query_tokens)[rows].astype(np.float64)
+        
+        return np.round(scores, 4)
+    
+    def _rank_bm25_top_k(
+        self,
+        games: List[Dict[str, Any]],
+        query: str,
+        offset: int,
+        limit: int
+    ) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """
+        Rank a pool of matching games by BM25 and return one page
+        
+        Uses MaxScore top-k (app.services.bm25.top_k): query terms are
+        scored in decreasing order of their best possible contribution,
+        and scoring stops early once no unseen game can enter the top
+        offset + limit.
+        
+        Args:
+            games: Candidate games matching the query and filters
+            query: Search query
+            offset: Pagination offset within the ranked pool
+            limit: Number of results to return
+        
+        Returns:
+            Tuple of (games for the page, their BM25 scores), best first
+        """
+        if not games:
+            return [], []
+        
+        # Queries without word tokens (e.g. punctuation only) score 0 everywhere:
+        # keep database order and skip building the page index
+        query_tokens = self._tokenize(query)
+        if not query_tokens:
+            page_games = games[offset:offset + limit]
+            return page_games, np.zeros(len(page_games))
+        
+        doc_ids, scores = bm25_top_k(
+            [(self._get_bm25_index(games), 1.0)],
+            query_tokens,
+            offset + limit
+        )
+        page = slice(offset, offset + limit)
+        return [games[i] for i in doc_ids[page]], np.round(scores[page].astype(np.float64), 4)
+    
+    def _bm25_index_rows(self, games: List[Dict[str, Any]]) -> Tuple[BM25Index, np.ndarray]:
+        """
+        Get the BM25F index for a batch of games
+        
+        Uses the warmed catalog index when every game is in it (IDF and
+        average lengths then come from the whole catalog), otherwise an
+        index built over the batch itself.
+        
+        Args:
+            games: List of game data dictionaries
+        
+        Returns:
+            Tuple of (index, row of each game in the index)
+        """
+        corpus = self._get_corpus_index()
+        if corpus is not None:
+            position = corpus['position']
+            if all(game.get('appid') in position for game in games):
+                rows = np.fromiter((position[game['appid']] for game in games), dtype=np.int64, count=len(games))
+                return corpus['index'], rows
+        
+        return self._get_bm25_index(games), np.arange(len(games))
+    
+    def warm_bm25_cache(self) -> bool:
+        """
+        Build BM25 indexes over the whole catalog (called on startup)
+        
+        Fetches every game's name and description once, tokenizes them and
+        stores one BM25F index under (table, catalog version).
+        Later requests score against these instead of rebuilding an index
+        per page.
+        
+        Returns:
+            True if the index was built, False otherwise
+        """
+        try:
+            version = self._corpus_index_version()
+            
+            games = []
+            page_size = 1000
+            while True:
+                page = self.db.schema(settings.DATABASE_SCHEMA)\
+                    .table(settings.DATABASE_TABLE)\
+                    .select('appid, name, short_description')\
+                    .order('appid')\
+                    .range(len(games), len(games) + page_size - 1)\
+                    .execute()
+                games.extend(page.data)
+                if len(page.data) < page_size:
+                    break
+            
+            SearchService._corpus_index = {
+                'key': (settings.DATABASE_TABLE, version),
+                'checked_at': time.monotonic(),
+                'position': {game['appid']: i for i, game in enumerate(games)},
+                'index': self._build_bm25_index(games)
+            }
+            logger.info(f"✅ BM25 catalog index built: {len(games)} games")
+            return True
+            
+        except Exception as e:
+            logger.warning(f"⚠️  Could not build BM25 catalog index: {e}")
+            logger.warning("   Using per-page BM25 indexes.")
+            return False
+    
+    def start_bm25_warmup(self) -> bool:
+        """
+        Build the catalog BM25 index in a background thread (called on startup)
+        
+        Runs on the same thread path as the periodic refresh, so startup
+        doesn't wait for the catalog to be paged in; requests use per-page
+        indexes until it is ready.
+        
+        Returns:
+            True if a build was started, False if one is already running
+        """
+        if not SearchService._corpus_refresh_lock.acquire(blocking=False):
+            return False
+        threading.Thread(
+            target=self._refresh_corpus_index,
+            args=(None,),
+            name='bm25-catalog-refresh',
+            daemon=True
+        ).start()
+        return True
+    
+    def _corpus_index_version(self) -> Tuple[int, Optional[int], Optional[str]]:
+        """
+        Cheap catalog version: (row count, highest appid, last text change)
+        
+        The last text change is the newest text_updated_at (see
+        sql/add_text_updated_at_column.sql); None without the column.
+        
+        Returns:
+            Version tuple that changes when games are added or removed, or
+            when a name or description is edited
+        """
+        result = self.db.schema(settings.DATABASE_SCHEMA)\
+            .table(settings.DATABASE_TABLE)\
+            .select('appid', count='exact')\
+            .order('appid', desc=True)\
+            .limit(1)\
+            .execute()
+        
+        text_updated_at = None
+        if SearchService._text_updated_at_available:
+            try:
+                latest = self.db.schema(settings.DATABASE_SCHEMA)\
+                    .table(settings.DATABASE_TABLE)\
+                    .select('text_updated_at')\
+                    .order('text_updated_at', desc=True)\
+                    .limit(1)\
+                    .execute()
+                text_updated_at = latest.data[0]['text_updated_at'] if latest.data else None
+            except Exception as e:
+                if 'text_updated_at' not in str(e):
+                    raise
+                logger.warning("⚠️  Column 'text_updated_at' not found, text edits won't refresh the BM25 index.")
+                logger.warning("   Run sql/add_text_updated_at_column.sql to track them.")
+                SearchService._text_updated_at_available = False
+        
+        return result.count, (result.data[0]['appid'] if result.data else None), text_updated_at
+    
+    def _get_corpus_index(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the catalog BM25 index, refreshing it in the background
+        
+        At most every BM25_INDEX_REFRESH_SECONDS one background thread
+        polls the catalog version and rebuilds the index if it changed.
+        Requests never wait for it: they keep using the current index
+        until the rebuilt one is swapped in.
+        
+        Returns:
+            Catalog index dictionary, or None if it was never built
+        """
+        corpus = SearchService._corpus_index
+        if corpus is None:
+            return None
+        
+        if time.monotonic() - corpus['checked_at'] >= settings.BM25_INDEX_REFRESH_SECONDS \
+                and SearchService._corpus_refresh_lock.acquire(blocking=False):
+            corpus['checked_at'] = time.monotonic()
+            threading.Thread(
+                target=self._refresh_corpus_index,
+                args=(corpus['key'],),
+                name='bm25-catalog-refresh',
+                daemon=True
+            ).start()
+        
+        return corpus
+    
+    def _refresh_corpus_index(self, key: Tuple) -> None:
+        """
+        Rebuild the catalog index if the catalog changed (background thread)
+        
+        Args:
+            key: Key of the index currently served, None to build it
+        """
+        try:
+            try:
+                version = self._corpus_index_version()
+            except Exception as e:
+                logger.warning(f"⚠️  Could not check BM25 catalog version: {e}")
+                return
+            if (settings.DATABASE_TABLE, version) != key:
+                logger.info("🔄 Catalog changed, rebuilding BM25 index")
+                self.warm_bm25_cache()  # Keeps the old index if the rebuild fails
+        finally:
+            SearchService._corpus_refresh_lock.release()
+    
+    def _build_bm25_index(self, games: List[Dict[str, Any]]) -> BM25Index:
+        """
+        Build a BM25F index over the name and description of games
+        
+        Args:
+            games: List of game data dictionaries
+        
+        Returns:
+            BM25Index with name weighted BM25_NAME_WEIGHT and description
+            weighted BM25_DESCRIPTION_WEIGHT
+        """
+        return BM25Index.from_fields(
+            [
+                [self._tokenize(game.get('name') or '') for game in games],
+                [self._tokenize(game.get('short_description') or '') for game in games]
+            ],
+            weights=[settings.BM25_NAME_WEIGHT, settings.BM25_DESCRIPTION_WEIGHT]
+        )
+    
+    def _get_bm25_index(self, games: List[Dict[str, Any]]) -> BM25Index:
+        """
+        Get the BM25F index for a page of results
+        
+        Indexes are cached by a hash of the names and descriptions, so
+        paging back and forth or re-running a query over the same results
+        skips tokenization and IDF/length-normalization precomputation.
+        
+        Args:
+            games: Games in result order
+        
+        Returns:
+            BM25Index over the games
+        """
+        key = hash((
+            tuple(game.get('name') or '' for game in games),
+            tuple(game.get('short_description') or '' for game in games),
+            settings.BM25_NAME_WEIGHT,
+            settings.BM25_DESCRIPTION_WEIGHT
+        ))
+        cache = SearchService._bm25_cache
+        with SearchService._cache_lock:
+            index = cache.get(key)
+            if index is not None:
+                cache.move_to_end(key)
+                return index
+        
+        # Build outside the lock (another thread may build the same page)
+        index = self._build_bm25_index(games)
+        with SearchService._cache_lock:
+            cache[key] = index
+            if len(cache) > self._BM25_CACHE_SIZE:
+                cache.popitem(last=False)
+        return index
+    
+    def _fetch_embedding_candidates(self, filters: Optional[SearchFilters], offset: int, limit: int):
+        """
+        Fetch one chunk of candidate embeddings for the Python semantic fallback
+        
+        Only appid and the embedding are selected; display fields are
+        fetched later for the returned page. Reads embedding_bin (packed
+        float32, see sql/add_embedding_bin_column.sql) under the name
+        'embedding' when the column exists, so vectors decode with
+        np.frombuffer instead of parsing text; otherwise reads the pgvector
+        text form.
+        
+        Args:
+            filters: Optional filters (price_max, type, genres)
+            offset: Position of the chunk (candidates are ordered by appid)
+            limit: Number of candidates to fetch
+        
+        Returns:
+            PostgREST response with appid and embedding per candidate
+        """
+        def build(embedding_column: str):
+            query_builder = self.db.schema(settings.DATABASE_SCHEMA)\
+                .table(settings.DATABASE_TABLE)\
+                .select(f'appid,{embedding_column}')\
+                .not_.is_('embedding', 'null')\
+                .order('appid')\
+                .range(offset, offset + limit - 1)
+            
+            # Apply filters (database-level for efficiency)
+            if filters:
+                if filters.price_max:
+                    query_builder = query_builder.lte('price_cents', filters.price_max)
+                if filters.type:
+                    query_builder = query_builder.eq('type', filters.type)
+                # Apply genre filter at database level (AND logic: must have ALL selected genres)
+                if filters.genres:
+                    # Single JSONB containment check against all genres
+                    query_builder = query_builder.contains('genres', _json_array(tuple(filters.genres)))
+                    logger.debug(f"Applied genre filter at database level: genres contains ALL of {filters.genres}")
+            return query_builder
+        
+        if SearchService._embedding_bin_available:
+            try:
+                return build('embedding:embedding_bin').execute()
+            except Exception as e:
+                if 'embedding_bin' not in str(e):
+                    raise
+                logger.warning("⚠️  Column 'embedding_bin' not found, parsing text embeddings.")
+                logger.warning("   Run sql/add_embedding_bin_column.sql to skip JSON parsing.")
+                SearchService._embedding_bin_available = False
+        
+        return build('embedding').execute()
+    
+    def _get_embedding_vector(self, game: Dict[str, Any], dim: int) -> Optional[np.ndarray]:
+        """
+        Get a game's embedding as an L2-normalized float32 vector
+        
+        Parsing the text of a 384-float embedding is the main cost of
+        the Python semantic fallback, so parsed vectors are cached by appid
+        (LRU). Each entry remembers a hash of the raw value, so a
+        regenerated embedding is parsed again.
+        
+        Args:
+            game: Game row with an 'embedding' column (hex bytea from
+                embedding_bin, JSON string or list)
+            dim: Expected embedding dimension
+        
+        Returns:
+            Normalized vector, or None if the embedding is missing or invalid
+        """
+        raw = game.get('embedding')
+        if not raw:
+            return None
+        
+        appid = game.get('appid')
+        raw_hash = hash(raw) if isinstance(raw, str) else hash(tuple(raw)) if isinstance(raw, list) else None
+        cache = SearchService._embedding_cache
+        with SearchService._cache_lock:
+            cached = cache.get(appid)
+            if cached is not None and cached[0] == raw_hash:
+                cache.move_to_end(appid)
+                return cached[1]
+        
+        if isinstance(raw, str) and raw.startswith('\\x'):
+            # Packed big-endian float32 from embedding_bin (PostgREST sends bytea as hex)
+            try:
+                vec = np.frombuffer(bytes.fromhex(raw[2:]), dtype='>f4').astype(np.float32)
+            except ValueError as e:
+                logger.debug(f"Failed to decode embedding for game {appid}: {e}")
+                return None
+        elif isinstance(raw, str) and raw.startswith('['):
+            # Parse string format: "[0.1, 0.2, ...]" in one C-level pass
+            try:
+                vec = np.fromstring(raw[1:-1], dtype=np.float32, sep=',')
+            except ValueError as e:
+                logger.debug(f"Failed to parse embedding for game {appid}: {e}")
+                return None
+        elif isinstance(raw, list):
+            vec = np.asarray(raw, dtype=np.float32)
         else:
-            desc_scores = [0.0] * len(games)
+            logger.debug(f"Unexpected embedding type for game {appid}: {type(raw)}")
+            return None
         
-        # ===================================================================
-        # COMBINE SCORES
-        # ===================================================================
-        for i in range(len(games)):
-            total_score = (name_scores[i] * 2.0) + (desc_scores[i] * 1.0)
-            scores.append(round(total_score, 4))
+        if len(vec) != dim:
+            logger.debug(f"Unexpected embedding size for game {appid}: {len(vec)}")
+            return None
+        
+        vec /= np.linalg.norm(vec) + 1e-12
+        with SearchService._cache_lock:
+            cache[appid] = (raw_hash, vec)
+            if len(cache) > self._EMBEDDING_CACHE_SIZE:
+                cache.popitem(last=False)
+        return vec
+    
+    @staticmethod
+    def _embedding_similarities(query_unit: np.ndarray, vectors: List[np.ndarray]) -> np.ndarray:
+        """
+        Cosine similarity of a query against one chunk of candidate embeddings
+        
+        Both sides are expected to be L2-normalized already (the caller
+        normalizes the query once per scan, candidates come from
+        _get_embedding_vector), so this is one matrix-vector product.
+        
+        Args:
+            query_unit: Unit-norm query embedding, float32, shape (D,)
+            vectors: Normalized candidate embeddings, each of shape (D,)
         
-        return scores
+        Returns:
+            float32 similarities, shape (N,)
+        """
+        return np.stack(vectors) @ query_unit
     
-    def _calculate_relevance_score_v2(self, game: Dict[str, Any], query: str) -> float:
+    def _calculate_relevance_score_v2(self, game: Dict[str, Any], query_lower: str) -> float:
         """
         Calculate relevance score for a game (Phase 2: multi-field with weights)
         
@@ -383,34 +1448,31 @@ class SearchService:
         
         Args:
             game: Game data dictionary
-            query: Search query
+            query_lower: Lower-cased search query
         
         Returns:
             Relevance score between 0.0 and 1.0
         """
-        if not query.strip():
+        if not query_lower.strip():
             return 0.5  # No query, all equally relevant
         
         total_score = 0.0
         max_possible_score = 15.0  # 10 (name) + 5 (desc)
-        query_lower = query.lower()
         
         # ===================================================================
         # NAME FIELD (Weight: 10)
         # ===================================================================
-        name_lower = game.get('name', '').lower()
+        name_lower = (game.get('name') or '').lower()
         name_score = 0.0
         
-        if query_lower in name_lower:
-            # Exact match: full weight
-            if query_lower == name_lower:
-                name_score = 10.0
-            # Starts with query: 90% weight
-            elif name_lower.startswith(query_lower):
-                name_score = 9.0
+        # One find() gives match, starts-with and (with the length) exact match
+        position = name_lower.find(query_lower)
+        if position == 0:
+            # Exact match: full weight; starts with query: 90% weight
+            name_score = 10.0 if len(name_lower) == len(query_lower) else 9.0
+        elif position > 0:
             # Contains query: 70% weight
-            else:
-                name_score = 7.0
+            name_score = 7.0
         
         total_score += name_score
         
@@ -422,16 +1484,20 @@ class SearchService:
             desc_lower = description.lower()
             desc_score = 0.0
             
-            if query_lower in desc_lower:
-                # Count occurrences for better scoring
-                occurrences = desc_lower.count(query_lower)
-                # Starts with: 5.0, Contains once: 3.0, Multiple: up to 5.0
-                if desc_lower.startswith(query_lower):
-                    desc_score = 5.0
-                elif occurrences > 1:
-                    desc_score = min(3.0 + occurrences * 0.5, 5.0)
-                else:
-                    desc_score = 3.0
+            position = desc_lower.find(query_lower)
+            # Starts with: 5.0, Contains once: 3.0, Multiple: up to 5.0
+            if position == 0:
+                desc_score = 5.0
+            elif position > 0:
+                # Count occurrences for better scoring, stopping at 4 (the
+                # score is capped at 5.0 from there on)
+                occurrences = 1
+                while occurrences < 4:
+                    position = desc_lower.find(query_lower, position + len(query_lower))
+                    if position == -1:
+                        break
+                    occurrences += 1
+                desc_score = min(3.0 + occurrences * 0.5, 5.0) if occurrences > 1 else 3.0
             
             total_score += desc_score
         
@@ -480,7 +1546,7 @@ class SearchService:
         
         try:
             # Generate query embedding
-            query_embedding = EmbeddingService.encode_query(query)
+            query_embedding = await self._run_cpu_bound(EmbeddingService.encode_query, query)
             logger.debug(f"Generated query embedding (dim: {len(query_embedding)})")
             
             # Build RPC parameters
@@ -504,18 +1570,20 @@ class SearchService:
             # IMPORTANT: Use schema() to specify the correct schema (steam, not public)
             logger.debug(f"Calling steam.search_games_semantic with params: {list(params.keys())}")
             try:
-                result = self.db.schema(settings.DATABASE_SCHEMA).rpc('search_games_semantic', params).execute()
+                result = await self._run_io(
+                    self.db.schema(settings.DATABASE_SCHEMA).rpc('search_games_semantic', params).execute
+                )
             except Exception as e:
-                # If function doesn't exist, use Python-side semantic search as fallback
+                # Missing function is a deployment error: scanning every embedding
+                # in Python is far slower than the HNSW index, so only do it on request
                 error_msg = str(e)
                 if 'Could not find the function' in error_msg or 'PGRST202' in error_msg:
-                    logger.warning("⚠️  PostgreSQL function 'steam.search_games_semantic' not found!")
-                    logger.warning("   Using Python-side semantic search fallback.")
-                    logger.warning("   For better performance, create the function in Supabase SQL Editor.")
-                    logger.warning("   See: CREATE_FUNCTIONS_IN_SUPABASE.md")
+                    logger.error("❌ PostgreSQL function 'steam.search_games_semantic' not found!")
+                    logger.error("   Run sql/create_semantic_search_function.sql (HNSW index + function).")
                     
-                    # Use Python-side semantic search
-                    return await self._python_semantic_search(query, filters, limit, offset, min_similarity)
+                    if settings.SEMANTIC_PYTHON_FALLBACK:
+                        logger.warning("⚠️  Using Python-side semantic search fallback (SEMANTIC_PYTHON_FALLBACK).")
+                        return await self._python_semantic_search(query, filters, limit, offset, min_similarity)
                 raise
             
             if not result.data:
@@ -532,21 +1600,10 @@ class SearchService:
                 }
             
             # Transform results
-            results = []
-            for game in result.data:
-                results.append({
-                    'game_id': game['appid'],
-                    'title': game['name'],
-                    'description': game.get('short_description', ''),
-                    'price': round(game['price_cents'] / 100, 2) if game['price_cents'] else 0.0,
-                    'genres': game.get('genres', []),
-                    'categories': game.get('categories', []),
-                    'type': game.get('type'),
-                    'release_date': game.get('release_date'),
-                    'total_reviews': game.get('total_reviews'),
-                    'similarity_score': round(game['similarity'], 4),
-                    'relevance_score': round(game['similarity'], 4)  # For compatibility
-                })
+            results = [
+                self._format_semantic_result(game, game['similarity'])
+                for game in result.data
+            ]
             
             logger.info(f"✓ Semantic search returned {len(results)} results")
             
@@ -565,6 +1622,33 @@ class SearchService:
             logger.error(f"❌ Semantic search failed: {e}", exc_info=True)
             raise
     
+    def _format_semantic_result(self, game: Dict[str, Any], similarity: float) -> Dict[str, Any]:
+        """
+        Transform a semantic search row into the SearchResultItem format
+        
+        Args:
+            game: Game row (from search_games_semantic or games_prod)
+            similarity: Cosine similarity to the query
+        
+        Returns:
+            Result dictionary with similarity_score and relevance_score
+        """
+        price_cents = game['price_cents']
+        score = round(similarity, 4)
+        return {
+            'game_id': game['appid'],
+            'title': game['name'],
+            'description': game.get('short_description', ''),
+            'price': round(price_cents / 100, 2) if price_cents else 0.0,
+            'genres': game.get('genres', []),
+            'categories': game.get('categories', []),
+            'type': game.get('type'),
+            'release_date': game.get('release_date'),
+            'total_reviews': game.get('total_reviews'),
+            'similarity_score': score,
+            'relevance_score': score  # For compatibility
+        }
+    
     async def hybrid_search(
         self,
         query: str,
@@ -610,37 +1694,28 @@ class SearchService:
             # Fetch more results for fusion (to improve quality)
             fetch_limit = min(200, limit * 10)
             
-            # 1. BM25 Search
-            logger.debug(f"Running BM25 search (limit: {fetch_limit})")
-            bm25_results = await self.search(
-                query, filters, SortBy.RELEVANCE, 0, fetch_limit
+            # 1. BM25 and 2. Semantic Search, concurrently (independent round-trips)
+            logger.debug(f"Running BM25 and semantic search (limit: {fetch_limit})")
+            bm25_results, semantic_results = await asyncio.gather(
+                self.search(query, filters, SortBy.RELEVANCE, 0, fetch_limit),
+                self.semantic_search(query, filters, fetch_limit, 0),
+                return_exceptions=True
             )
+            if isinstance(bm25_results, Exception):
+                raise bm25_results
             
-            # 2. Semantic Search (with fallback handling)
-            logger.debug(f"Running semantic search (limit: {fetch_limit})")
-            try:
-                semantic_results = await self.semantic_search(
-                    query, filters, fetch_limit, 0
-                )
-                # Check if semantic search fell back to BM25
-                if semantic_results.get('search_type') == 'semantic_fallback_bm25':
-                    logger.warning("Semantic search unavailable, using BM25-only hybrid search")
-                    # If semantic search fell back, just return BM25 results
-                    return {
-                        'results': bm25_results['results'][:limit],
-                        'total': bm25_results['total'],
-                        'offset': offset,
-                        'limit': limit,
-                        'query': query,
-                        'search_type': 'hybrid_fallback_bm25',
-                        'sort_by': sort_by,
-                        'alpha': alpha,
-                        'fallback_reason': 'Semantic search function not available',
-                        'filters_applied': filters.dict() if filters else None
-                    }
-            except Exception as e:
-                logger.warning(f"Semantic search failed: {e}")
+            # Semantic search fallback handling
+            fallback_reason = None
+            if isinstance(semantic_results, Exception):
+                logger.warning(f"Semantic search failed: {semantic_results}")
                 logger.warning("Falling back to BM25-only hybrid search")
+                fallback_reason = f'Semantic search error: {str(semantic_results)}'
+            elif semantic_results.get('search_type') == 'semantic_fallback_bm25':
+                # Semantic search fell back to BM25
+                logger.warning("Semantic search unavailable, using BM25-only hybrid search")
+                fallback_reason = 'Semantic search function not available'
+            
+            if fallback_reason is not None:
                 # Return BM25 results only
                 return {
                     'results': bm25_results['results'][:limit],
@@ -651,26 +1726,33 @@ class SearchService:
                     'search_type': 'hybrid_fallback_bm25',
                     'sort_by': sort_by,
                     'alpha': alpha,
-                    'fallback_reason': f'Semantic search error: {str(e)}',
+                    'fallback_reason': fallback_reason,
                     'filters_applied': filters.dict() if filters else None
                 }
             
             # 3. Reciprocal Rank Fusion
             logger.debug("Performing reciprocal rank fusion")
-            fused_results = self._reciprocal_rank_fusion(
+            # Only the top offset + limit fused results are ranked and built
+            fused_results = await self._run_cpu_bound(
+                self._reciprocal_rank_fusion,
                 bm25_results['results'],
                 semantic_results['results'],
-                alpha
+                alpha,
+                limit=offset + limit
+            )
+            fused_total = len(
+                {r['game_id'] for r in bm25_results['results']}
+                | {r['game_id'] for r in semantic_results['results']}
             )
             
             # 4. Apply pagination
             paginated = fused_results[offset:offset + limit]
             
-            logger.info(f"✓ Hybrid search returned {len(paginated)} results (from {len(fused_results)} fused)")
+            logger.info(f"✓ Hybrid search returned {len(paginated)} results (from {fused_total} fused)")
             
             return {
                 'results': paginated,
-                'total': len(fused_results),
+                'total': fused_total,
                 'offset': offset,
                 'limit': limit,
                 'query': query,
@@ -689,7 +1771,8 @@ class SearchService:
         bm25_results: List[Dict],
         semantic_results: List[Dict],
         alpha: float,
-        k: int = 60
+        k: int = 60,
+        limit: Optional[int] = None
     ) -> List[Dict]:
         """
         Reciprocal Rank Fusion for hybrid search
@@ -706,40 +1789,36 @@ class SearchService:
             semantic_results: Results from semantic search
             alpha: Weight for BM25 (0.0-1.0)
             k: Constant to prevent division by zero (default: 60)
+            limit: Only return the best limit results (default: all)
         
         Returns:
-            List of results sorted by fused score
+            List of results sorted by fused score. The input result dicts
+            are reused (fusion_score and relevance_score are set on them),
+            not copied.
         """
-        scores = {}
-        game_data = {}
-        
-        # BM25 scores (keyword matching)
-        for rank, result in enumerate(bm25_results, start=1):
-            game_id = result['game_id']
-            rrf_score = 1.0 / (k + rank)
-            scores[game_id] = alpha * rrf_score
-            game_data[game_id] = result
+        # Accumulate BM25 (keyword) and semantic (meaning) RRF scores in the
+        # compiled kernel; game ids come back in first-seen order
+        game_ids, fused = rrf_kernel.rrf_scores(
+            np.fromiter((r['game_id'] for r in bm25_results), dtype=np.int64, count=len(bm25_results)),
+            np.fromiter((r['game_id'] for r in semantic_results), dtype=np.int64, count=len(semantic_results)),
+            float(alpha),
+            float(k)
+        )
         
-        # Semantic scores (meaning matching)
-        for rank, result in enumerate(semantic_results, start=1):
-            game_id = result['game_id']
-            rrf_score = 1.0 / (k + rank)
-            
-            if game_id in scores:
-                scores[game_id] += (1 - alpha) * rrf_score
-            else:
-                scores[game_id] = (1 - alpha) * rrf_score
-                game_data[game_id] = result
+        # Result data: BM25 entry when a game is in both lists
+        game_data = {r['game_id']: r for r in reversed(semantic_results)}
+        game_data.update((r['game_id'], r) for r in bm25_results)
         
-        # Sort by fused score
-        sorted_ids = sorted(scores.keys(), key=lambda x: scores[x], reverse=True)
+        # Select the top fused scores (partition, then sort only the winners)
+        order = top_k_indices(fused, len(game_ids) if limit is None else limit)
         
-        # Build result list with fusion scores
+        # Build result list with fusion scores (in place on the result dicts)
         results = []
-        for game_id in sorted_ids:
-            result = game_data[game_id].copy()
-            result['fusion_score'] = round(scores[game_id], 6)
-            result['relevance_score'] = round(scores[game_id], 6)  # For compatibility
+        for i in order:
+            result = game_data[int(game_ids[i])]
+            score = round(float(fused[i]), 6)
+            result['fusion_score'] = score
+            result['relevance_score'] = score  # For compatibility
             results.append(result)
         
         return results
@@ -766,117 +1845,71 @@ class SearchService:
         
         try:
             # Generate query embedding
-            query_embedding = EmbeddingService.encode_query(query)
-            query_vec = np.array(query_embedding)
-            
-            # Build database query
-            query_builder = self.db.schema(settings.DATABASE_SCHEMA)\
-                .table(settings.DATABASE_TABLE)\
-                .select('appid,name,short_description,price_cents,genres,categories,type,release_date,total_reviews,embedding')\
-                .not_.is_('embedding', 'null')\
-                .limit(min(500, limit * 10))  # Fetch more for filtering
-            
-            # Apply filters (database-level for efficiency)
-            if filters:
-                if filters.price_max:
-                    query_builder = query_builder.lte('price_cents', filters.price_max)
-                if filters.type:
-                    query_builder = query_builder.eq('type', filters.type)
-                # Apply genre filter at database level (AND logic: must have ALL selected genres)
-                if filters.genres:
-                    import json
-                    for genre in filters.genres:
-                        # Convert to JSON string format for JSONB containment
-                        query_builder = query_builder.contains('genres', json.dumps([genre]))
-                    logger.debug(f"Applied genre filter at database level: genres contains ALL of {filters.genres}")
-            
-            # Execute query
-            result = query_builder.execute()
+            query_embedding = await self._run_cpu_bound(EmbeddingService.encode_query, query)
+            query_vec = np.asarray(query_embedding, dtype=np.float32)
+            # Normalized once here, not per chunk
+            query_unit = query_vec / (np.linalg.norm(query_vec) + np.float32(1e-12))
             
-            if not result.data:
-                return {
-                    'results': [],
-                    'total': 0,
-                    'offset': offset,
-                    'limit': limit,
-                    'query': query,
-                    'search_type': 'semantic_python_fallback',
-                    'sort_by': SortBy.RELEVANCE,
-                    'filters_applied': filters.dict() if filters else None
-                }
-            
-            # Calculate similarities
-            similarities = []
-            for game in result.data:
-                # Parse embedding (could be string or list)
-                game_embedding = game.get('embedding')
-                if not game_embedding:
-                    continue
-                
-                # Convert to numpy array
-                if isinstance(game_embedding, str):
-                    # Parse string format: "[0.1, 0.2, ...]"
-                    try:
-                        game_vec = np.array(json.loads(game_embedding))
-                    except (json.JSONDecodeError, ValueError, TypeError) as e:
-                        logger.debug(f"Failed to parse embedding for game {game.get('appid')}: {e}")
-                        continue
-                elif isinstance(game_embedding, list):
-                    game_vec = np.array(game_embedding)
-                else:
-                    logger.debug(f"Unexpected embedding type for game {game.get('appid')}: {type(game_embedding)}")
-                    continue
-                
-                # Calculate cosine similarity
-                similarity = np.dot(query_vec, game_vec) / (np.linalg.norm(query_vec) * np.linalg.norm(game_vec))
+            # Scan candidates in chunks of appid + embedding only, keeping just
+            # the running top offset + limit (appid, similarity)
+            candidate_limit = min(500, limit * 10)  # Fetch more for filtering
+            chunk_size = self._EMBEDDING_CHUNK_SIZE
+            best_ids = np.zeros(0, dtype=np.int64)
+            best_sims = np.zeros(0, dtype=np.float32)
+            total = 0
+            for chunk_start in range(0, candidate_limit, chunk_size):
+                chunk = await self._run_io(
+                    self._fetch_embedding_candidates,
+                    filters, chunk_start, min(chunk_size, candidate_limit - chunk_start)
+                )
                 
-                # Apply minimum similarity threshold
-                if similarity < min_similarity:
-                    continue
+                # Parse embeddings (cached per appid); genre filter is applied
+                # at database level (AND logic)
+                chunk_ids = []
+                vectors = []
+                for game in chunk.data:
+                    game_vec = self._get_embedding_vector(game, len(query_vec))
+                    if game_vec is not None:
+                        chunk_ids.append(game['appid'])
+                        vectors.append(game_vec)
                 
-                # Genre filter is already applied at database level (AND logic)
-                # No need to filter again here, but verify for safety
-                if filters and filters.genres:
-                    game_genres = game.get('genres', [])
-                    # AND logic: game must have ALL selected genres
-                    if not all(genre in game_genres for genre in filters.genres):
-                        logger.debug(f"Game {game.get('appid')} filtered out: missing required genres")
-                        continue
+                if vectors:
+                    sims = self._embedding_similarities(query_unit, vectors)
+                    # Apply minimum similarity threshold, then keep the top
+                    # offset + limit by partition (ties keep scan order)
+                    keep = sims >= min_similarity
+                    total += int(keep.sum())
+                    best_ids = np.concatenate((best_ids, np.asarray(chunk_ids, dtype=np.int64)[keep]))
+                    best_sims = np.concatenate((best_sims, sims[keep]))
+                    top = top_k_indices(best_sims, offset + limit)
+                    best_ids, best_sims = best_ids[top], best_sims[top]
                 
-                similarities.append({
-                    'game': game,
-                    'similarity': float(similarity)
-                })
-            
-            # Sort by similarity (descending)
-            similarities.sort(key=lambda x: x['similarity'], reverse=True)
+                if len(chunk.data) < chunk_size:
+                    break
             
-            # Apply pagination
-            paginated = similarities[offset:offset + limit]
+            # Apply pagination, then fetch display fields for the page only
+            page_ids = best_ids[offset:offset + limit].tolist()
+            page_sims = best_sims[offset:offset + limit].tolist()
+            games = {}
+            if page_ids:
+                page_query = self.db.schema(settings.DATABASE_SCHEMA)\
+                    .table(settings.DATABASE_TABLE)\
+                    .select(_RESULT_FIELDS)\
+                    .in_('appid', page_ids)
+                games = {game['appid']: game for game in (await self._run_io(page_query.execute)).data}
             
             # Transform results
-            results = []
-            for item in paginated:
-                game = item['game']
-                results.append({
-                    'game_id': game['appid'],
-                    'title': game['name'],
-                    'description': game.get('short_description', ''),
-                    'price': round(game['price_cents'] / 100, 2) if game['price_cents'] else 0.0,
-                    'genres': game.get('genres', []),
-                    'categories': game.get('categories', []),
-                    'type': game.get('type'),
-                    'release_date': game.get('release_date'),
-                    'total_reviews': game.get('total_reviews'),
-                    'similarity_score': round(item['similarity'], 4),
-                    'relevance_score': round(item['similarity'], 4)
-                })
+            results = [
+                self._format_semantic_result(games[appid], similarity)
+                for appid, similarity in zip(page_ids, page_sims)
+                if appid in games
+            ]
             
             logger.info(f"✓ Python semantic search returned {len(results)} results")
             
             return {
                 'results': results,
-                'total': len(similarities),
+                'total': total,
                 'offset': offset,
                 'limit': limit,
                 'query': query,
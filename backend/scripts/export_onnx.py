@@ -0,0 +1,133 @@
+"""
+Export Embedding Model to ONNX Script
+
+This script exports the sentence-transformers embedding model to ONNX,
+applies ONNX Runtime graph optimizations (level O2) and dynamic int8
+quantization. EmbeddingService.encode_batch uses the export when
+SEMANTIC_ONNX_MODEL_DIR points at the output directory, which speeds up
+scripts/populate_embeddings.py on CPU.
+
+Usage:
+    # Export to backend/onnx/
+    python -m scripts.export_onnx
+
+    # Custom output directory
+    python -m scripts.export_onnx --output-dir /models/minilm-onnx
+
+    # Skip int8 quantization (optimized float32 graph only)
+    python -m scripts.export_onnx --no-quantize
+
+Prerequisites:
+    - optimum[onnxruntime] installed
+
+Output:
+    model.onnx, model_optimized.onnx and model_optimized_quantized.onnx
+    plus the tokenizer files in the output directory
+"""
+
+import argparse
+import sys
+import logging
+from pathlib import Path
+from app.config import settings
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def export_onnx(output_dir: str, quantize: bool = True):
+    """
+    Export, optimize and quantize the embedding model
+
+    Args:
+        output_dir: Directory to write the ONNX files and tokenizer to
+        quantize: Also write a dynamic int8 quantized graph (default: True)
+
+    Process:
+        1. Export the transformer to ONNX (model.onnx)
+        2. Apply O2 graph optimizations (model_optimized.onnx)
+        3. Quantize weights to int8, per channel (model_optimized_quantized.onnx)
+    """
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTOptimizer, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig, OptimizationConfig
+    from sentence_transformers import SentenceTransformer
+    from transformers import AutoTokenizer
+
+    model_name = settings.SEMANTIC_MODEL_NAME
+    if '/' not in model_name:
+        model_name = f"sentence-transformers/{model_name}"
+    output_path = Path(output_dir)
+
+    # Export
+    logger.info(f"Exporting {model_name} to ONNX...")
+    model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+    model.save_pretrained(output_path)
+
+    # Truncate like sentence-transformers does (max_seq_length, not the
+    # tokenizer's own limit)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    tokenizer.model_max_length = SentenceTransformer(model_name).max_seq_length
+    tokenizer.save_pretrained(output_path)
+    logger.info(f"✓ Exported to {output_path / 'model.onnx'}")
+
+    # Graph optimizations
+    logger.info("Optimizing graph (O2)...")
+    optimizer = ORTOptimizer.from_pretrained(model)
+    optimizer.optimize(
+        save_dir=output_path,
+        optimization_config=OptimizationConfig(optimization_level=2)
+    )
+    logger.info(f"✓ Optimized graph: {output_path / 'model_optimized.onnx'}")
+
+    # Dynamic int8 quantization
+    if quantize:
+        logger.info("Quantizing to int8 (dynamic, per channel)...")
+        quantizer = ORTQuantizer.from_pretrained(output_path, file_name='model_optimized.onnx')
+        quantizer.quantize(
+            save_dir=output_path,
+            quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=True)
+        )
+        logger.info(f"✓ Quantized graph: {output_path / 'model_optimized_quantized.onnx'}")
+
+    print("\n✅ Export complete!")
+    print(f"   Set SEMANTIC_ONNX_MODEL_DIR={output_path.resolve()} to use it")
+
+
+def main():
+    """Main entry point for script"""
+    parser = argparse.ArgumentParser(
+        description='Export the embedding model to ONNX for faster batch encoding'
+    )
+
+    parser.add_argument(
+        '--output-dir',
+        default=str(Path(__file__).parent.parent / 'onnx'),
+        help='Output directory (default: backend/onnx)'
+    )
+
+    parser.add_argument(
+        '--no-quantize',
+        action='store_true',
+        help='Skip int8 quantization'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        export_onnx(args.output_dir, quantize=not args.no_quantize)
+    except ImportError as e:
+        print(f"\n❌ Missing dependency: {e}")
+        print("   pip install 'optimum[onnxruntime]'")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Fatal error: {e}")
+        print(f"\n❌ Fatal error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,26 +14,69 @@ Usage:
     # Use smaller batch size (for memory-constrained systems)
     python -m scripts.populate_embeddings --batch-size 50
     
-    # Start from specific game (for resuming interrupted runs)
-    python -m scripts.populate_embeddings --start-from 1000
+    # Re-encode games that already have an embedding (e.g. new model)
+    python -m scripts.populate_embeddings --force
+    
+    # Resume an interrupted --force run after the last written appid
+    python -m scripts.populate_embeddings --force --after-appid 440
+    
+    # Direct connection: prepared UPDATEs instead of COPY + staging table
+    python -m scripts.populate_embeddings --write-method executemany
+    
+    # Half precision encoding on a CUDA GPU
+    python -m scripts.populate_embeddings --fp16
+    
+    # int8 dynamic quantization of the encoder (CPU)
+    python -m scripts.populate_embeddings --int8
+    
+    # Compile the encoder with torch.compile (PyTorch 2.0+)
+    python -m scripts.populate_embeddings --compile
+    
+    # Full reload: drop the HNSW index first, rebuild it once at the end
+    # (needs DATABASE_URL)
+    python -m scripts.populate_embeddings --rebuild-index
+    
+    # Keep the embedding cache on disk (reused by the next / resumed run
+    # with the same backend and precision)
+    python -m scripts.populate_embeddings --cache-file embedding_cache.pkl
+    
+    # Encode with 4 processes, each on its own range of games (CPU hosts)
+    python -m scripts.populate_embeddings --workers 4
+    
+    # Encode on a llama.cpp server (GGUF of all-MiniLM-L6-v2, CPU hosts)
+    llama-server --embedding --pooling mean -m all-MiniLM-L6-v2.Q8_0.gguf -np 8 -c 2048 --port 8080
+    SEMANTIC_LLAMA_SERVER_URL=http://localhost:8080 python -m scripts.populate_embeddings
 
 Prerequisites:
     - pgvector extension enabled in Supabase
     - embedding column added to games_prod table
     - sentence-transformers installed
+    - Optional: DATABASE_URL set and asyncpg installed, to write embeddings
+      with COPY over a direct Postgres connection instead of the REST API
 
 Output:
-    Updates the embedding column for all games in steam.games_prod table
+    Updates the embedding column of the games in steam.games_prod that do
+    not have one yet (all games with --force). Re-running after an
+    interruption picks up where the previous run stopped.
 """
 
 import asyncio
 import argparse
 import sys
+import json
 import logging
-from typing import List, Dict, Any
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from hashlib import blake2b
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
 from supabase import create_client, Client
 from app.config import settings
-from app.services.embedding_service import EmbeddingService
+# EmbeddingService (sentence-transformers, torch) is imported where it is
+# used, so --help and --verify-only start without loading the model stack
 
 # Configure logging
 logging.basicConfig(
@@ -42,11 +85,494 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# HNSW index on the embedding column (see sql/create_semantic_search_function.sql)
+EMBEDDING_INDEX = 'games_prod_embedding_hnsw_idx'
+
+# Rows per concurrent write over the connection pool
+WRITE_CHUNK_SIZE = 32
+
+
+async def connect_direct():
+    """
+    Open a Postgres connection pool for direct game reads and embedding writes
+    
+    Works with a direct connection string or a transaction-mode pooler
+    such as Supavisor (port 6543): statements are not cached, and the COPY
+    staging table only lives for one transaction.
+    
+    Returns:
+        asyncpg pool with the pgvector codec registered on each connection,
+        or None when DATABASE_URL is not set or asyncpg is not installed
+        (embeddings are then written through the Supabase REST API)
+    """
+    if not settings.DATABASE_URL:
+        return None
+    
+    try:
+        import asyncpg
+        from pgvector.asyncpg import register_vector
+    except ImportError:
+        logger.warning("asyncpg not installed, using the Supabase REST API")
+        return None
+    
+    async def init_connection(conn):
+        # vector <-> numpy, jsonb (genres) <-> Python lists
+        await register_vector(conn)
+        await conn.set_type_codec('jsonb', encoder=json.dumps, decoder=json.loads, schema='pg_catalog')
+    
+    logger.info("Connecting to Postgres...")
+    pool = await asyncpg.create_pool(
+        settings.DATABASE_URL,
+        min_size=4,
+        max_size=8,
+        init=init_connection,
+        statement_cache_size=0
+    )
+    logger.info("✓ Connected to Postgres (connection pool)")
+    return pool
+
+
+async def copy_embeddings(pool, batch: List[Dict[str, Any]], embeddings: List[List[float]]):
+    """
+    Write embeddings with COPY and a single UPDATE
+    
+    Rows are streamed into a temporary staging table with binary COPY,
+    then applied to the games table with one UPDATE ... FROM, all in one
+    transaction.
+    
+    Args:
+        pool: asyncpg pool from connect_direct()
+        batch: Games to write (need 'appid')
+        embeddings: Embedding for each game, in batch order
+    """
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute(
+                'CREATE TEMP TABLE embedding_staging ('
+                f'appid bigint PRIMARY KEY, embedding vector({settings.SEMANTIC_EMBEDDING_DIM})'
+                ') ON COMMIT DROP'
+            )
+            await conn.copy_records_to_table(
+                'embedding_staging',
+                records=[(game['appid'], embedding) for game, embedding in zip(batch, embeddings)],
+                columns=['appid', 'embedding']
+            )
+            await conn.execute(
+                f'UPDATE {settings.DATABASE_SCHEMA}.{settings.DATABASE_TABLE} g '
+                'SET embedding = s.embedding '
+                'FROM embedding_staging s '
+                'WHERE g.appid = s.appid'
+            )
+
+
+async def drop_embedding_index(pool):
+    """
+    Drop the HNSW index before a bulk load
+    
+    Every embedding write otherwise inserts into the graph; building the
+    index once over the loaded column is much faster.
+    
+    Args:
+        pool: asyncpg pool from connect_direct()
+    """
+    logger.info(f"Dropping index {EMBEDDING_INDEX} for the bulk load...")
+    await pool.execute(f'DROP INDEX IF EXISTS {settings.DATABASE_SCHEMA}.{EMBEDDING_INDEX}')
+    logger.info("✓ Index dropped")
+
+
+async def create_embedding_index(pool):
+    """
+    Build the HNSW index after a bulk load (same definition as
+    sql/create_semantic_search_function.sql)
+    
+    Args:
+        pool: asyncpg pool from connect_direct()
+    """
+    logger.info(f"Building index {EMBEDDING_INDEX} (this can take a while)...")
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            # SET LOCAL: the setting must not outlive this transaction on a
+            # pooled connection
+            await conn.execute("SET LOCAL maintenance_work_mem = '2GB'")
+            await conn.execute(
+                f'CREATE INDEX IF NOT EXISTS {EMBEDDING_INDEX} '
+                f'ON {settings.DATABASE_SCHEMA}.{settings.DATABASE_TABLE} '
+                'USING hnsw (embedding vector_cosine_ops) '
+                'WITH (m = 16, ef_construction = 64)'
+            )
+        await conn.execute(f'ANALYZE {settings.DATABASE_SCHEMA}.{settings.DATABASE_TABLE}')
+    logger.info("✓ Index built")
+
+
+async def update_embeddings(pool, batch: List[Dict[str, Any]], embeddings: List[List[float]]):
+    """
+    Write embeddings with one UPDATE statement run for every row
+    
+    executemany sends all parameter sets for the statement in one round
+    trip; no staging table is needed.
+    
+    Args:
+        pool: asyncpg pool from connect_direct()
+        batch: Games to write (need 'appid')
+        embeddings: Embedding for each game, in batch order
+    """
+    await pool.executemany(
+        f'UPDATE {settings.DATABASE_SCHEMA}.{settings.DATABASE_TABLE} '
+        'SET embedding = $2 WHERE appid = $1',
+        [(game['appid'], embedding) for game, embedding in zip(batch, embeddings)]
+    )
+
+
+def upsert_embeddings(db: Client, batch: List[Dict[str, Any]], embeddings: List[List[float]]) -> Tuple[int, int]:
+    """
+    Write a batch of embeddings through the Supabase REST API
+    
+    The whole batch is stored with one upsert (one round trip). One bad
+    row fails the whole upsert, so on failure the batch is retried row by
+    row and only that game is lost.
+    
+    Args:
+        db: Supabase client
+        batch: Games of the batch (need 'appid')
+        embeddings: Embedding for each game, in batch order
+    
+    Returns:
+        Tuple of (games written, games failed)
+    """
+    rows = [
+        {'appid': game['appid'], 'embedding': embedding}
+        for game, embedding in zip(batch, embeddings)
+    ]
+    try:
+        db.schema(settings.DATABASE_SCHEMA)\
+            .table(settings.DATABASE_TABLE)\
+            .upsert(rows, on_conflict='appid')\
+            .execute()
+        
+        return len(rows), 0
+    
+    except Exception as e:
+        logger.warning(f"Batch upsert failed ({e}), updating games one by one...")
+    
+    written = 0
+    failed = 0
+    for game, embedding in zip(batch, embeddings):
+        try:
+            db.schema(settings.DATABASE_SCHEMA)\
+                .table(settings.DATABASE_TABLE)\
+                .update({'embedding': embedding})\
+                .eq('appid', game['appid'])\
+                .execute()
+            
+            written += 1
+            
+        except Exception as e:
+            logger.error(f"Failed to update game {game['appid']} ({game.get('name', 'Unknown')}): {e}")
+            failed += 1
+    
+    return written, failed
+
+
+async def write_batch(
+    db: Client,
+    pool,
+    write_method: str,
+    batch_num: int,
+    batch: List[Dict[str, Any]],
+    embeddings: List[List[float]]
+) -> Tuple[int, int, int]:
+    """
+    Store one batch of embeddings
+    
+    Uses the connection pool when there is one (COPY or UPDATEs, see
+    write_method), writing chunks of WRITE_CHUNK_SIZE rows concurrently;
+    otherwise the REST API (in a thread, as the Supabase client is
+    synchronous).
+    
+    Args:
+        db: Supabase client
+        pool: asyncpg pool from connect_direct(), or None
+        write_method: 'copy' or 'executemany'
+        batch_num: Batch number (for reporting)
+        batch: Games of the batch (need 'appid')
+        embeddings: Embedding for each game, in batch order
+    
+    Returns:
+        Tuple of (batch number, games written, games failed)
+    """
+    if pool is None:
+        try:
+            written, failed = await asyncio.to_thread(upsert_embeddings, db, batch, embeddings)
+            return batch_num, written, failed
+        except Exception as e:
+            logger.error(f"Failed to store batch {batch_num}: {e}")
+            print(f"❌ Batch {batch_num} failed: {e}")
+            return batch_num, 0, len(batch)
+    
+    # executemany: one UPDATE, all rows sent together; copy: stream the rows
+    # with COPY, then apply them with one UPDATE
+    write = update_embeddings if write_method == 'executemany' else copy_embeddings
+    starts = range(0, len(batch), WRITE_CHUNK_SIZE)
+    results = await asyncio.gather(
+        *[
+            write(pool, batch[i:i + WRITE_CHUNK_SIZE], embeddings[i:i + WRITE_CHUNK_SIZE])
+            for i in starts
+        ],
+        return_exceptions=True
+    )
+    
+    failed = 0
+    for i, result in zip(starts, results):
+        if isinstance(result, Exception):
+            chunk_size = len(batch[i:i + WRITE_CHUNK_SIZE])
+            logger.error(f"Failed to store {chunk_size} games of batch {batch_num}: {result}")
+            failed += chunk_size
+    if failed:
+        print(f"❌ Batch {batch_num}: {failed} games failed")
+    return batch_num, len(batch) - failed, failed
+
+
+def game_conditions(
+    missing_only: bool,
+    after_appid: Optional[int],
+    before_appid: Optional[int]
+) -> Tuple[str, List[int]]:
+    """
+    Build the WHERE clause selecting the games to embed (direct connection)
+    
+    Returns:
+        Tuple of (SQL condition, query arguments)
+    """
+    conditions = ['TRUE']
+    args = []
+    if missing_only:
+        conditions.append('embedding IS NULL')
+    if after_appid is not None:
+        args.append(after_appid)
+        conditions.append(f'appid > ${len(args)}')
+    if before_appid is not None:
+        args.append(before_appid)
+        conditions.append(f'appid < ${len(args)}')
+    return ' AND '.join(conditions), args
+
+
+def games_query(
+    db: Client,
+    columns: str,
+    missing_only: bool,
+    after_appid: Optional[int],
+    before_appid: Optional[int],
+    **select_options
+):
+    """Build the REST query selecting the games to embed"""
+    query = db.schema(settings.DATABASE_SCHEMA)\
+        .table(settings.DATABASE_TABLE)\
+        .select(columns, **select_options)
+    if missing_only:
+        query = query.is_('embedding', 'null')
+    if after_appid is not None:
+        query = query.gt('appid', after_appid)
+    if before_appid is not None:
+        query = query.lt('appid', before_appid)
+    return query
+
+
+async def count_games(
+    db: Client,
+    pool,
+    missing_only: bool = True,
+    after_appid: Optional[int] = None,
+    before_appid: Optional[int] = None
+) -> int:
+    """
+    Count the games to embed
+    
+    Args:
+        db: Supabase client
+        pool: asyncpg pool from connect_direct(), or None (use the REST API)
+        missing_only: Only count games without an embedding (default: True)
+        after_appid: Only count games with a greater appid (default: none)
+        before_appid: Only count games with a smaller appid (default: none)
+    
+    Returns:
+        Number of games
+    """
+    if pool is not None:
+        where, args = game_conditions(missing_only, after_appid, before_appid)
+        return await pool.fetchval(
+            f'SELECT count(*) FROM {settings.DATABASE_SCHEMA}.{settings.DATABASE_TABLE} WHERE {where}',
+            *args
+        )
+    
+    count_query = games_query(db, 'appid', missing_only, after_appid, before_appid, count='exact')\
+        .limit(1)
+    
+    # The Supabase client is synchronous: keep it off the event loop
+    count_response = await asyncio.to_thread(count_query.execute)
+    return count_response.count
+
+
+async def fetch_games(
+    db: Client,
+    pool,
+    after_appid: Optional[int],
+    count: int,
+    missing_only: bool = True,
+    before_appid: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch the next page of games to embed
+    
+    Pages by appid (keyset) rather than by offset: games that get their
+    embedding written drop out of the missing_only filter, which would
+    shift every offset after them.
+    
+    Args:
+        db: Supabase client
+        pool: asyncpg pool from connect_direct(), or None (use the REST API)
+        after_appid: appid of the last game of the previous page (None: start)
+        count: Number of games to fetch
+        missing_only: Only fetch games without an embedding (default: True)
+        before_appid: Stop before this appid (default: none)
+    
+    Returns:
+        Games with the fields used for the embedding text, ordered by appid
+    """
+    if pool is not None:
+        where, args = game_conditions(missing_only, after_appid, before_appid)
+        rows = await pool.fetch(
+            'SELECT appid, name, short_description, genres '
+            f'FROM {settings.DATABASE_SCHEMA}.{settings.DATABASE_TABLE} '
+            f'WHERE {where} ORDER BY appid LIMIT ${len(args) + 1}',
+            *args, count
+        )
+        return [dict(row) for row in rows]
+    
+    page_query = games_query(db, 'appid, name, short_description, genres', missing_only, after_appid, before_appid)\
+        .order('appid', desc=False)\
+        .limit(count)
+    
+    # The Supabase client is synchronous: keep it off the event loop
+    return (await asyncio.to_thread(page_query.execute)).data
+
+
+async def shard_bounds(db: Client, pool, missing_only: bool, after_appid: Optional[int], shard_size: int, shards: int) -> List[Optional[int]]:
+    """
+    Find the first appid of each shard after the first
+    
+    Args:
+        db: Supabase client
+        pool: asyncpg pool from connect_direct(), or None (use the REST API)
+        missing_only: Only consider games without an embedding
+        after_appid: Only consider games with a greater appid (None: all)
+        shard_size: Games per shard
+        shards: Number of shards
+    
+    Returns:
+        appids splitting the games into shards (shards - 1 values)
+    """
+    bounds = []
+    for offset in range(shard_size, shard_size * shards, shard_size):
+        if pool is not None:
+            where, args = game_conditions(missing_only, after_appid, None)
+            bounds.append(await pool.fetchval(
+                f'SELECT appid FROM {settings.DATABASE_SCHEMA}.{settings.DATABASE_TABLE} '
+                f'WHERE {where} ORDER BY appid LIMIT 1 OFFSET ${len(args) + 1}',
+                *args, offset
+            ))
+        else:
+            bound_query = games_query(db, 'appid', missing_only, after_appid, None)\
+                .order('appid', desc=False)\
+                .range(offset, offset)
+            rows = (await asyncio.to_thread(bound_query.execute)).data
+            bounds.append(rows[0]['appid'] if rows else None)
+    return [bound for bound in bounds if bound is not None]
+
+
+def encode_with_cache(batch: List[Dict[str, Any]], cache: Dict[bytes, np.ndarray]) -> List[List[float]]:
+    """
+    Encode a batch of games, reusing embeddings of identical game texts
+    
+    DLC, soundtracks and demos often share their game's name and
+    description, so each distinct text is encoded only once. Texts are
+    keyed by a BLAKE2b hash of EmbeddingService.game_text().
+    
+    Args:
+        batch: Games to encode
+        cache: Text hash -> float32 embedding (updated in place)
+    
+    Returns:
+        Embedding for each game, in batch order
+    """
+    from app.services.embedding_service import EmbeddingService
+    
+    keys = [blake2b(EmbeddingService.game_text(game).encode(), digest_size=16).digest() for game in batch]
+    misses = {}
+    for key, game in zip(keys, batch):
+        if key not in cache:
+            misses.setdefault(key, game)
+    
+    if misses:
+        encoded = EmbeddingService.encode_batch(list(misses.values()), show_progress=False)
+        for key, embedding in zip(misses, encoded):
+            cache[key] = np.asarray(embedding, dtype=np.float32)
+    logger.info(f"Encoded {len(misses)} texts, reused {len(batch) - len(misses)} cached embeddings")
+    
+    return [cache[key].tolist() for key in keys]
+
+
+def load_cache(cache_file: Optional[str], encoder: str) -> Dict[bytes, np.ndarray]:
+    """
+    Load the embedding cache written by a previous run
+    
+    The cache is only reused when it was written by the same encoder
+    (EmbeddingService.encoder_id(): backend, model and precision), so
+    switching e.g. from fp32 to --int8 or to the llama.cpp server never
+    mixes embeddings from different encoders in one column.
+    
+    Args:
+        cache_file: Pickle file written by save_cache (None: no cache)
+        encoder: Identifier of the encoder used for this run
+    
+    Returns:
+        Text hash -> embedding (empty if none or written by another encoder)
+    """
+    if cache_file and Path(cache_file).exists():
+        with open(cache_file, 'rb') as f:
+            stored = pickle.load(f)
+        cached_encoder = stored.get('encoder') if isinstance(stored.get('embeddings'), dict) else None
+        if cached_encoder != encoder:
+            logger.warning(
+                f"⚠️  Ignoring {cache_file}: written by encoder {cached_encoder!r}, "
+                f"this run uses {encoder!r} (the file will be overwritten)"
+            )
+            return {}
+        cache = stored['embeddings']
+        logger.info(f"✓ Loaded {len(cache)} cached embeddings from {cache_file}")
+        return cache
+    return {}
+
+
+def save_cache(cache_file: Optional[str], cache: Dict[bytes, np.ndarray], encoder: str):
+    """Write the embedding cache for the next run, tagged with its encoder"""
+    if cache_file:
+        with open(cache_file, 'wb') as f:
+            pickle.dump({'encoder': encoder, 'embeddings': cache}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.info(f"✓ Saved {len(cache)} cached embeddings to {cache_file}")
+
 
 async def populate_embeddings(
     batch_size: int = 100,
     limit: int = None,
-    start_from: int = 0
+    after_appid: Optional[int] = None,
+    before_appid: Optional[int] = None,
+    force: bool = False,
+    write_method: str = 'copy',
+    cache_file: Optional[str] = None,
+    fp16: bool = False,
+    int8: bool = False,
+    compile_model: bool = False,
+    rebuild_index: bool = False
 ):
     """
     Generate and store embeddings for all games
@@ -54,12 +580,24 @@ async def populate_embeddings(
     Args:
         batch_size: Number of games to process per batch (default: 100)
         limit: Max number of games to process (None = all)
-        start_from: Start from specific game index (default: 0)
+        after_appid: Only process games with a greater appid (default: none)
+        before_appid: Only process games with a smaller appid (default: none)
+        force: Also re-encode games that already have an embedding
+            (default: False)
+        write_method: 'copy' or 'executemany', used when DATABASE_URL
+            is set (default: copy)
+        cache_file: Pickle file to load/save the embedding cache (default: none)
+        fp16: Encode in half precision on CUDA (default: False)
+        int8: Quantize the encoder to int8 on CPU (default: False)
+        compile_model: Compile the encoder with torch.compile (default: False)
+        rebuild_index: Drop the HNSW index before loading and build it once
+            afterwards; needs DATABASE_URL (default: False)
     
     Process:
-        1. Fetch games from database
+        1. Fetch games from database, one batch at a time
         2. Generate embeddings in batches
-        3. Update database with embeddings
+        3. Update database with embeddings (overlapped with encoding
+           the next batch)
         4. Report progress
     """
     print("=" * 70)
@@ -74,98 +612,138 @@ async def populate_embeddings(
     )
     logger.info("✓ Connected to Supabase")
     
-    # Fetch count of games
-    logger.info("Fetching game count...")
-    count_query = db.schema(settings.DATABASE_SCHEMA)\
-        .table(settings.DATABASE_TABLE)\
-        .select('appid', count='exact')\
-        .limit(1)
+    # Connection pool for direct writes (None: write through the REST API)
+    pool = await connect_direct()
     
-    count_response = count_query.execute()
-    total_games_in_db = count_response.count
+    from app.services.embedding_service import EmbeddingService
     
-    logger.info(f"Found {total_games_in_db} games in database")
+    if fp16:
+        EmbeddingService.enable_fp16()
     
-    # Build query
-    logger.info("Fetching games from database...")
-    query = db.schema(settings.DATABASE_SCHEMA)\
-        .table(settings.DATABASE_TABLE)\
-        .select('appid, name, short_description, genres')\
-        .order('appid', desc=False)
+    if int8:
+        EmbeddingService.enable_int8()
+    
+    if compile_model:
+        EmbeddingService.enable_compile()
+    
+    if rebuild_index and pool is None:
+        logger.warning("⚠️  --rebuild-index needs a direct connection (DATABASE_URL), keeping the index")
+        rebuild_index = False
+    
+    # Fetch count of games (only those without an embedding unless --force)
+    missing_only = not force
+    logger.info("Fetching game count...")
+    total_games = await count_games(db, pool, missing_only, after_appid, before_appid)
+    
+    logger.info(f"Found {total_games} games {'without an embedding' if missing_only else 'in database'}")
     
     # Apply limit if specified
     if limit:
-        query = query.limit(limit)
+        total_games = min(total_games, limit)
         logger.info(f"Limiting to {limit} games")
     
-    # Apply offset if starting from specific game
-    if start_from > 0:
-        query = query.range(start_from, start_from + (limit or total_games_in_db) - 1)
-        logger.info(f"Starting from game index {start_from}")
-    
-    # Fetch games
-    response = query.execute()
-    games = response.data
+    if after_appid is not None:
+        logger.info(f"Starting after appid {after_appid}")
     
-    if not games:
-        logger.error("No games found in database")
-        print("\n❌ No games to process")
+    if not total_games:
+        logger.info("✓ All games already have embeddings (use --force to re-encode)")
+        print("\n✅ No games to process")
+        if pool is not None:
+            await pool.close()
         return
     
-    total_games = len(games)
-    logger.info(f"✓ Fetched {total_games} games to process")
+    logger.info(f"✓ {total_games} games to process")
     
     print("\n" + "=" * 70)
     print(f"Processing {total_games} games in batches of {batch_size}")
     print("=" * 70)
     
-    # Process in batches
+    # Process in batches: each batch's database write runs while the next
+    # batch is being encoded
     processed = 0
     failed = 0
     total_batches = (total_games + batch_size - 1) // batch_size
+    pending = None  # Write task of the previous batch
+    last_appid = after_appid  # Keyset: the next page starts after this appid
+    encoder = EmbeddingService.encoder_id()
+    cache = load_cache(cache_file, encoder)  # Game text hash -> embedding
     
-    for i in range(0, total_games, batch_size):
-        batch = games[i:i + batch_size]
-        batch_num = (i // batch_size) + 1
-        
-        print(f"\nBatch {batch_num}/{total_batches}")
-        print("-" * 70)
-        
-        logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} games)...")
+    async def collect(task):
+        """Wait for a batch write and report progress"""
+        nonlocal processed, failed
+        batch_num, written, write_failed = await task
+        processed += written
+        failed += write_failed
         
-        try:
-            # Generate embeddings for batch
-            logger.info(f"Generating embeddings for {len(batch)} games...")
-            embeddings = EmbeddingService.encode_batch(batch, show_progress=False)
-            logger.info(f"✓ Generated {len(embeddings)} embeddings")
+        # Progress report
+        progress_pct = (processed / total_games) * 100
+        print(f"✓ Batch {batch_num} complete")
+        print(f"  Progress: {processed}/{total_games} ({progress_pct:.1f}%)")
+        if failed > 0:
+            print(f"  Failed: {failed}")
+    
+    if rebuild_index:
+        await drop_embedding_index(pool)
+    
+    try:
+        for i in range(0, total_games, batch_size):
+            batch_num = (i // batch_size) + 1
             
-            # Update each game with its embedding
-            logger.info("Updating database...")
-            for game, embedding in zip(batch, embeddings):
-                try:
-                    db.schema(settings.DATABASE_SCHEMA)\
-                        .table(settings.DATABASE_TABLE)\
-                        .update({'embedding': embedding})\
-                        .eq('appid', game['appid'])\
-                        .execute()
-                    
-                    processed += 1
-                    
-                except Exception as e:
-                    logger.error(f"Failed to update game {game['appid']} ({game.get('name', 'Unknown')}): {e}")
-                    failed += 1
+            print(f"\nBatch {batch_num}/{total_batches}")
+            print("-" * 70)
             
-            # Progress report
-            progress_pct = (processed / total_games) * 100
-            print(f"✓ Batch {batch_num} complete")
-            print(f"  Progress: {processed}/{total_games} ({progress_pct:.1f}%)")
-            if failed > 0:
-                print(f"  Failed: {failed}")
+            # Fetch this batch's games
+            size = min(batch_size, total_games - i)
+            try:
+                batch = await fetch_games(db, pool, last_appid, size, missing_only, before_appid)
+            except Exception as e:
+                # The next page starts after this one: stop here, a re-run
+                # picks up the remaining games
+                logger.error(f"Failed to fetch batch {batch_num}: {e}")
+                print(f"❌ Batch {batch_num} failed: {e}")
+                failed += total_games - i
+                break
+            if not batch:
+                break
+            last_appid = batch[-1]['appid']
             
-        except Exception as e:
-            logger.error(f"Failed to process batch {batch_num}: {e}")
-            print(f"❌ Batch {batch_num} failed: {e}")
-            failed += len(batch)
+            logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} games)...")
+            
+            try:
+                # Generate embeddings for batch (in a thread, so the previous
+                # batch's write keeps going)
+                logger.info(f"Generating embeddings for {len(batch)} games...")
+                embeddings = await asyncio.to_thread(encode_with_cache, batch, cache)
+                logger.info(f"✓ Generated {len(embeddings)} embeddings")
+            except Exception as e:
+                logger.error(f"Failed to process batch {batch_num}: {e}")
+                print(f"❌ Batch {batch_num} failed: {e}")
+                failed += len(batch)
+                embeddings = None
+            
+            # One write at a time: finish the previous batch before starting this one
+            if pending is not None:
+                await collect(pending)
+                pending = None
+            
+            if embeddings is not None:
+                logger.info("Updating database...")
+                pending = asyncio.create_task(
+                    write_batch(db, pool, write_method, batch_num, batch, embeddings)
+                )
+        
+        if pending is not None:
+            await collect(pending)
+    finally:
+        # Keep the cache even when the run is interrupted
+        save_cache(cache_file, cache, encoder)
+        
+        # Never leave semantic search without its index
+        if rebuild_index:
+            await create_embedding_index(pool)
+    
+    if pool is not None:
+        await pool.close()
     
     # Final summary
     print("\n" + "=" * 70)
@@ -183,6 +761,124 @@ async def populate_embeddings(
         logger.error("❌ No games were processed successfully")
 
 
+def run_shard(workers: int, options: Dict[str, Any]):
+    """
+    Worker process entry point for populate_parallel()
+    
+    Splits the CPU cores evenly between the workers, then populates one
+    range of games with its own Supabase client and connection pool.
+    """
+    import torch
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+    
+    asyncio.run(populate_embeddings(**options))
+
+
+def populate_parallel(
+    workers: int,
+    limit: int = None,
+    after_appid: Optional[int] = None,
+    force: bool = False,
+    cache_file: Optional[str] = None,
+    rebuild_index: bool = False,
+    **options
+):
+    """
+    Generate and store embeddings with several encoder processes
+    
+    The games (ordered by appid) are split into one contiguous appid range
+    per worker, so each game is written by exactly one process. Ranges are
+    used instead of appid modulo sharding because the REST API cannot
+    filter on appid % N.
+    
+    Args:
+        workers: Number of encoder processes
+        limit: Max number of games to process (None = all)
+        after_appid: Only process games with a greater appid (default: none)
+        force: Also re-encode games that already have an embedding
+            (default: False)
+        cache_file: Embedding cache prefix; each worker keeps
+            <cache_file>.<rank> (default: none)
+        rebuild_index: Drop the HNSW index before the workers start and
+            build it once they are done; needs DATABASE_URL (default: False)
+        **options: Passed through to populate_embeddings()
+    """
+    missing_only = not force
+    
+    async def plan():
+        """Count the games, find the shard boundaries, drop the index"""
+        db: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_SECRET_KEY)
+        pool = await connect_direct()
+        try:
+            total_games = await count_games(db, pool, missing_only, after_appid)
+            if limit:
+                total_games = min(total_games, limit)
+            shard_size = max(1, (total_games + workers - 1) // workers)
+            shards = (total_games + shard_size - 1) // shard_size
+            bounds = await shard_bounds(db, pool, missing_only, after_appid, shard_size, shards)
+            dropped = False
+            if rebuild_index and total_games:
+                if pool is None:
+                    logger.warning("⚠️  --rebuild-index needs a direct connection (DATABASE_URL), keeping the index")
+                else:
+                    await drop_embedding_index(pool)
+                    dropped = True
+            return total_games, shard_size, bounds, dropped
+        finally:
+            if pool is not None:
+                await pool.close()
+    
+    async def rebuild():
+        """Build the HNSW index once all workers are done"""
+        pool = await connect_direct()
+        try:
+            await create_embedding_index(pool)
+        finally:
+            await pool.close()
+    
+    total_games, shard_size, bounds, rebuild_index = asyncio.run(plan())
+    if not total_games:
+        print("\n✅ No games to process")
+        return
+    
+    # Shard i covers (starts[i], stops[i]), both exclusive
+    starts = [after_appid] + [bound - 1 for bound in bounds]
+    stops = bounds + [None]
+    logger.info(f"Splitting {total_games} games across {len(starts)} workers ({shard_size} each)")
+    
+    # spawn: CUDA and the tokenizer threads do not survive fork()
+    context = multiprocessing.get_context('spawn')
+    failed_workers = 0
+    try:
+        with ProcessPoolExecutor(max_workers=len(starts), mp_context=context) as executor:
+            futures = [
+                executor.submit(run_shard, workers, dict(
+                    options,
+                    limit=min(shard_size, total_games - rank * shard_size),
+                    after_appid=start,
+                    before_appid=stop,
+                    force=force,
+                    cache_file=f"{cache_file}.{rank}" if cache_file else None
+                ))
+                for rank, (start, stop) in enumerate(zip(starts, stops))
+            ]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Worker failed: {e}")
+                    failed_workers += 1
+    finally:
+        # Never leave semantic search without its index
+        if rebuild_index:
+            asyncio.run(rebuild())
+    
+    if failed_workers:
+        print(f"\n❌ {failed_workers}/{len(futures)} workers failed")
+    else:
+        print(f"\n✅ All {len(futures)} workers finished")
+
+
 def verify_setup():
     """
     Verify that pgvector is set up correctly
@@ -229,8 +925,8 @@ def verify_setup():
         print("1. pgvector extension is enabled: CREATE EXTENSION vector;")
         print("2. Embedding column exists:")
         print("   ALTER TABLE steam.games_prod ADD COLUMN embedding vector(384);")
-        print("3. Index is created:")
-        print("   CREATE INDEX ON steam.games_prod USING ivfflat (embedding vector_cosine_ops);")
+        print("3. Index is created (sql/create_semantic_search_function.sql):")
+        print("   CREATE INDEX games_prod_embedding_hnsw_idx ON steam.games_prod USING hnsw (embedding vector_cosine_ops);")
         return False
 
 
@@ -270,10 +966,62 @@ Examples:
     )
     
     parser.add_argument(
-        '--start-from',
+        '--force',
+        action='store_true',
+        help='Also re-encode games that already have an embedding'
+    )
+    
+    parser.add_argument(
+        '--after-appid',
+        type=int,
+        default=None,
+        help='Only process games with a greater appid, e.g. to resume a --force run (default: none)'
+    )
+    
+    parser.add_argument(
+        '--write-method',
+        choices=['copy', 'executemany'],
+        default='copy',
+        help='How to write embeddings over a direct connection (DATABASE_URL): '
+             'COPY into a staging table, or prepared UPDATEs (default: copy)'
+    )
+    
+    parser.add_argument(
+        '--fp16',
+        action='store_true',
+        help='Encode in half precision (CUDA only)'
+    )
+    
+    parser.add_argument(
+        '--int8',
+        action='store_true',
+        help='Quantize the encoder to int8 (dynamic, CPU only)'
+    )
+    
+    parser.add_argument(
+        '--compile',
+        action='store_true',
+        help='Compile the encoder with torch.compile (PyTorch 2.0+; '
+             'set TORCHINDUCTOR_CACHE_DIR to reuse kernels across runs)'
+    )
+    
+    parser.add_argument(
+        '--rebuild-index',
+        action='store_true',
+        help='Drop the HNSW index before loading and rebuild it afterwards (needs DATABASE_URL)'
+    )
+    
+    parser.add_argument(
+        '--cache-file',
+        default=None,
+        help='Pickle file for the embedding cache, reused by runs with the same encoder (default: none)'
+    )
+    
+    parser.add_argument(
+        '--workers',
         type=int,
-        default=0,
-        help='Start from specific game index (default: 0)'
+        default=1,
+        help='Encoder processes, each on its own range of games (default: 1)'
     )
     
     parser.add_argument(
@@ -297,14 +1045,36 @@ Examples:
     print()
     
     try:
-        asyncio.run(populate_embeddings(
-            batch_size=args.batch_size,
-            limit=args.limit,
-            start_from=args.start_from
-        ))
+        if args.workers > 1:
+            populate_parallel(
+                args.workers,
+                limit=args.limit,
+                after_appid=args.after_appid,
+                force=args.force,
+                cache_file=args.cache_file,
+                rebuild_index=args.rebuild_index,
+                batch_size=args.batch_size,
+                write_method=args.write_method,
+                fp16=args.fp16,
+                int8=args.int8,
+                compile_model=args.compile
+            )
+        else:
+            asyncio.run(populate_embeddings(
+                batch_size=args.batch_size,
+                limit=args.limit,
+                after_appid=args.after_appid,
+                force=args.force,
+                write_method=args.write_method,
+                cache_file=args.cache_file,
+                fp16=args.fp16,
+                int8=args.int8,
+                compile_model=args.compile,
+                rebuild_index=args.rebuild_index
+            ))
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user")
-        print("Progress has been saved. You can resume with --start-from")
+        print("Progress has been saved. Re-run to embed the remaining games")
         sys.exit(1)
     except Exception as e:
         logger.error(f"Fatal error: {e}")
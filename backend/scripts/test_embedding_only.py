@@ -9,6 +9,7 @@ Usage:
     python -m scripts.test_embedding_only
 """
 
+import asyncio
 import sys
 from pathlib import Path
 
@@ -17,6 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from supabase import create_client
 from app.config import settings
 from app.services.embedding_service import EmbeddingService
+from app.services.bm25 import top_k_indices
 import logging
 import numpy as np
 
@@ -24,22 +26,64 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def parse_embedding(vec):
+    """Convert an embedding to a float32 array (handle string format from DB)"""
+    if isinstance(vec, str):
+        return np.fromstring(vec.strip()[1:-1], dtype=np.float32, sep=',')
+    return np.asarray(vec, dtype=np.float32)
+
+
+def normalize_rows(matrix):
+    """L2-normalize each row, so dot products are cosine similarities"""
+    return matrix / np.linalg.norm(matrix, axis=-1, keepdims=True)
+
+
 def cosine_similarity(vec1, vec2):
     """Calculate cosine similarity between two vectors"""
-    # Convert to numpy arrays (handle string format from DB)
-    if isinstance(vec1, str):
-        vec1 = np.array([float(x) for x in vec1.strip('[]').split(',')])
-    else:
-        vec1 = np.array(vec1)
-    
-    if isinstance(vec2, str):
-        vec2 = np.array([float(x) for x in vec2.strip('[]').split(',')])
-    else:
-        vec2 = np.array(vec2)
-    
+    vec1 = parse_embedding(vec1)
+    vec2 = parse_embedding(vec2)
     return np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
 
 
+def fetch_games_with_embeddings(client, limit):
+    """
+    Fetch games that have embeddings
+    
+    With DATABASE_URL set (and asyncpg installed), rows are read over a
+    direct connection in binary (4 bytes per float, decoded straight to
+    numpy by the pgvector codec); otherwise through the REST API as text.
+    """
+    if settings.DATABASE_URL:
+        try:
+            import asyncpg
+            from pgvector.asyncpg import register_vector
+        except ImportError:
+            logger.warning("asyncpg not installed, fetching embeddings through the REST API")
+        else:
+            async def fetch():
+                conn = await asyncpg.connect(settings.DATABASE_URL)
+                try:
+                    await register_vector(conn)
+                    rows = await conn.fetch(
+                        f'SELECT appid, name, short_description, embedding '
+                        f'FROM {settings.DATABASE_SCHEMA}.{settings.DATABASE_TABLE} '
+                        'WHERE embedding IS NOT NULL LIMIT $1',
+                        limit
+                    )
+                    return [dict(row) for row in rows]
+                finally:
+                    await conn.close()
+            
+            return asyncio.run(fetch())
+    
+    return client.schema('steam').table('games_prod') \
+        .select('appid,name,short_description,embedding') \
+        .not_.is_('embedding', 'null') \
+        .limit(limit) \
+        .execute() \
+        .data
+
+
 def main():
     """Main test function"""
     
@@ -106,34 +150,32 @@ def main():
     print()
     
     # Fetch more games
-    result = client.schema('steam').table('games_prod') \
-        .select('appid,name,short_description,embedding') \
-        .not_.is_('embedding', 'null') \
-        .limit(100) \
-        .execute()
+    rows = fetch_games_with_embeddings(client, 100)
     
-    if not result.data:
+    if not rows:
         print("   ❌ No games found")
         return False
     
-    # Calculate similarities
-    similarities = []
-    for game in result.data:
-        if game.get('embedding'):
-            sim = cosine_similarity(query_emb, game['embedding'])
-            similarities.append({
-                'name': game['name'],
-                'similarity': sim,
-                'description': game.get('short_description', '')[:100]
-            })
-    
-    # Sort by similarity
-    similarities.sort(key=lambda x: x['similarity'], reverse=True)
-    
-    print(f"   ✓ Calculated similarities for {len(similarities)} games")
+    # Parse and normalize all embeddings once; each query is then one
+    # matrix-vector product
+    games = [game for game in rows if game.get('embedding') is not None]
+    matrix = normalize_rows(np.stack([parse_embedding(game['embedding']) for game in games]))
+    
+    # Calculate similarities, keep the top 10 (partition, then sort only those)
+    sims = matrix @ normalize_rows(parse_embedding(query_emb))
+    top_10 = [
+        {
+            'name': games[j]['name'],
+            'similarity': float(sims[j]),
+            'description': (games[j].get('short_description') or '')[:100]
+        }
+        for j in top_k_indices(sims, 10)
+    ]
+    
+    print(f"   ✓ Calculated similarities for {len(sims)} games")
     print()
     print("   Top 10 results:")
-    for i, game in enumerate(similarities[:10], 1):
+    for i, game in enumerate(top_10, 1):
         print(f"   {i}. {game['name']} (similarity: {game['similarity']:.4f})")
         if game['description']:
             print(f"      {game['description'][:80]}...")
@@ -148,20 +190,20 @@ def main():
         ("strategy war", "Should find strategy war games")
     ]
     
-    for query, expected in test_cases:
-        query_emb = EmbeddingService.encode_query(query)
-        
-        # Calculate similarities for first 50 games
-        sims = []
-        for game in result.data[:50]:
-            if game.get('embedding'):
-                sim = cosine_similarity(query_emb, game['embedding'])
-                sims.append((game['name'], sim))
-        
-        sims.sort(key=lambda x: x[1], reverse=True)
+    # Games among the first 50 rows lead the list (reusing the parsed matrix)
+    first_50 = sum(1 for game in rows[:50] if game.get('embedding') is not None)
+    
+    # Calculate similarities for first 50 games, all queries in one product
+    queries = normalize_rows(np.stack([
+        parse_embedding(EmbeddingService.encode_query(query)) for query, _ in test_cases
+    ]))
+    all_scores = matrix[:first_50] @ queries.T
+    
+    for (query, expected), scores in zip(test_cases, all_scores.T):
+        top_3 = [(games[j]['name'], float(scores[j])) for j in top_k_indices(scores, 3)]
         
         print(f"   Query: '{query}' ({expected})")
-        print(f"   Top 3: {', '.join([f'{name} ({sim:.3f})' for name, sim in sims[:3]])}")
+        print(f"   Top 3: {', '.join([f'{name} ({sim:.3f})' for name, sim in top_3])}")
         print()
     
     print("=" * 80)
@@ -0,0 +1,39 @@
+-- ============================================================================
+-- Binary Embedding Column
+-- ============================================================================
+-- Adds embedding_bin, a generated bytea copy of the pgvector embedding
+-- column packed as float32 (big-endian, as written by float4send). The
+-- Python semantic fallback (SEMANTIC_PYTHON_FALLBACK) reads it instead of
+-- the "[0.1, 0.2, ...]" text form and decodes it with np.frombuffer, so
+-- no JSON is parsed per game.
+--
+-- The column is generated, so it stays in sync with embedding without
+-- a backfill. The HNSW index and steam.search_games_semantic keep using
+-- the embedding column.
+--
+-- Safe to run multiple times.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION steam.vector_to_float4_bytea(v vector)
+RETURNS bytea
+LANGUAGE sql
+IMMUTABLE
+STRICT
+AS $$
+    SELECT string_agg(float4send(x), ''::bytea ORDER BY i)
+    FROM unnest(v::real[]) WITH ORDINALITY AS t(x, i)
+$$;
+
+ALTER TABLE steam.games_prod
+    ADD COLUMN IF NOT EXISTS embedding_bin bytea
+    GENERATED ALWAYS AS (steam.vector_to_float4_bytea(embedding)) STORED;
+
+-- ============================================================================
+-- Test queries
+-- ============================================================================
+
+-- Test 1: 384 dimensions * 4 bytes = 1536 bytes per game
+-- SELECT appid, octet_length(embedding_bin) FROM steam.games_prod
+-- WHERE embedding IS NOT NULL
+-- LIMIT 5;
+-- ============================================================================
@@ -0,0 +1,47 @@
+-- ============================================================================
+-- Text Change Timestamp
+-- ============================================================================
+-- Adds text_updated_at, set whenever a game's name or short_description
+-- changes. The backend includes its maximum in the version of the
+-- catalog-wide BM25 index (SearchService._corpus_index_version), so edits
+-- to indexed text trigger a rebuild, not only added or removed games.
+--
+-- Updates that leave the text alone (e.g. writing embeddings) do not
+-- touch the column.
+--
+-- Safe to run multiple times.
+-- ============================================================================
+
+ALTER TABLE steam.games_prod
+    ADD COLUMN IF NOT EXISTS text_updated_at timestamptz NOT NULL DEFAULT now();
+
+CREATE OR REPLACE FUNCTION steam.touch_text_updated_at()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.text_updated_at := now();
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS games_prod_text_updated_at ON steam.games_prod;
+
+CREATE TRIGGER games_prod_text_updated_at
+BEFORE UPDATE OF name, short_description ON steam.games_prod
+FOR EACH ROW
+WHEN (OLD.name IS DISTINCT FROM NEW.name
+      OR OLD.short_description IS DISTINCT FROM NEW.short_description)
+EXECUTE FUNCTION steam.touch_text_updated_at();
+
+-- Serves ORDER BY text_updated_at DESC LIMIT 1 (the version poll)
+CREATE INDEX IF NOT EXISTS idx_games_prod_text_updated_at
+    ON steam.games_prod (text_updated_at);
+
+-- ============================================================================
+-- Test queries
+-- ============================================================================
+
+-- Test 1: Latest text change
+-- SELECT max(text_updated_at) FROM steam.games_prod;
+-- ============================================================================
@@ -0,0 +1,214 @@
+-- ============================================================================
+-- BM25 Index and Ranking Function
+-- ============================================================================
+-- Moves BM25 ranking into PostgreSQL. Term statistics are computed once at
+-- index time over the whole catalog (not per result page), and queries only
+-- transfer the top-k ranked rows to the backend.
+--
+-- Tables:
+--   steam.bm25_postings  (field, token, appid, tf, doc_len)
+--   steam.bm25_idf       (field, token, idf)
+--   steam.bm25_stats     (field, n_docs, avg_len, refreshed_at)
+--
+-- Fields are scored separately ('name', 'description') and combined with
+-- per-field weights, matching the backend's BM25_NAME_WEIGHT and
+-- BM25_DESCRIPTION_WEIGHT settings. Parameters: k1 = 1.5, b = 0.75.
+--
+-- Usage:
+--   -- Build (and rebuild after data imports)
+--   SELECT steam.refresh_bm25_index();
+--
+--   -- Search
+--   SELECT * FROM steam.search_games_bm25(
+--     q := 'space exploration',
+--     k := 20,
+--     k_offset := 0,
+--     filters := '{"price_max": 2000, "genres": ["Action"]}'::jsonb
+--   );
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS steam.bm25_postings (
+    field text NOT NULL,
+    token text NOT NULL,
+    appid bigint NOT NULL,
+    tf int NOT NULL,
+    doc_len int NOT NULL,
+    PRIMARY KEY (field, token, appid)
+);
+
+CREATE TABLE IF NOT EXISTS steam.bm25_idf (
+    field text NOT NULL,
+    token text NOT NULL,
+    idf float8 NOT NULL,
+    PRIMARY KEY (field, token)
+);
+
+CREATE TABLE IF NOT EXISTS steam.bm25_stats (
+    field text PRIMARY KEY,
+    n_docs bigint NOT NULL,
+    avg_len float8 NOT NULL,
+    refreshed_at timestamptz NOT NULL DEFAULT now()
+);
+
+-- ============================================================================
+-- Index build: tokenize every game once and precompute term statistics
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION steam.refresh_bm25_index()
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    TRUNCATE steam.bm25_postings, steam.bm25_idf, steam.bm25_stats;
+
+    -- Term frequencies per (field, token, game), tokenized like the backend
+    -- (lowercase, split on non-word characters)
+    INSERT INTO steam.bm25_postings (field, token, appid, tf, doc_len)
+    WITH docs AS (
+        SELECT g.appid, 'name'::text AS field, lower(coalesce(g.name, '')) AS body
+        FROM steam.games_prod g
+        UNION ALL
+        SELECT g.appid, 'description'::text, lower(coalesce(g.short_description, ''))
+        FROM steam.games_prod g
+    ),
+    tokens AS (
+        SELECT d.appid, d.field, t.token
+        FROM docs d, regexp_split_to_table(d.body, '\W+') AS t(token)
+        WHERE t.token <> ''
+    ),
+    lens AS (
+        SELECT tk.appid, tk.field, count(*) AS doc_len
+        FROM tokens tk
+        GROUP BY tk.appid, tk.field
+    )
+    SELECT tk.field, tk.token, tk.appid, count(*), l.doc_len
+    FROM tokens tk
+    JOIN lens l ON l.appid = tk.appid AND l.field = tk.field
+    GROUP BY tk.field, tk.token, tk.appid, l.doc_len;
+
+    -- Corpus size and average field length (games with an empty field count as length 0)
+    INSERT INTO steam.bm25_stats (field, n_docs, avg_len)
+    SELECT d.field, n.n_docs, greatest(sum(d.doc_len)::float8 / n.n_docs, 1e-9)
+    FROM (SELECT DISTINCT p.field, p.appid, p.doc_len FROM steam.bm25_postings p) d
+    CROSS JOIN (SELECT count(*) AS n_docs FROM steam.games_prod) n
+    GROUP BY d.field, n.n_docs;
+
+    -- Okapi IDF; negative values (terms in more than half the games) are
+    -- floored to 0.25 * average IDF, as in rank_bm25.BM25Okapi
+    INSERT INTO steam.bm25_idf (field, token, idf)
+    WITH df AS (
+        SELECT p.field, p.token, count(*) AS df
+        FROM steam.bm25_postings p
+        GROUP BY p.field, p.token
+    ),
+    raw AS (
+        SELECT df.field, df.token, ln(s.n_docs - df.df + 0.5) - ln(df.df + 0.5) AS idf
+        FROM df
+        JOIN steam.bm25_stats s ON s.field = df.field
+    )
+    SELECT r.field, r.token,
+           CASE WHEN r.idf < 0 THEN 0.25 * avg(r.idf) OVER (PARTITION BY r.field) ELSE r.idf END
+    FROM raw r;
+
+    ANALYZE steam.bm25_postings;
+    ANALYZE steam.bm25_idf;
+END;
+$$;
+
+-- ============================================================================
+-- Ranking function: score matching games and return the requested page
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION steam.search_games_bm25(
+    q text,
+    k int DEFAULT 20,
+    k_offset int DEFAULT 0,
+    filters jsonb DEFAULT '{}'::jsonb,
+    name_weight float8 DEFAULT 2.0,
+    description_weight float8 DEFAULT 1.0
+)
+RETURNS TABLE (
+    appid bigint,
+    name text,
+    short_description text,
+    price_cents int,
+    genres jsonb,
+    categories jsonb,
+    type text,
+    release_date date,
+    total_reviews int,
+    bm25_score float8,
+    total_count bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH query_tokens AS (
+        SELECT t.token
+        FROM regexp_split_to_table(lower(q), '\W+') AS t(token)
+        WHERE t.token <> ''
+    ),
+    scores AS (
+        SELECT p.appid,
+               sum(
+                   CASE WHEN p.field = 'name' THEN name_weight ELSE description_weight END
+                   * i.idf * (p.tf * (1.5 + 1))
+                   / (p.tf + 1.5 * (1 - 0.75 + 0.75 * p.doc_len / s.avg_len))
+               ) AS score
+        FROM query_tokens qt
+        JOIN steam.bm25_idf i ON i.token = qt.token
+        JOIN steam.bm25_postings p ON p.field = i.field AND p.token = i.token
+        JOIN steam.bm25_stats s ON s.field = p.field
+        GROUP BY p.appid
+        -- Every query term must occur (in either field), as with the
+        -- full-text and ILIKE paths, so totals don't depend on the path
+        HAVING count(DISTINCT p.token) = (SELECT count(DISTINCT token) FROM query_tokens)
+    )
+    SELECT
+        g.appid,
+        g.name,
+        g.short_description,
+        g.price_cents,
+        g.genres,
+        g.categories,
+        g.type,
+        g.release_date,
+        g.total_reviews,
+        sc.score::float8 AS bm25_score,
+        count(*) OVER () AS total_count
+    FROM scores sc
+    JOIN steam.games_prod g ON g.appid = sc.appid
+    WHERE (filters->>'price_min' IS NULL OR g.price_cents >= (filters->>'price_min')::int)
+      AND (filters->>'price_max' IS NULL OR g.price_cents <= (filters->>'price_max')::int)
+      AND (filters->>'type' IS NULL OR g.type = filters->>'type')
+      -- JSONB containment: must have ALL selected genres / categories
+      AND (jsonb_typeof(filters->'genres') IS DISTINCT FROM 'array' OR g.genres @> (filters->'genres'))
+      AND (jsonb_typeof(filters->'categories') IS DISTINCT FROM 'array' OR g.categories @> (filters->'categories'))
+      AND (filters->>'release_date_after' IS NULL OR g.release_date >= (filters->>'release_date_after')::date)
+      AND (filters->>'release_date_before' IS NULL OR g.release_date <= (filters->>'release_date_before')::date)
+      AND (filters->>'min_reviews' IS NULL OR g.total_reviews >= (filters->>'min_reviews')::int)
+    ORDER BY sc.score DESC, g.appid
+    LIMIT k
+    OFFSET k_offset;
+$$;
+
+-- ============================================================================
+-- Grant execute permissions
+-- ============================================================================
+
+GRANT EXECUTE ON FUNCTION steam.search_games_bm25 TO authenticated;
+GRANT EXECUTE ON FUNCTION steam.search_games_bm25 TO anon;
+
+-- ============================================================================
+-- Notes:
+-- ============================================================================
+-- 1. Run steam.refresh_bm25_index() after bulk imports; search results only
+--    reflect games present at the last refresh.
+-- 2. The (field, token, appid) primary key serves the posting lookups; the
+--    number of joined postings is bounded by the query terms' document
+--    frequencies, not by the catalog size.
+-- 3. A game matches only if it contains every query term, like
+--    search_tsv @@ websearch_to_tsquery('simple', q), so total_count agrees
+--    with the full-text path. Tokenization differs slightly (this function
+--    splits on non-word characters), which can still shift edge cases.
+-- ============================================================================
@@ -0,0 +1,41 @@
+-- ============================================================================
+-- Genre / Category Filter Indexes
+-- ============================================================================
+-- The backend filters genres and categories with a single JSONB
+-- containment check per column (all selected values must be present):
+--   genres=cs.["Action","RPG"]
+-- which PostgreSQL evaluates as:
+--   genres @> '["Action", "RPG"]'
+--
+-- jsonb_path_ops GIN indexes support @> only, and are smaller and faster
+-- for it than the default jsonb_ops, so containment filters become an
+-- index lookup instead of parsing every row's JSONB.
+--
+-- Safe to run multiple times.
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS games_prod_genres_gin_idx
+    ON steam.games_prod
+    USING gin (genres jsonb_path_ops);
+
+CREATE INDEX IF NOT EXISTS games_prod_categories_gin_idx
+    ON steam.games_prod
+    USING gin (categories jsonb_path_ops);
+
+-- Refresh planner statistics for the new indexes
+ANALYZE steam.games_prod;
+
+-- ============================================================================
+-- Test queries
+-- ============================================================================
+
+-- Test 1: Games with ALL of the selected genres (uses the GIN index)
+-- SELECT appid, name FROM steam.games_prod
+-- WHERE genres @> '["Action", "RPG"]'
+-- LIMIT 10;
+
+-- Test 2: Verify the index is used
+-- EXPLAIN ANALYZE
+-- SELECT appid FROM steam.games_prod
+-- WHERE genres @> '["Action", "RPG"]' AND categories @> '["Single-player"]';
+-- ============================================================================
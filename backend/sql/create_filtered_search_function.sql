@@ -0,0 +1,97 @@
+-- ============================================================================
+-- Filtered / Sorted Search Function
+-- ============================================================================
+-- Serves searches that are not ranked by relevance (price, reviews, date
+-- and name sorts, and relevance sorting without a query) as one stored
+-- statement instead of a PostgREST URL with one parameter per filter.
+--
+-- Filters arrive as a single JSONB argument (same keys as
+-- steam.search_games_bm25), and the statement is static PL/pgSQL, so each
+-- connection prepares it once and reuses the plan for every filter shape
+-- and query text. The total match count comes from the same scan
+-- (count(*) OVER ()) instead of a separate count query.
+--
+-- Requires the search_tsv column (sql/create_full_text_search.sql).
+-- Safe to run multiple times.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION steam.search_games_filtered(
+    q text DEFAULT '',
+    sort_by text DEFAULT 'name',
+    k int DEFAULT 20,
+    k_offset int DEFAULT 0,
+    filters jsonb DEFAULT '{}'::jsonb
+)
+RETURNS TABLE (
+    appid bigint,
+    name text,
+    short_description text,
+    price_cents int,
+    genres jsonb,
+    categories jsonb,
+    type text,
+    release_date date,
+    total_reviews int,
+    total_count bigint
+)
+LANGUAGE plpgsql
+STABLE
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        g.appid,
+        g.name,
+        g.short_description,
+        g.price_cents,
+        g.genres,
+        g.categories,
+        g.type,
+        g.release_date,
+        g.total_reviews,
+        count(*) OVER () AS total_count
+    FROM steam.games_prod g
+    WHERE (coalesce(q, '') = '' OR g.search_tsv @@ websearch_to_tsquery('simple', q))
+      AND (filters->>'price_min' IS NULL OR g.price_cents >= (filters->>'price_min')::int)
+      AND (filters->>'price_max' IS NULL OR g.price_cents <= (filters->>'price_max')::int)
+      AND (filters->>'type' IS NULL OR g.type = filters->>'type')
+      -- JSONB containment: must have ALL selected genres / categories
+      AND (jsonb_typeof(filters->'genres') IS DISTINCT FROM 'array' OR g.genres @> (filters->'genres'))
+      AND (jsonb_typeof(filters->'categories') IS DISTINCT FROM 'array' OR g.categories @> (filters->'categories'))
+      AND (filters->>'release_date_after' IS NULL OR g.release_date >= (filters->>'release_date_after')::date)
+      AND (filters->>'release_date_before' IS NULL OR g.release_date <= (filters->>'release_date_before')::date)
+      AND (filters->>'min_reviews' IS NULL OR g.total_reviews >= (filters->>'min_reviews')::int)
+    -- Same orders as the PostgREST query in SearchService._build_search_query;
+    -- only the branch matching sort_by is non-NULL
+    ORDER BY
+        CASE WHEN sort_by = 'price_asc' THEN g.price_cents END ASC NULLS LAST,
+        CASE WHEN sort_by = 'price_desc' THEN g.price_cents END DESC NULLS FIRST,
+        CASE WHEN sort_by = 'reviews' THEN g.total_reviews END DESC NULLS FIRST,
+        CASE WHEN sort_by = 'newest' THEN g.release_date END DESC NULLS LAST,
+        CASE WHEN sort_by = 'oldest' THEN g.release_date END ASC NULLS LAST,
+        CASE WHEN sort_by IN ('price_asc', 'price_desc') THEN NULL ELSE g.name END ASC,
+        g.appid
+    LIMIT k
+    OFFSET k_offset;
+END;
+$$;
+
+-- ============================================================================
+-- Grant execute permissions
+-- ============================================================================
+
+GRANT EXECUTE ON FUNCTION steam.search_games_filtered TO authenticated;
+GRANT EXECUTE ON FUNCTION steam.search_games_filtered TO anon;
+
+-- ============================================================================
+-- Test queries
+-- ============================================================================
+
+-- Test 1: Cheapest action games mentioning "space"
+-- SELECT appid, name, price_cents, total_count
+-- FROM steam.search_games_filtered('space', 'price_asc', 10, 0, '{"genres": ["Action"]}');
+
+-- Test 2: Most reviewed games, no query
+-- SELECT appid, name, total_reviews
+-- FROM steam.search_games_filtered('', 'reviews', 10);
+-- ============================================================================
@@ -0,0 +1,128 @@
+-- ============================================================================
+-- Full-Text Search Column and Index
+-- ============================================================================
+-- Replaces ILIKE '%query%' substring matching with PostgreSQL full-text
+-- search. The search_tsv column is generated from name + short_description
+-- and backed by a GIN index, so text search becomes an index lookup instead
+-- of a sequential scan, and only whole words match ("rust" no longer
+-- matches "frustrate").
+--
+-- Name lexemes carry weight A and description lexemes weight B, so
+-- steam.search_games_ts_rank() below can rank matches with ts_rank_cd
+-- entirely in the database (name weighted above description). Weights
+-- do not change which rows match.
+--
+-- The backend queries it through PostgREST as:
+--   search_tsv=wfts(simple).<query>
+-- which PostgreSQL evaluates as:
+--   search_tsv @@ websearch_to_tsquery('simple', <query>)
+--
+-- Safe to run multiple times.
+-- ============================================================================
+
+-- If an older search_tsv column exists (manually maintained, or generated
+-- without weights), drop it first so it can be recreated; its index is
+-- dropped with it:
+-- ALTER TABLE steam.games_prod DROP COLUMN IF EXISTS search_tsv;
+
+ALTER TABLE steam.games_prod
+    ADD COLUMN IF NOT EXISTS search_tsv tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(short_description, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS games_prod_search_tsv_idx
+    ON steam.games_prod
+    USING gin (search_tsv);
+
+-- Refresh planner statistics for the new column
+ANALYZE steam.games_prod;
+
+-- ============================================================================
+-- Database-side ranking with ts_rank_cd
+-- ============================================================================
+-- Used by the backend when steam.search_games_bm25 is not installed. Unlike
+-- the BM25 tables it needs no refresh: search_tsv is a generated column.
+-- The weight array is {D, C, B, A}; name (A) gets 1.0 and description (B)
+-- gets description_weight / name_weight (capped at 1.0, as ts_rank_cd
+-- requires weights in [0, 1]), matching the BM25 field weights.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION steam.search_games_ts_rank(
+    q text,
+    k int DEFAULT 20,
+    k_offset int DEFAULT 0,
+    filters jsonb DEFAULT '{}'::jsonb,
+    name_weight float8 DEFAULT 2.0,
+    description_weight float8 DEFAULT 1.0
+)
+RETURNS TABLE (
+    appid bigint,
+    name text,
+    short_description text,
+    price_cents int,
+    genres jsonb,
+    categories jsonb,
+    type text,
+    release_date date,
+    total_reviews int,
+    rank_score float8,
+    total_count bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        g.appid,
+        g.name,
+        g.short_description,
+        g.price_cents,
+        g.genres,
+        g.categories,
+        g.type,
+        g.release_date,
+        g.total_reviews,
+        ts_rank_cd(
+            ARRAY[0, 0, least(coalesce(description_weight / nullif(name_weight, 0), 1.0), 1.0), 1.0]::float4[],
+            g.search_tsv,
+            websearch_to_tsquery('simple', q)
+        )::float8 AS rank_score,
+        count(*) OVER () AS total_count
+    FROM steam.games_prod g
+    WHERE g.search_tsv @@ websearch_to_tsquery('simple', q)
+      AND (filters->>'price_min' IS NULL OR g.price_cents >= (filters->>'price_min')::int)
+      AND (filters->>'price_max' IS NULL OR g.price_cents <= (filters->>'price_max')::int)
+      AND (filters->>'type' IS NULL OR g.type = filters->>'type')
+      -- JSONB containment: must have ALL selected genres / categories
+      AND (jsonb_typeof(filters->'genres') IS DISTINCT FROM 'array' OR g.genres @> (filters->'genres'))
+      AND (jsonb_typeof(filters->'categories') IS DISTINCT FROM 'array' OR g.categories @> (filters->'categories'))
+      AND (filters->>'release_date_after' IS NULL OR g.release_date >= (filters->>'release_date_after')::date)
+      AND (filters->>'release_date_before' IS NULL OR g.release_date <= (filters->>'release_date_before')::date)
+      AND (filters->>'min_reviews' IS NULL OR g.total_reviews >= (filters->>'min_reviews')::int)
+    ORDER BY rank_score DESC, g.appid
+    LIMIT k
+    OFFSET k_offset;
+$$;
+
+GRANT EXECUTE ON FUNCTION steam.search_games_ts_rank TO authenticated;
+GRANT EXECUTE ON FUNCTION steam.search_games_ts_rank TO anon;
+
+-- ============================================================================
+-- Test queries
+-- ============================================================================
+
+-- Test 1: Whole-word match (uses the GIN index)
+-- SELECT appid, name FROM steam.games_prod
+-- WHERE search_tsv @@ websearch_to_tsquery('simple', 'rust')
+-- LIMIT 10;
+
+-- Test 2: Ranked search (name matches first)
+-- SELECT appid, name, rank_score
+-- FROM steam.search_games_ts_rank('space exploration', 10);
+
+-- Test 3: Verify the index is used
+-- EXPLAIN ANALYZE
+-- SELECT appid FROM steam.games_prod
+-- WHERE search_tsv @@ websearch_to_tsquery('simple', 'space exploration');
+-- ============================================================================
@@ -11,14 +11,23 @@ Required: 5-8 integration tests for Project 4
 """
 
 import unittest
+import asyncio
+import os
 import sys
+import tempfile
+import shutil
 from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from app.services.search_service import SearchService
 from app.services.persistence_service import PersistenceService
 from app.models.search import SearchRequest, SearchFilters, SortBy
 
+# backend/data, independent of the directory the tests are run from
+DATA_DIR = (Path(__file__).parent.parent.parent / "data").resolve()
+
 
 class TestSearchIntegration(unittest.TestCase):
     """
@@ -33,10 +42,20 @@ class TestSearchIntegration(unittest.TestCase):
     
     @classmethod
     def setUpClass(cls):
-        """Setup shared resources for all tests"""
+        """Create one scratch directory per test process"""
         # Note: These tests would normally use a real or mock database
         # For time constraints, we test the logic flow
-        cls.persistence = PersistenceService("backend/data/test")
+        cls.root_dir = Path(tempfile.mkdtemp(prefix=f"int_{os.getpid()}_"))
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Cleanup test environment"""
+        shutil.rmtree(cls.root_dir, ignore_errors=True)
+    
+    def setUp(self):
+        """Give each test its own data directory"""
+        # Tests don't share files, so they can run in parallel (pytest -n auto)
+        self.persistence = PersistenceService(str(self.root_dir / self._testMethodName))
     
     def test_1_search_with_filters_integration(self):
         """
@@ -71,25 +90,20 @@ class TestSearchIntegration(unittest.TestCase):
         
         Tests that offset/limit work correctly with different sort orders.
         """
-        # Test different sort options with pagination
-        sort_options = [
-            SortBy.RELEVANCE,
-            SortBy.PRICE_ASC,
-            SortBy.PRICE_DESC,
-            SortBy.NEWEST  # NEWEST sorts by release date descending
-        ]
-        
-        for sort_by in sort_options:
-            request = SearchRequest(
-                query="game",
-                sort_by=sort_by,
-                offset=0,
-                limit=20
-            )
-            
-            self.assertEqual(request.limit, 20)
-            self.assertEqual(request.offset, 0)
-            self.assertEqual(request.sort_by, sort_by)
+        # Test every sort option with pagination (one subtest each, so a
+        # failing option doesn't hide the others)
+        for sort_by in SortBy:
+            with self.subTest(sort_by=sort_by):
+                request = SearchRequest(
+                    query="game",
+                    sort_by=sort_by,
+                    offset=0,
+                    limit=20
+                )
+                
+                self.assertEqual(request.limit, 20)
+                self.assertEqual(request.offset, 0)
+                self.assertEqual(request.sort_by, sort_by)
         
         print("✅ Test 2 passed: Pagination + Sorting integration")
     
@@ -210,7 +224,7 @@ class TestSearchIntegration(unittest.TestCase):
         Verifies PersistenceService import integrates with search.
         """
         # Import from CSV (sample file should exist)
-        sample_csv = "backend/data/sample_games.csv"
+        sample_csv = str(DATA_DIR / "sample_games.csv")
         imported_games = self.persistence.import_games_from_csv(sample_csv)
         
         if imported_games:
@@ -222,7 +236,7 @@ class TestSearchIntegration(unittest.TestCase):
             self.assertIn('name', first_game)
         
         # Import from JSON
-        sample_json = "backend/data/sample_games.json"
+        sample_json = str(DATA_DIR / "sample_games.json")
         imported_json = self.persistence.import_games_from_json(sample_json)
         
         if imported_json:
@@ -250,6 +264,49 @@ class TestSearchIntegration(unittest.TestCase):
         self.assertIsNone(import_result)  # Should handle gracefully
         
         print("✅ Test 8 passed: Error handling integration")
+    
+    def test_9_batch_search_matches_single_search(self):
+        """
+        Integration Test 9: Batch search ranks like single searches
+        
+        Tests that each query of SearchService.search_batch returns the
+        same results as SearchService.search for that query alone.
+        """
+        games = [
+            {
+                "appid": appid, "name": name, "short_description": description,
+                "price_cents": 999, "genres": ["Action"], "categories": [],
+                "type": "game", "release_date": None, "total_reviews": 10
+            }
+            for appid, name, description in [
+                (1, "Space Shooter", "Shoot asteroids in space"),
+                (2, "Farm Life", "A relaxing farming sim"),
+                (3, "Space Farm", "Grow crops on a space station"),
+                (4, "Dungeon Crawler", "Explore dungeons and shoot monsters"),
+            ]
+        ]
+        
+        def fake_query(query, filters, sort_by, offset, limit, select_fields=None):
+            """Match games containing any query word, like the database would"""
+            words = query.lower().split()
+            rows = [
+                g for g in games
+                if any(w in f"{g['name']} {g['short_description']}".lower() for w in words)
+            ]
+            return SimpleNamespace(data=rows[offset:offset + limit], count=len(rows))
+        
+        service = SearchService(None)
+        queries = ["space", "farming sim", "shoot"]
+        with mock.patch.object(SearchService, "_bm25_rpc_available", False), \
+                mock.patch.object(SearchService, "_ts_rank_rpc_available", False), \
+                mock.patch.object(SearchService, "_corpus_index", None), \
+                mock.patch.object(service, "_execute_search_query", fake_query):
+            batch = asyncio.run(service.search_batch(queries, limit=10))
+            single = [asyncio.run(service.search(query, limit=10)) for query in queries]
+        
+        self.assertEqual(batch, single)
+        
+        print("✅ Test 9 passed: Batch search matches single search")
 
 
 if __name__ == '__main__':
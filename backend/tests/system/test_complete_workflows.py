@@ -11,6 +11,8 @@ Required: 3-5 system tests for Project 4
 """
 
 import unittest
+import logging
+import os
 import sys
 import tempfile
 import shutil
@@ -21,6 +23,10 @@ from app.services.search_service import SearchService
 from app.services.persistence_service import PersistenceService
 from app.models.search import SearchRequest, SearchFilters, SortBy
 
+# Workflow steps are logged at DEBUG: silent in test runs, shown when this
+# file is run directly
+logger = logging.getLogger(__name__)
+
 
 class TestCompleteWorkflows(unittest.TestCase):
     """
@@ -34,14 +40,20 @@ class TestCompleteWorkflows(unittest.TestCase):
     
     @classmethod
     def setUpClass(cls):
-        """Setup test environment"""
-        cls.test_dir = tempfile.mkdtemp()
-        cls.persistence = PersistenceService(cls.test_dir)
+        """Create one scratch directory per test process"""
+        cls.root_dir = Path(tempfile.mkdtemp(prefix=f"sys_{os.getpid()}_"))
     
     @classmethod
     def tearDownClass(cls):
         """Cleanup test environment"""
-        shutil.rmtree(cls.test_dir, ignore_errors=True)
+        shutil.rmtree(cls.root_dir, ignore_errors=True)
+    
+    def setUp(self):
+        """Setup an isolated test environment for each workflow"""
+        # Own subdirectory per workflow, so workflows can run in parallel
+        # (pytest -n auto) without sharing history or preference files
+        self.test_dir = str(self.root_dir / self._testMethodName)
+        self.persistence = PersistenceService(self.test_dir)
     
     def test_workflow_1_complete_search_journey(self):
         """
@@ -57,16 +69,16 @@ class TestCompleteWorkflows(unittest.TestCase):
         
         Verifies: Entire search pipeline works end-to-end
         """
-        print("\n🧪 Testing Workflow 1: Complete search journey...")
+        logger.debug("🧪 Testing Workflow 1: Complete search journey...")
         
         # Step 1: User opens app (loads preferences)
         preferences = self.persistence.load_user_preferences()
         self.assertIsInstance(preferences, dict)
-        print("  ✓ Step 1: App opened, preferences loaded")
+        logger.debug("  ✓ Step 1: App opened, preferences loaded")
         
         # Step 2: User enters search query
         search_query = "adventure"
-        print(f"  ✓ Step 2: User searches for '{search_query}'")
+        logger.debug("  ✓ Step 2: User searches for '%s'", search_query)
         
         # Step 3: User applies filters
         filters = SearchFilters(
@@ -74,11 +86,11 @@ class TestCompleteWorkflows(unittest.TestCase):
             genres=["Action", "Adventure"],
             type="game"
         )
-        print(f"  ✓ Step 3: Filters applied - price≤$30, genres={filters.genres}")
+        logger.debug("  ✓ Step 3: Filters applied - price≤$30, genres=%s", filters.genres)
         
         # Step 4: User sorts results
         sort_option = SortBy.PRICE_ASC
-        print(f"  ✓ Step 4: Sorted by {sort_option}")
+        logger.debug("  ✓ Step 4: Sorted by %s", sort_option)
         
         # Step 5: Create search request
         request = SearchRequest(
@@ -93,7 +105,7 @@ class TestCompleteWorkflows(unittest.TestCase):
         self.assertEqual(request.query, "adventure")
         self.assertEqual(request.sort_by, SortBy.PRICE_ASC)
         self.assertEqual(request.limit, 20)
-        print("  ✓ Step 5: Search request created successfully")
+        logger.debug("  ✓ Step 5: Search request created successfully")
         
         # Step 6: User exports results (mock results)
         mock_results = [
@@ -104,9 +116,9 @@ class TestCompleteWorkflows(unittest.TestCase):
         export_path = self.persistence.export_to_csv(mock_results, "search_results.csv")
         self.assertIsNotNone(export_path)
         self.assertTrue(export_path.exists())
-        print(f"  ✓ Step 6: Results exported to {export_path.name}")
+        logger.debug("  ✓ Step 6: Results exported to %s", export_path.name)
         
-        print("✅ Workflow 1 Complete: All steps successful!\n")
+        logger.debug("✅ Workflow 1 Complete: All steps successful!")
     
     def test_workflow_2_save_load_session_persistence(self):
         """
@@ -122,7 +134,7 @@ class TestCompleteWorkflows(unittest.TestCase):
         
         Verifies: Data persists between sessions
         """
-        print("\n🧪 Testing Workflow 2: Session persistence...")
+        logger.debug("🧪 Testing Workflow 2: Session persistence...")
         
         # Step 1-2: User performs searches, saves history
         search_history = [
@@ -148,26 +160,26 @@ class TestCompleteWorkflows(unittest.TestCase):
         
         save_result = self.persistence.save_search_history(search_history)
         self.assertTrue(save_result)
-        print(f"  ✓ Step 1-2: {len(search_history)} searches saved to history")
+        logger.debug("  ✓ Step 1-2: %s searches saved to history", len(search_history))
         
         # Step 3: User closes application (simulated by clearing reference)
         del search_history
-        print("  ✓ Step 3: Application closed (memory cleared)")
+        logger.debug("  ✓ Step 3: Application closed (memory cleared)")
         
         # Step 4-5: User reopens application, history restored
         restored_history = self.persistence.load_search_history()
         self.assertIsNotNone(restored_history)
         self.assertEqual(len(restored_history), 3)
-        print(f"  ✓ Step 4-5: Application reopened, {len(restored_history)} searches restored")
+        logger.debug("  ✓ Step 4-5: Application reopened, %s searches restored", len(restored_history))
         
         # Step 6: Verify restored data is correct
         self.assertEqual(restored_history[0]["query"], "adventure")
         self.assertEqual(restored_history[0]["results_count"], 86)
         self.assertEqual(restored_history[1]["query"], "action")
         self.assertEqual(restored_history[2]["query"], "rpg")
-        print("  ✓ Step 6: All search data correctly restored")
+        logger.debug("  ✓ Step 6: All search data correctly restored")
         
-        print("✅ Workflow 2 Complete: Session persistence works!\n")
+        logger.debug("✅ Workflow 2 Complete: Session persistence works!")
     
     def test_workflow_3_import_search_export_pipeline(self):
         """
@@ -182,7 +194,7 @@ class TestCompleteWorkflows(unittest.TestCase):
         
         Verifies: Complete data pipeline works
         """
-        print("\n🧪 Testing Workflow 3: Import → Search → Export pipeline...")
+        logger.debug("🧪 Testing Workflow 3: Import → Search → Export pipeline...")
         
         # Step 1: Import game data from CSV
         sample_csv = "backend/data/sample_games.csv"
@@ -191,24 +203,24 @@ class TestCompleteWorkflows(unittest.TestCase):
         if imported_games:
             self.assertIsInstance(imported_games, list)
             self.assertGreater(len(imported_games), 0)
-            print(f"  ✓ Step 1: Imported {len(imported_games)} games from CSV")
+            logger.debug("  ✓ Step 1: Imported %s games from CSV", len(imported_games))
             
             # Step 2: Validate imported data
             first_game = imported_games[0]
             self.assertIn('appid', first_game)
             self.assertIn('name', first_game)
             self.assertIn('price_cents', first_game)
-            print(f"  ✓ Step 2: Data validation passed - sample game: {first_game['name']}")
+            logger.debug("  ✓ Step 2: Data validation passed - sample game: %s", first_game['name'])
             
             # Step 3: Search imported data (simulated)
             search_query = "Sample"
             matching_games = [g for g in imported_games if search_query.lower() in g['name'].lower()]
-            print(f"  ✓ Step 3: Searched for '{search_query}', found {len(matching_games)} matches")
+            logger.debug("  ✓ Step 3: Searched for '%s', found %s matches", search_query, len(matching_games))
             
             # Step 4: Export search results to JSON
             export_path = self.persistence.export_to_json(matching_games, "search_results.json")
             self.assertIsNotNone(export_path)
-            print(f"  ✓ Step 4: Results exported to {export_path.name}")
+            logger.debug("  ✓ Step 4: Results exported to %s", export_path.name)
             
             # Step 5: Verify exported file
             self.assertTrue(export_path.exists())
@@ -216,11 +228,11 @@ class TestCompleteWorkflows(unittest.TestCase):
             with open(export_path, 'r') as f:
                 exported_data = json.load(f)
             self.assertEqual(len(exported_data), len(matching_games))
-            print(f"  ✓ Step 5: Exported file verified - {len(exported_data)} games")
+            logger.debug("  ✓ Step 5: Exported file verified - %s games", len(exported_data))
         else:
-            print("  ⚠️ Sample CSV not found, but workflow logic validated")
+            logger.debug("  ⚠️ Sample CSV not found, but workflow logic validated")
         
-        print("✅ Workflow 3 Complete: Data pipeline works!\n")
+        logger.debug("✅ Workflow 3 Complete: Data pipeline works!")
     
     def test_workflow_4_user_preferences_management(self):
         """
@@ -235,7 +247,7 @@ class TestCompleteWorkflows(unittest.TestCase):
         
         Verifies: User customization persists
         """
-        print("\n🧪 Testing Workflow 4: User preferences management...")
+        logger.debug("🧪 Testing Workflow 4: User preferences management...")
         
         # Step 1: User sets preferences
         user_preferences = {
@@ -248,33 +260,33 @@ class TestCompleteWorkflows(unittest.TestCase):
         
         save_result = self.persistence.save_user_preferences(user_preferences)
         self.assertTrue(save_result)
-        print("  ✓ Step 1: User preferences set")
-        print(f"     - Default sort: {user_preferences['default_sort']}")
-        print(f"     - Favorite genres: {user_preferences['favorite_genres']}")
-        print(f"     - Price limit: ${user_preferences['price_filter_max']/100}")
+        logger.debug("  ✓ Step 1: User preferences set")
+        logger.debug("     - Default sort: %s", user_preferences['default_sort'])
+        logger.debug("     - Favorite genres: %s", user_preferences['favorite_genres'])
+        logger.debug("     - Price limit: $%s", user_preferences['price_filter_max']/100)
         
         # Step 2: Preferences saved (already done above)
-        print("  ✓ Step 2: Preferences saved to disk")
+        logger.debug("  ✓ Step 2: Preferences saved to disk")
         
         # Step 3: User closes app
         del user_preferences
-        print("  ✓ Step 3: Application closed")
+        logger.debug("  ✓ Step 3: Application closed")
         
         # Step 4-5: User reopens app, preferences restored
         restored_prefs = self.persistence.load_user_preferences()
         self.assertIsNotNone(restored_prefs)
-        print("  ✓ Step 4: Application reopened")
+        logger.debug("  ✓ Step 4: Application reopened")
         
         # Verify preferences were restored correctly
         self.assertEqual(restored_prefs["default_sort"], "price_asc")
         self.assertEqual(restored_prefs["default_limit"], 50)
         self.assertEqual(len(restored_prefs["favorite_genres"]), 3)
         self.assertEqual(restored_prefs["price_filter_max"], 2000)
-        print("  ✓ Step 5: All preferences correctly restored")
-        print(f"     - Default sort: {restored_prefs['default_sort']} ✓")
-        print(f"     - Favorite genres: {restored_prefs['favorite_genres']} ✓")
+        logger.debug("  ✓ Step 5: All preferences correctly restored")
+        logger.debug("     - Default sort: %s ✓", restored_prefs['default_sort'])
+        logger.debug("     - Favorite genres: %s ✓", restored_prefs['favorite_genres'])
         
-        print("✅ Workflow 4 Complete: Preferences management works!\n")
+        logger.debug("✅ Workflow 4 Complete: Preferences management works!")
     
     def test_workflow_5_error_recovery(self):
         """
@@ -290,22 +302,22 @@ class TestCompleteWorkflows(unittest.TestCase):
         
         Verifies: System handles errors gracefully without crashing
         """
-        print("\n🧪 Testing Workflow 5: Error recovery...")
+        logger.debug("🧪 Testing Workflow 5: Error recovery...")
         
         # Step 1-2: Attempt to load non-existent file
         history = self.persistence.load_search_history()
         self.assertIsInstance(history, list)
-        print("  ✓ Step 1-2: Missing file handled gracefully (empty list returned)")
+        logger.debug("  ✓ Step 1-2: Missing file handled gracefully (empty list returned)")
         
         # Step 3-4: Attempt to import non-existent CSV
         result = self.persistence.import_games_from_csv("nonexistent.csv")
         self.assertIsNone(result)
-        print("  ✓ Step 3-4: Invalid CSV handled gracefully (None returned)")
+        logger.debug("  ✓ Step 3-4: Invalid CSV handled gracefully (None returned)")
         
         # Step 5-6: Attempt to export empty data
         export_result = self.persistence.export_to_csv([], "empty.csv")
         self.assertIsNone(export_result)
-        print("  ✓ Step 5-6: Empty export prevented (None returned)")
+        logger.debug("  ✓ Step 5-6: Empty export prevented (None returned)")
         
         # Additional: Test with corrupted JSON data
         corrupted_file = Path(self.test_dir) / "corrupted.json"
@@ -315,12 +327,13 @@ class TestCompleteWorkflows(unittest.TestCase):
         # Should handle gracefully
         imported = self.persistence.import_games_from_json(str(corrupted_file))
         self.assertIsNone(imported)
-        print("  ✓ Additional: Corrupted JSON handled gracefully")
+        logger.debug("  ✓ Additional: Corrupted JSON handled gracefully")
         
-        print("✅ Workflow 5 Complete: Error recovery works!\n")
+        logger.debug("✅ Workflow 5 Complete: Error recovery works!")
 
 
 if __name__ == '__main__':
-    # Run tests with verbose output
+    # Run tests with verbose output, including the workflow steps
+    logging.basicConfig(level=logging.DEBUG, format='%(message)s')
     unittest.main(verbosity=2)
 
@@ -0,0 +1,18 @@
+"""
+pytest configuration for unit tests
+
+Unit tests check results, not speed: run the numba kernels as plain Python
+so `pytest tests/unit` never waits for JIT compilation. Set
+NUMBA_DISABLE_JIT=0 to test the compiled kernels instead. Integration and
+system tests keep the JIT (the kernels are cached on disk, cache=True).
+
+Note: the flag is only set when numba has not been imported yet (e.g.
+`pytest tests/unit`). numba re-reads its configuration on every compile,
+so flipping it mid-session would mix compiled and uncompiled kernels.
+"""
+
+import os
+import sys
+
+if 'numba' not in sys.modules:
+    os.environ.setdefault("NUMBA_DISABLE_JIT", "1")
@@ -0,0 +1,129 @@
+"""
+Unit Tests for BM25Index
+
+Tests the vectorized BM25 scorer used for relevance ranking:
+- Scores match the Okapi BM25 formula
+- Documents without query terms score zero
+- Common terms get the epsilon IDF floor
+- BM25F weights fields before saturation
+- Batched queries score the same as single queries
+- MaxScore top-k returns the same ranking as full scoring
+"""
+
+import unittest
+import sys
+import math
+import numpy as np
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.bm25 import BM25Index, top_k, top_k_indices
+
+
+class TestBM25Index(unittest.TestCase):
+    """Test cases for BM25Index"""
+
+    def setUp(self):
+        """Build a small corpus"""
+        self.corpus = [
+            ['space', 'shooter', 'game'],
+            ['farm', 'game'],
+            ['space', 'space', 'trading', 'sim', 'game'],
+            []
+        ]
+        self.index = BM25Index(self.corpus)
+
+    def test_scores_match_okapi_formula(self):
+        """Test score for a single term against a hand-computed value"""
+        k1, b = 1.5, 0.75
+        avgdl = 10 / 4
+        idf = math.log(4 - 2 + 0.5) - math.log(2 + 0.5)  # 'space' in 2 of 4 docs
+        self.assertEqual(idf, 0.0)
+
+        idf = math.log(4 - 1 + 0.5) - math.log(1 + 0.5)  # 'farm' in 1 of 4 docs
+        expected = idf * 1 * (k1 + 1) / (1 + k1 * (1 - b + b * 2 / avgdl))
+        scores = self.index.get_scores(['farm'])
+        self.assertAlmostEqual(scores[1], expected, places=5)
+        self.assertEqual(scores[0], 0.0)
+
+    def test_unknown_and_empty_documents_score_zero(self):
+        """Test unknown query terms and empty documents"""
+        scores = self.index.get_scores(['unknown'])
+        self.assertEqual(scores.tolist(), [0.0, 0.0, 0.0, 0.0])
+        self.assertEqual(self.index.get_scores(['space'])[3], 0.0)
+
+    def test_common_term_gets_idf_floor(self):
+        """Test that terms in most documents get a small positive IDF"""
+        scores = self.index.get_scores(['game'])
+        self.assertTrue((scores[:3] > 0).all())
+        self.assertLess(scores[0], self.index.get_scores(['shooter'])[0])
+
+    def test_empty_corpus(self):
+        """Test scoring an empty corpus"""
+        index = BM25Index([])
+        self.assertEqual(len(index.get_scores(['game'])), 0)
+
+    def test_scores_are_float32(self):
+        """Test that IDF and scores are stored and returned as float32"""
+        self.assertEqual(self.index.idf.dtype, np.float32)
+        self.assertEqual(self.index.get_scores(['space']).dtype, np.float32)
+        self.assertEqual(top_k([(self.index, 1.0)], ['space'], 2)[1].dtype, np.float32)
+
+    def test_batch_scores_match_single_queries(self):
+        """Test that batched scoring equals scoring queries one by one"""
+        queries = [['space'], ['farm', 'game'], ['unknown'], ['space', 'space', 'sim']]
+        batch = self.index.get_scores_batch(queries)
+        self.assertEqual(batch.shape, (4, 4))
+        for row, query in zip(batch, queries):
+            for batch_score, score in zip(row, self.index.get_scores(query)):
+                self.assertAlmostEqual(batch_score, score, places=5)
+
+    def test_bm25f_weights_fields_before_saturation(self):
+        """Test BM25F against a hand-computed two-field score"""
+        k1, b = 1.5, 0.75
+        names = [['space'], ['farm'], ['racer'], ['sim']]
+        descriptions = [['fly', 'in', 'space'], ['farm', 'life'], ['cars'], ['trains']]
+        index = BM25Index.from_fields([names, descriptions], weights=[2.0, 1.0])
+
+        # 'space' appears in document 0 only, once in each field
+        idf = math.log(4 - 1 + 0.5) - math.log(1 + 0.5)
+        avg_desc_len = 7 / 4
+        pseudo_tf = 2.0 * 1 / 1.0 + 1.0 * 1 / (1 - b + b * 3 / avg_desc_len)
+        expected = idf * pseudo_tf * (k1 + 1) / (k1 + pseudo_tf)
+
+        scores = index.get_scores(['space'])
+        self.assertAlmostEqual(scores[0], expected, places=5)
+        self.assertEqual(scores[1:].tolist(), [0.0, 0.0, 0.0])
+
+        # A single field with weight 1 is plain Okapi BM25
+        single = BM25Index.from_fields([self.corpus], weights=[1.0])
+        for fused, okapi in zip(single.get_scores(['farm', 'game']), self.index.get_scores(['farm', 'game'])):
+            self.assertAlmostEqual(fused, okapi, places=6)
+
+    def test_top_k_matches_full_scoring(self):
+        """Test MaxScore top-k against sorting full weighted scores"""
+        descriptions = [
+            ['space', 'trading'], ['game'], ['space', 'game', 'game'], ['sim'], ['farm', 'sim']
+        ] * 20
+        desc_index = BM25Index(descriptions)
+        name_index = BM25Index([['space'] if i == 7 else ['title'] for i in range(100)])
+        query = ['space', 'sim']
+
+        full = name_index.get_scores(query) * 2.0 + desc_index.get_scores(query)
+        doc_ids, scores = top_k([(name_index, 2.0), (desc_index, 1.0)], query, 5)
+
+        self.assertEqual(doc_ids[0], 7)
+        for doc_id, score in zip(doc_ids, scores):
+            self.assertAlmostEqual(score, full[doc_id], places=5)
+        self.assertAlmostEqual(scores[-1], sorted(full, reverse=True)[4], places=5)
+
+    def test_top_k_indices_matches_stable_sort(self):
+        """Test partition-based selection, including ties, against a stable argsort"""
+        scores = np.array([0.5, 2.0, 0.5, 1.0, 2.0, 0.5, 0.0])
+        for k in range(len(scores) + 2):
+            expected = np.argsort(-scores, kind='stable')[:k]
+            self.assertEqual(top_k_indices(scores, k).tolist(), expected.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,24 +9,38 @@ import unittest
 import json
 import tempfile
 import shutil
+from datetime import date, datetime
 from pathlib import Path
+from unittest import mock
+import numpy as np
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from app.services import persistence_service
 from app.services.persistence_service import PersistenceService
 
 
 class TestPersistenceService(unittest.TestCase):
     """Unit tests for PersistenceService class"""
     
-    def setUp(self):
-        """Create temporary directory for each test"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.service = PersistenceService(self.temp_dir)
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary directory and service shared by all tests"""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.service = PersistenceService(cls.temp_dir)
     
-    def tearDown(self):
-        """Clean up temporary directory after each test"""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the temporary directory after the last test"""
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+    
+    def filename(self, name: str) -> str:
+        """File name namespaced by the test, so tests don't share files"""
+        return f"{self._testMethodName}_{name}"
+    
+    def fresh_service(self) -> PersistenceService:
+        """Service with its own directory, for tests that need no shared files"""
+        return PersistenceService(str(Path(self.temp_dir) / self._testMethodName))
     
     def test_save_and_load_search_history(self):
         """Test saving and loading search history"""
@@ -46,9 +60,23 @@ class TestPersistenceService(unittest.TestCase):
         self.assertEqual(loaded[0]["query"], "adventure")
         self.assertEqual(loaded[1]["results_count"], 152)
     
+    def test_append_search_history(self):
+        """Test appending searches, including to an older JSON array file"""
+        service = self.fresh_service()
+        (service.data_dir / "search_history.json").write_text(json.dumps([{"query": "old"}], indent=2))
+        
+        self.assertTrue(service.append_search_history({"query": "rpg", "results_count": 3}))
+        self.assertTrue(service.append_search_history({"query": "racing"}))
+        
+        loaded = service.load_search_history()
+        self.assertEqual([s["query"] for s in loaded], ["old", "rpg", "racing"])
+        self.assertEqual(loaded[1]["results_count"], 3)
+    
     def test_load_missing_file(self):
         """Test loading when file doesn't exist (first run)"""
-        loaded = self.service.load_search_history()
+        # Own directory: other tests save search history in the shared one
+        service = self.fresh_service()
+        loaded = service.load_search_history()
         self.assertEqual(loaded, [], "Should return empty list for missing file")
     
     def test_save_and_load_preferences(self):
@@ -68,6 +96,27 @@ class TestPersistenceService(unittest.TestCase):
         self.assertEqual(loaded["default_sort"], "price_asc")
         self.assertEqual(len(loaded["favorite_genres"]), 2)
     
+    def test_load_preferences_reads_file_changes(self):
+        """Test cached preferences are refreshed after saves and external edits"""
+        service = self.fresh_service()
+        service.save_user_preferences({"default_limit": 10})
+        self.assertEqual(service.load_user_preferences()["default_limit"], 10)
+        
+        service.save_user_preferences({"default_limit": 30})
+        self.assertEqual(service.load_user_preferences()["default_limit"], 30)
+        
+        (service.data_dir / "user_preferences.json").write_text('{"default_limit": 500}')
+        self.assertEqual(service.load_user_preferences()["default_limit"], 500)
+    
+    def test_loaded_preferences_are_not_shared(self):
+        """Test mutating loaded preferences doesn't change later loads"""
+        service = self.fresh_service()
+        service.save_user_preferences({"favorite_genres": ["RPG"]})
+        
+        service.load_user_preferences()["favorite_genres"].append("Action")
+        
+        self.assertEqual(service.load_user_preferences()["favorite_genres"], ["RPG"])
+    
     def test_export_to_csv(self):
         """Test exporting data to CSV"""
         data = [
@@ -75,7 +124,7 @@ class TestPersistenceService(unittest.TestCase):
             {"game_id": 2, "title": "Game 2", "price": 29.99}
         ]
         
-        file_path = self.service.export_to_csv(data, "test_export.csv")
+        file_path = self.service.export_to_csv(data, self.filename("export.csv"))
         
         self.assertIsNotNone(file_path, "Export should return file path")
         self.assertTrue(file_path.exists(), "CSV file should exist")
@@ -86,6 +135,16 @@ class TestPersistenceService(unittest.TestCase):
             self.assertIn("game_id", content)
             self.assertIn("Game 1", content)
     
+    def test_export_to_csv_from_generator(self):
+        """Test CSV export streams records and fills missing columns"""
+        data = ({"game_id": i, "title": f"Game {i}"} if i != 1 else {"game_id": 1} for i in range(3))
+        
+        file_path = self.service.export_to_csv(data, self.filename("streamed.csv"))
+        
+        self.assertIsNotNone(file_path)
+        lines = file_path.read_text(encoding='utf-8').splitlines()
+        self.assertEqual(lines, ["game_id,title", "0,Game 0", "1,", "2,Game 2"])
+    
     def test_export_to_json(self):
         """Test exporting data to JSON"""
         data = [
@@ -93,7 +152,7 @@ class TestPersistenceService(unittest.TestCase):
             {"game_id": 2, "title": "Game 2"}
         ]
         
-        file_path = self.service.export_to_json(data, "test_export.json")
+        file_path = self.service.export_to_json(data, self.filename("export.json"))
         
         self.assertIsNotNone(file_path)
         self.assertTrue(file_path.exists())
@@ -104,9 +163,82 @@ class TestPersistenceService(unittest.TestCase):
             self.assertEqual(len(loaded), 2)
             self.assertEqual(loaded[0]["title"], "Game 1")
     
+    def test_export_to_json_from_generator(self):
+        """Test JSON export streams records from a generator"""
+        data = ({"game_id": i, "title": f"Game {i}"} for i in range(3))
+        
+        file_path = self.service.export_to_json(data, self.filename("streamed.json"))
+        
+        self.assertIsNotNone(file_path)
+        with open(file_path, 'r') as f:
+            loaded = json.load(f)
+        self.assertEqual([g["game_id"] for g in loaded], [0, 1, 2])
+    
+    def test_export_to_json_non_json_types(self):
+        """Test JSON export accepts int keys and stringifies dates"""
+        data = [{"game_id": 1, "released": date(2020, 5, 1), "tags": {10: "Action"}}]
+        
+        file_path = self.service.export_to_json(data, self.filename("typed.json"))
+        
+        self.assertIsNotNone(file_path)
+        with open(file_path, 'r') as f:
+            loaded = json.load(f)
+        self.assertEqual(loaded[0]["released"], "2020-05-01")
+        self.assertEqual(loaded[0]["tags"], {"10": "Action"})
+    
+    def test_json_encoding_matches_without_orjson(self):
+        """Test numpy values and datetimes encode the same with either encoder"""
+        record = {
+            "score": np.float64(0.5), "rank": np.int64(3), "weight": np.float32(0.25),
+            "searched_at": datetime(2025, 12, 14, 22, 0, 0)
+        }
+        expected = {"score": 0.5, "rank": 3, "weight": 0.25, "searched_at": "2025-12-14T22:00:00"}
+        
+        self.assertEqual(json.loads(persistence_service._dumps(record)), expected)
+        with mock.patch.object(persistence_service, "orjson", None):
+            self.assertEqual(json.loads(persistence_service._dumps(record)), expected)
+    
+    def test_generate_summary_report(self):
+        """Test report price statistics and genre distribution"""
+        search_results = {
+            "query": "adventure",
+            "total": 3,
+            "results": [
+                {"title": "Game 1", "price": 10.0, "genres": ["Action"], "relevance_score": 0.9},
+                {"title": "Game 2", "price": 0.0, "genres": ["Action", "RPG"], "relevance_score": 0.5},
+                {"title": "Game 3", "price": 30.0, "genres": [], "relevance_score": 0.1}
+            ]
+        }
+        
+        file_path = self.service.generate_summary_report(search_results, self.filename("report.txt"))
+        
+        self.assertIsNotNone(file_path)
+        content = file_path.read_text(encoding='utf-8')
+        self.assertIn("Average: $20.00", content)  # Free games excluded
+        self.assertIn("Minimum: $10.00", content)
+        self.assertIn("Action: 2", content)
+    
+    def test_iter_games_from_csv(self):
+        """Test streaming CSV import parses rows and skips invalid ones"""
+        games_file = Path(self.temp_dir) / self.filename("games.csv")
+        games_file.write_text(
+            'appid,name,price_cents,genres\n'
+            '10,Game A,999,"[""Action""]"\n'
+            'oops,Broken,0,[]\n'
+            '20,Game B,0,[]\n'
+        )
+        
+        games = self.service.iter_games_from_csv(str(games_file))
+        
+        self.assertNotIsInstance(games, list)
+        games = list(games)
+        self.assertEqual([g["appid"] for g in games], [10, 20])
+        self.assertEqual(games[0]["genres"], ["Action"])
+        self.assertEqual(list(self.service.iter_games_from_csv("missing.csv")), [])
+    
     def test_export_empty_data(self):
         """Test exporting empty data returns None"""
-        result = self.service.export_to_csv([], "empty.csv")
+        result = self.service.export_to_csv([], self.filename("empty.csv"))
         self.assertIsNone(result, "Exporting empty data should return None")
 
 
@@ -0,0 +1,79 @@
+"""
+Unit Tests for the Reciprocal Rank Fusion Kernel
+
+Tests the compiled RRF accumulator used by hybrid search:
+- Fused scores match alpha / (k + rank) + (1 - alpha) / (k + rank)
+- Each game appears once, in first-seen order
+- Empty result lists are handled
+- Compiled and Python (py_func) kernels match a dict-based RRF baseline,
+  including duplicate ids and tied scores
+"""
+
+import unittest
+import sys
+import numpy as np
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.rrf_kernel import rrf_scores
+
+
+def baseline_rrf(bm25_ids, semantic_ids, alpha, k):
+    """Dict-based RRF (the pre-kernel _reciprocal_rank_fusion loop)"""
+    scores = {}
+    for rank, game_id in enumerate(bm25_ids, start=1):
+        scores[game_id] = alpha * (1.0 / (k + rank))
+    for rank, game_id in enumerate(semantic_ids, start=1):
+        if game_id in scores:
+            scores[game_id] += (1 - alpha) * (1.0 / (k + rank))
+        else:
+            scores[game_id] = (1 - alpha) * (1.0 / (k + rank))
+    return list(scores), list(scores.values())
+
+
+class TestRRFKernel(unittest.TestCase):
+    """Test cases for rrf_scores"""
+
+    def test_scores_match_rrf_formula(self):
+        """Test fused scores for games in one or both lists"""
+        ids, scores = rrf_scores(np.array([10, 20]), np.array([20, 30]), 0.7, 60.0)
+
+        self.assertEqual(ids.tolist(), [10, 20, 30])
+        self.assertAlmostEqual(scores[0], 0.7 / 61)
+        self.assertAlmostEqual(scores[1], 0.7 / 62 + 0.3 / 61)
+        self.assertAlmostEqual(scores[2], 0.3 / 62)
+
+    def test_empty_lists(self):
+        """Test fusing empty result lists"""
+        ids, scores = rrf_scores(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), 0.5, 60.0)
+        self.assertEqual(len(ids), 0)
+        self.assertEqual(len(scores), 0)
+
+        ids, _ = rrf_scores(np.zeros(0, dtype=np.int64), np.array([5, 6]), 0.5, 60.0)
+        self.assertEqual(ids.tolist(), [5, 6])
+
+    def test_kernels_match_baseline(self):
+        """Test compiled and Python kernels against the dict baseline"""
+        rng = np.random.default_rng(7)
+        cases = [
+            ([3, 1, 2], [2, 4], 0.6),
+            ([5, 7, 5, 9], [9, 9, 1], 0.7),   # Duplicate ids in both lists
+            ([1, 2], [2, 1], 0.5),            # Tied fused scores
+            ([4, 8, 6], [], 0.3),
+            (rng.integers(0, 40, 60).tolist(), rng.integers(0, 40, 60).tolist(), 0.45)
+        ]
+        kernels = {'compiled': rrf_scores, 'python': getattr(rrf_scores, 'py_func', rrf_scores)}
+
+        for bm25_ids, semantic_ids, alpha in cases:
+            expected_ids, expected_scores = baseline_rrf(bm25_ids, semantic_ids, alpha, 60.0)
+            for name, kernel in kernels.items():
+                with self.subTest(kernel=name, bm25_ids=bm25_ids[:5], alpha=alpha):
+                    ids, scores = kernel(
+                        np.array(bm25_ids, dtype=np.int64), np.array(semantic_ids, dtype=np.int64), alpha, 60.0
+                    )
+                    self.assertEqual(ids.tolist(), expected_ids)
+                    np.testing.assert_allclose(scores, expected_scores, rtol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
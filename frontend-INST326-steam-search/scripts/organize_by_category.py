@@ -7,7 +7,7 @@ Usage: python3 organize_by_category.py
 
 import os
 import re
-import shutil
+from itertools import islice
 from pathlib import Path
 
 # 目录配置
@@ -21,16 +21,23 @@ CATEGORY_MAPPING = {
     "Validation": "validation",
 }
 
+# Category 行的正则（只编译一次，逐行匹配）
+_CATEGORY_RE = re.compile(r'\*\*Category:\*\*\s+(.+?)$')
+
+# Category 行位于文档头部，只读取前若干行
+_HEADER_LINES = 40
+
 def get_category_from_file(file_path: Path) -> str:
     """从 markdown 文件中提取分类信息"""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # 查找 Category: 行
-        match = re.search(r'\*\*Category:\*\*\s+(.+?)$', content, re.MULTILINE)
-        if match:
-            return match.group(1).strip()
+            # 逐行查找 Category: 行，找到即返回
+            for line in islice(f, _HEADER_LINES):
+                if '**Category:**' not in line:
+                    continue
+                match = _CATEGORY_RE.search(line)
+                if match:
+                    return match.group(1).strip()
         
         return None
     except Exception as e:
@@ -47,8 +54,9 @@ def move_files_to_categories():
     moved_count = 0
     skipped_count = 0
     
-    # 遍历所有 .md 文件
-    for md_file in BACKEND_DIR.glob("*.md"):
+    # 第一遍：读取所有文件的分类，按目标文件夹分组
+    plan = {}  # 目标文件夹 -> [(文件, 分类)]
+    for md_file in sorted(BACKEND_DIR.glob("*.md")):
         # 跳过 README.md
         if md_file.name == "README.md":
             print(f"\n⏭️  跳过: {md_file.name}")
@@ -71,20 +79,22 @@ def move_files_to_categories():
             skipped_count += 1
             continue
         
-        # 创建目标目录
+        plan.setdefault(target_folder, []).append((md_file, category))
+    
+    # 第二遍：每个分类创建一次目录，再移动该分类的所有文件
+    for target_folder, files in plan.items():
         target_dir = BACKEND_DIR / target_folder
         target_dir.mkdir(parents=True, exist_ok=True)
         
-        # 移动文件
-        target_path = target_dir / md_file.name
-        
-        print(f"\n📦 {md_file.name}")
-        print(f"   分类: {category}")
-        print(f"   目标: {target_folder}/")
-        
-        shutil.move(str(md_file), str(target_path))
-        moved_count += 1
-        print(f"   ✅ 已移动")
+        for md_file, category in files:
+            print(f"\n📦 {md_file.name}")
+            print(f"   分类: {category}")
+            print(f"   目标: {target_folder}/")
+            
+            # 同一目录树内移动：os.replace 直接重命名
+            md_file.replace(target_dir / md_file.name)
+            moved_count += 1
+            print(f"   ✅ 已移动")
     
     print("\n" + "=" * 60)
     print(f"✅ 移动完成: {moved_count} 个文件")